@@ -1,10 +1,16 @@
 import logging
 import argparse
 import os
+import time
 from dotenv import load_dotenv
 
+from src.features.core_pipeline.cache_warming import create_cache_warmer
 from src.features.core_pipeline.execute_pipeline import execute_pipeline
+from src.features.core_pipeline.stages.summarization import create_summary_cache
+from src.features.core_pipeline.stages.summarization import set_summary_cache
+from src.features.llm_core.llm_provider import LLMProvider
 from src.features.users.factory import create_user_service
+from src.shared.services.inference_autotune import run_autotune
 
 # Configure logging with timestamp
 logging.basicConfig(
@@ -35,13 +41,54 @@ def cli_entry() -> None:
         default=SEARCH_TERM_GLOBAL,
         help="The search term to query the search engine",
     )
+    parser.add_argument(
+        "--warm-cache",
+        action="store_true",
+        help="Keep the caches warm for recurring queries in logs/query.log until interrupted",
+    )
+    parser.add_argument(
+        "--autotune",
+        action="store_true",
+        help="Benchmark inference thread counts and batch sizes and save the best for this host",
+    )
     args: argparse.Namespace = parser.parse_args()
 
+    if args.autotune:
+        run_autotune()
+        return
+
+    # Summaries are shared with other runs and with the cache warmer
+    set_summary_cache(create_summary_cache())
+
+    if args.warm_cache:
+        run_cache_warmer()
+        return
+
     # Run the main pipeline with parsed search term
     logging.info("Starting search and summarization process")
-    execute_pipeline(create_user_service(), args.search_term)
+    user = create_user_service()
+    try:
+        execute_pipeline(user, args.search_term)
+    finally:
+        user.close()
     logging.info("Search and summarization process completed.")
 
 
+def run_cache_warmer() -> None:
+    """Refreshes recurring queries in the foreground until interrupted."""
+    user = create_user_service()
+    warmer = create_cache_warmer(user, LLMProvider(model_name="gemini"))
+    logging.info(f"Warming {len(warmer.queries())} recurring queries")
+    warmer.start()
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        warmer.stop()
+        user.close()
+
+
 if __name__ == "__main__":
     cli_entry()
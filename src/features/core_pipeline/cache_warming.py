@@ -0,0 +1,56 @@
+# core_pipeline/cache_warming.py
+
+import logging
+from typing import Callable
+from typing import List
+from typing import Optional
+
+from src.features.core_pipeline.execute_pipeline import prepare_results_text
+from src.features.core_pipeline.stages.summarization import summarize_results
+from src.features.llm_core.llm_core import LLMCore
+from src.features.users.models.user import User
+from src.shared.config.constants import CACHE_WARM_QUERY_LOG
+from src.shared.services.cache_warmer import CacheWarmer
+from src.shared.services.page_fetch_service import PageFetchService
+
+
+def create_warm_function(
+    user_service: User,
+    llm_core: Optional[LLMCore] = None,
+    page_fetcher: Optional[PageFetchService] = None,
+) -> Callable[[str], None]:
+    """
+    Builds the function the warmer runs for each term.
+
+    It takes the same search, validation and summary path as execute_pipeline,
+    so the entries it stores are the ones user-facing runs look up.
+    """
+
+    def warm(search_term: str) -> None:
+        prepared = prepare_results_text(user_service, search_term, page_fetcher)
+        if prepared is None or llm_core is None:
+            return
+        summarize_results(llm_core, prepared[1])
+        logging.info(f"Warmed caches for: {search_term}")
+
+    return warm
+
+
+def create_cache_warmer(
+    user_service: User,
+    llm_core: Optional[LLMCore] = None,
+    terms: Optional[List[str]] = None,
+    query_log: Optional[str] = CACHE_WARM_QUERY_LOG,
+) -> CacheWarmer:
+    """
+    Creates a warmer for the configured terms plus the frequent terms in the query log.
+
+    Configured terms outrank imported ones, whose priority is their log count.
+    """
+    warmer = CacheWarmer(create_warm_function(user_service, llm_core))
+    if query_log is not None:
+        warmer.add_from_log(query_log)
+    top_priority = max((query["priority"] for query in warmer.queries()), default=0)
+    for term in terms or []:
+        warmer.add(term, priority=top_priority + 1)
+    return warmer
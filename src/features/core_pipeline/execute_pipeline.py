@@ -2,16 +2,23 @@
 
 import logging
 from typing import List
+from typing import Optional
+from typing import Tuple
+from src.shared.config.constants import PAGE_FETCH_ENABLED
+from src.shared.config.types import SearchResponse
 from src.shared.config.types import SearchResult
 from src.features.core_pipeline.stages.search_execution import (
     fetch_web_results,
     validate_search_results,
 )
+from src.features.core_pipeline.stages.page_fetch import fetch_page_contents
+from src.features.core_pipeline.stages.page_fetch import get_page_fetcher
 from src.features.core_pipeline.stages.summarization import summarize_results
 from src.features.document.document_pipeline import DocumentPipeline
 from src.features.llm_core.llm_provider import LLMProvider
 from src.features.core_pipeline.stages.search_execution import retry_with_validation
 from src.features.users.models.user import User
+from src.shared.services.page_fetch_service import PageFetchService
 
 
 def extract_works_cited(results: List[SearchResult]) -> List[str]:
@@ -27,17 +34,23 @@ def extract_works_cited(results: List[SearchResult]) -> List[str]:
     return works_cited
 
 
-def execute_pipeline(user_service: User, search_term: str) -> None:
+def prepare_results_text(
+    user_service: User,
+    search_term: str,
+    page_fetcher: Optional[PageFetchService] = None,
+) -> Optional[Tuple[SearchResponse, str]]:
     """
-    Main pipeline to fetch, validate, process, and summarize web search results.
+    Runs the search, page fetch and validation steps of the pipeline.
 
     Parameters:
     - user_service: The service handling the search operation.
     - search_term: The search term to query.
-    """
-    # Initialize the LLM provider for summarization
-    llm_provider = LLMProvider(model_name="gemini")
+    - page_fetcher: Downloads full result pages to summarize instead of snippets;
+      defaults to the shared fetcher when PAGE_FETCH_ENABLED is set.
 
+    Returns:
+    - The raw search data and the text to summarize, or None if a step failed.
+    """
     # Step 1: Fetch web results with retry mechanism
     raw_search_data = retry_with_validation(
         fetch_web_results, user_service, search_term
@@ -45,14 +58,45 @@ def execute_pipeline(user_service: User, search_term: str) -> None:
 
     if raw_search_data is None:
         logging.error("Failed to fetch search results after retries.")
-        return
+        return None
+
+    # Step 1.1: Optionally swap snippets for the full text of the top pages
+    if page_fetcher is None and PAGE_FETCH_ENABLED:
+        page_fetcher = get_page_fetcher()
+    if page_fetcher is not None:
+        raw_search_data = fetch_page_contents(raw_search_data, page_fetcher)
 
     # Step 2: Validate and process the fetched results
     validated_results_text = validate_search_results(raw_search_data)
 
     if validated_results_text is None:
         logging.error("No valid results to process for summarization.")
+        return None
+
+    return raw_search_data, validated_results_text
+
+
+def execute_pipeline(
+    user_service: User,
+    search_term: str,
+    page_fetcher: Optional[PageFetchService] = None,
+) -> None:
+    """
+    Main pipeline to fetch, validate, process, and summarize web search results.
+
+    Parameters:
+    - user_service: The service handling the search operation.
+    - search_term: The search term to query.
+    - page_fetcher: Downloads full result pages to summarize instead of snippets;
+      defaults to the shared fetcher when PAGE_FETCH_ENABLED is set.
+    """
+    # Initialize the LLM provider for summarization
+    llm_provider = LLMProvider(model_name="gemini")
+
+    prepared = prepare_results_text(user_service, search_term, page_fetcher)
+    if prepared is None:
         return
+    raw_search_data, validated_results_text = prepared
 
     # Step 3: Summarize the validated results
     summary = summarize_results(llm_provider, validated_results_text)
@@ -0,0 +1,81 @@
+import logging
+import threading
+from typing import List
+from typing import Optional
+
+from src.shared.config.constants import PAGE_FETCH_TOP_N
+from src.shared.config.types import SearchResponse
+from src.shared.services.page_cache import PageCache
+from src.shared.services.page_fetch_service import PageFetchService
+
+# One fetcher per process keeps its connection pool warm across pipeline runs
+_page_fetcher: Optional[PageFetchService] = None
+_page_fetcher_lock = threading.Lock()
+
+
+def get_page_fetcher() -> PageFetchService:
+    """Returns the shared page fetcher, creating it on first use."""
+    global _page_fetcher
+    with _page_fetcher_lock:
+        if _page_fetcher is None:
+            _page_fetcher = PageFetchService(cache=PageCache())
+        return _page_fetcher
+
+
+def pages_to_fetch(search_data: SearchResponse, top_n: int) -> List[int]:
+    """
+    Picks the result indices worth downloading.
+
+    Valid results come first; when none passed validation the top results
+    are used, matching the fallback in validate_search_engine_results.
+    """
+    all_results = search_data.get("all_results", [])
+    validation_results = search_data.get("validation_results", [])
+    with_links = [
+        index
+        for index, result in enumerate(all_results)
+        if isinstance(result, dict) and result.get("link")
+    ]
+    valid = [
+        index
+        for index in with_links
+        if index < len(validation_results)
+        and isinstance(validation_results[index], dict)
+        and validation_results[index].get("is_valid", False)
+    ]
+    return (valid or with_links)[:top_n]
+
+
+def fetch_page_contents(
+    search_data: SearchResponse,
+    page_fetcher: PageFetchService,
+    top_n: int = PAGE_FETCH_TOP_N,
+) -> SearchResponse:
+    """
+    Replaces the snippets of the top results with the full text of their pages.
+
+    Parameters:
+    - search_data: Search data as returned by User.search.
+    - page_fetcher: The service used to download the pages.
+    - top_n: How many result pages to download.
+
+    Returns:
+    - A copy of search_data whose web_results hold page text where a download
+      succeeded; the original snippet is kept otherwise.
+    """
+    indices = pages_to_fetch(search_data, top_n)
+    web_results = list(search_data.get("web_results", []))
+    if not indices or len(web_results) != len(search_data.get("all_results", [])):
+        return search_data
+
+    links = [search_data["all_results"][index]["link"] for index in indices]
+    pages = page_fetcher.fetch_many(links)
+    for index, page in zip(indices, pages):
+        if page["text"]:
+            web_results[index] = page["text"]
+        else:
+            logging.info(f"Keeping snippet for {page['url']}: {page['error']}")
+
+    fetched = sum(1 for page in pages if page["text"])
+    logging.info(f"Fetched full text for {fetched} of {len(pages)} result pages.")
+    return {**search_data, "web_results": web_results}
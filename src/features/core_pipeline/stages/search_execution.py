@@ -1,10 +1,17 @@
 import logging
+import math
+from httpx import HTTPError
 from requests.exceptions import RequestException
 
 from src.features.core_pipeline.validators.result_validator import (
     validate_search_engine_results,
 )
 from src.features.users.models.user import User
+from src.shared.config.constants import SEARCH_RETRY_MAX_RESULTS
+from src.shared.config.constants import SEARCH_RETRY_TARGET_VALID
+from src.shared.services.query_fingerprint import query_fingerprint
+from src.shared.services.result_dedup import ResultDeduplicator
+from src.shared.services.single_flight import SingleFlight
 
 from typing import Callable
 from typing import Dict
@@ -23,6 +30,14 @@ AllResults = List[Dict[str, Optional[str]]]  # Type alias for all_results
 # Define a TypeVar to represent any argument types that the function may accept
 T = TypeVar("T")
 
+# Concurrent identical searches share one SearxNG request and validation pass
+_search_flight: SingleFlight[SearchResult] = SingleFlight()
+
+
+def search_flight_key(user_service: User, search_term: str) -> Tuple[int, str]:
+    """Builds the single-flight key: the user service plus the query fingerprint."""
+    return id(user_service), query_fingerprint(search_term)
+
 
 def process_results(search_results: str) -> str:
     """
@@ -40,22 +55,43 @@ def process_results(search_results: str) -> str:
     return processed_results
 
 
-def fetch_web_results(user_service: User, search_term: str) -> Optional[SearchResult]:
+def fetch_web_results(
+    user_service: User,
+    search_term: str,
+    page: int = 1,
+    num_results: Optional[int] = None,
+    deduplicator: Optional[ResultDeduplicator] = None,
+) -> Optional[SearchResult]:
     """
     Fetches raw web search results without validation.
 
     Parameters:
     - user_service: The service handling the search operation.
     - search_term: The search term to query.
+    - page: The result page to fetch.
+    - num_results: How many results to fetch, or None for the service default.
+    - deduplicator: Skips results already returned by earlier pages.
 
     Returns:
     - Raw search data or None if a network error occurs.
     """
     try:
-        # Perform the search
-        search_data: SearchResult = user_service.search(search_term)
+        if page == 1 and num_results is None and deduplicator is None:
+            # Perform the search, joining an identical search already in flight
+            search_data: SearchResult = _search_flight.do(
+                search_flight_key(user_service, search_term),
+                lambda: user_service.search(search_term),
+            )
+        else:
+            # Follow-up pages depend on what this caller has already seen
+            search_data = user_service.search(
+                search_term,
+                page=page,
+                num_results=num_results,
+                deduplicator=deduplicator,
+            )
         return search_data
-    except RequestException as e:
+    except (RequestException, HTTPError) as e:
         logging.error(f"Network error during search execution: {e}", exc_info=True)
         return None
 
@@ -94,32 +130,142 @@ def extract_works_cited(all_results: AllResults) -> List[str]:
     ]
 
 
+def count_valid(search_data: SearchResult) -> int:
+    """Counts the validation results marked as valid."""
+    return sum(
+        1
+        for validation in search_data.get("validation_results", [])
+        if isinstance(validation, dict) and validation.get("is_valid", False)
+    )
+
+
+def next_page_size(
+    valid: int,
+    validated: int,
+    target_valid: int,
+    max_results: int = SEARCH_RETRY_MAX_RESULTS,
+) -> int:
+    """
+    Picks how many results to request so the next page likely reaches the target.
+
+    Uses the observed pass rate with add-one smoothing, so a run of
+    failures widens the page instead of dividing by zero.
+    """
+    pass_rate = (valid + 1) / (validated + 2)
+    needed = max(target_valid - valid, 1)
+    return max(1, min(max_results, math.ceil(needed / pass_rate)))
+
+
+def merge_search_data(combined: SearchResult, search_data: SearchResult) -> SearchResult:
+    """
+    Returns the combined data with a follow-up page's results and validations appended.
+
+    Builds new lists instead of extending the old ones, which may be shared
+    with the single-flight and cache layers.
+    """
+    merged = dict(combined)
+    for key in ("web_results", "validation_results", "all_results"):
+        merged[key] = list(combined.get(key, [])) + list(search_data.get(key, []))
+    return merged
+
+
 def retry_with_validation(
-    func: FetchFunction, *args: Tuple[T, ...], max_retries: int = 3
+    func: FetchFunction,
+    *args: Tuple[T, ...],
+    max_retries: int = 3,
+    target_valid: int = SEARCH_RETRY_TARGET_VALID,
+    max_results: int = SEARCH_RETRY_MAX_RESULTS,
 ) -> Optional[SearchResult]:
     """
     Attempts to execute a function with validation, retrying if necessary.
 
+    A network failure retries the same request. When results come back
+    with fewer than target_valid valid ones, the next attempt asks for more
+    results instead of repeating the query: first by widening the current
+    page up to max_results (one SearxNG page), then from the following
+    page. Results validated by earlier attempts are kept and never
+    validated again.
+
     Parameters:
-    - func: The function to execute.
+    - func: The fetch function; called as func(*args) first, then with
+      page, num_results and deduplicator keywords for follow-up pages.
     - *args: Arguments to pass to the function.
-    - max_retries: The maximum number of retries.
+    - max_retries: The maximum number of attempts.
+    - target_valid: Valid results that end the loop early.
+    - max_results: Results one SearxNG page holds.
 
     Returns:
-    - The result of the function if successful, or None if retries are exhausted.
+    - The combined results of every page fetched, or None if no attempt succeeded.
     """
+    combined: Optional[SearchResult] = None
+    deduplicator = ResultDeduplicator()
+    page = 1
+    # Results requested from the current page so far
+    page_offset = 0
     for attempt in range(1, max_retries + 1):
         logging.info(f"Attempt {attempt} of {max_retries}")
 
-        results = func(*args)
-        if results and "No results found" not in results:
-            logging.info("Validation succeeded.")
-            logging.debug(f"Results returned: {results}")  # Debug log
-            return results
+        widened = False
+        if combined is None:
+            results = func(*args)
         else:
+            validated = len(combined.get("validation_results", []))
+            size = next_page_size(
+                count_valid(combined), validated, target_valid, max_results
+            )
+            if page_offset < max_results:
+                # The rest of this page comes before the next one; the
+                # deduplicator drops the results already seen
+                widened = True
+                num_results = min(max_results, page_offset + size)
+            else:
+                page += 1
+                num_results = size
+            page_offset = num_results
+            logging.info(f"Requesting page {page} with {num_results} results")
+            results = func(
+                *args, page=page, num_results=num_results, deduplicator=deduplicator
+            )
+
+        if not results or "No results found" in results:
             logging.warning(
                 f"Validation failed or network error on attempt {attempt}. Retrying..."
             )
+            continue
+
+        if combined is None:
+            # A copy, since results may be shared with other single-flight callers
+            combined = dict(results)
+            page_offset = len(combined.get("all_results", []))
+            # Later requests skip whatever the first one already returned
+            for result in combined.get("all_results", []):
+                deduplicator.add(result)
+        elif results.get("all_results"):
+            combined = merge_search_data(combined, results)
+        elif widened:
+            logging.info(f"Page {page} has no more new results.")
+            page_offset = max_results
+            continue
+        else:
+            logging.info(f"Page {page} returned no new results.")
+            break
+
+        logging.debug(f"Results returned: {results}")  # Debug log
+        # Unvalidated data (or an empty first page) gains nothing from paging
+        if (
+            count_valid(combined) >= target_valid
+            or not combined.get("validation_results")
+        ):
+            logging.info("Validation succeeded.")
+            return combined
+        logging.warning(
+            f"Only {count_valid(combined)} valid results on attempt {attempt}. "
+            "Fetching more results..."
+        )
+
+    if combined is not None:
+        logging.warning("Retries exhausted; returning the results collected so far.")
+        return combined
 
     logging.error("All retries exhausted. Validation failed.")
     return None
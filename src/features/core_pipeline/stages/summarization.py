@@ -1,22 +1,81 @@
+import hashlib
 import logging
+from typing import Optional
+from typing import Tuple
+
 from src.features.llm_core.llm_core import LLMCore
+from src.shared.config.constants import SEARCH_CACHE_PATH
+from src.shared.config.constants import SUMMARY_CACHE_TTL
+from src.shared.services.search_cache import SearchCache
+from src.shared.services.single_flight import SingleFlight
+
+# Concurrent requests to summarize the same text share one LLM call
+_summary_flight: SingleFlight[str] = SingleFlight()
+# Summaries are only cached once a cache is configured (see set_summary_cache)
+_summary_cache: Optional[SearchCache] = None
+
+
+def create_summary_cache() -> SearchCache:
+    """Creates the summary cache in the search cache database."""
+    return SearchCache(
+        path=SEARCH_CACHE_PATH,
+        memory_ttl=SUMMARY_CACHE_TTL,
+        disk_ttl=SUMMARY_CACHE_TTL,
+        table="summaries",
+    )
+
+
+def set_summary_cache(cache: Optional[SearchCache]) -> None:
+    """Sets the cache summarize_results uses when no cache is passed in."""
+    global _summary_cache
+    _summary_cache = cache
 
 
-def summarize_results(llm_core: LLMCore, results_text: str) -> str:
+def summary_flight_key(llm_core: LLMCore, results_text: str) -> Tuple[int, str]:
+    """Builds the single-flight key: the LLM instance plus a digest of the text."""
+    return id(llm_core), hashlib.sha256(results_text.encode("utf-8")).hexdigest()
+
+
+def summary_cache_key(llm_core: LLMCore, results_text: str) -> str:
+    """Builds the summary cache key: the model name plus a digest of the text."""
+    model_name = getattr(llm_core, "model_name", type(llm_core).__name__)
+    raw = f"{model_name}\x1f{results_text}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def summarize_results(
+    llm_core: LLMCore, results_text: str, cache: Optional[SearchCache] = None
+) -> str:
     """
     Summarizes the search results text using the LLM core.
 
     Parameters:
     llm_core (LLMProvider): An instance of the LLM provider used for generating summaries.
     results_text (str): Concatenated search results text to be summarized.
+    cache (SearchCache): Cache of earlier summaries; defaults to the one set
+                         with set_summary_cache.
 
     Returns:
     str: A summary of the search results.
     """
     summary: str
+    cache = cache if cache is not None else _summary_cache
+
+    def summarize() -> str:
+        key = summary_cache_key(llm_core, results_text)
+        cached: Optional[str] = cache.get(key) if cache is not None else None
+        if cached is not None:
+            logging.info("Summary cache hit.")
+            return cached
+        generated = llm_core.summarize_text(results_text)
+        if cache is not None and generated:
+            cache.set(key, generated)
+        return generated
 
     try:
-        summary = llm_core.summarize_text(results_text)
+        summary = _summary_flight.do(
+            summary_flight_key(llm_core, results_text), summarize
+        )
         logging.info("Summary generated successfully.")
         logging.info("Summary Content:")
         logging.info(summary)
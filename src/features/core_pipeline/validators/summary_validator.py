@@ -20,6 +20,8 @@ def validate_summary(llm_core: LLMCore, results_text: str) -> bool:
     logging.info("Summary Validation Result:")
     logging.info(pprint.pformat(summary_validation_result))
 
+    # Speculative validation may have replaced the summary with a better candidate
+    summary = str(summary_validation_result.get("summary", summary))
     if summary_validation_result.get("is_valid", False):
         logging.info("Summary validation succeeded.")
         logging.info("Final Summary:")
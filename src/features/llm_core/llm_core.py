@@ -1,12 +1,31 @@
-from difflib import SequenceMatcher
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 from keybert import KeyBERT
 from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.feature_extraction.text import TfidfVectorizer
 import numpy as np
 
+from src.shared.config.constants import KEYWORD_MODEL_NAME
+from src.shared.config.constants import MICRO_BATCH_ENABLED
+from src.shared.config.constants import SUMMARY_CANDIDATES
+from src.shared.config.constants import SUMMARY_KEY_TERMS_CACHE_SIZE
+from src.shared.config.constants import SUMMARY_RELEVANCE_METRIC
+from src.shared.services.inference_autotune import encoder_batch_size
+from src.shared.services.micro_batcher import EncoderBackend
+from src.shared.services.micro_batcher import MicroBatchedBackend
+from src.shared.services.micro_batcher import get_batcher
+from src.shared.services.text_encoder import get_encoder
+from src.shared.services.text_relevance import relevance_metric
+
 from typing import List
 from typing import Dict
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 
@@ -18,15 +37,45 @@ Expectations = Optional[Dict[str, ExpectationValues]]
 ValidationSummaryResult = Dict[str, Union[float, bool, str]]
 
 
+def _l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
 class LLMCore:
-    def __init__(self) -> None:
-        self.kw_model: KeyBERT = KeyBERT("distilbert-base-nli-mean-tokens")
+    def __init__(self, relevance: str = SUMMARY_RELEVANCE_METRIC) -> None:
+        """:param relevance: Summary relevance metric, "shingle" or "sequence"."""
+        self.relevance_score = relevance_metric(relevance)
+        model = get_encoder(KEYWORD_MODEL_NAME)
+        batch_size = encoder_batch_size(KEYWORD_MODEL_NAME)
+        # Key term extraction shares forward passes with concurrent validation.
+        self.kw_model: KeyBERT = KeyBERT(
+            MicroBatchedBackend(model, get_batcher(model, batch_size))
+            if MICRO_BATCH_ENABLED
+            else EncoderBackend(model, batch_size)
+        )
+        self._key_terms: "OrderedDict[Tuple[str, int], List[str]]" = OrderedDict()
+        self._key_terms_lock = threading.Lock()
 
     def extract_key_terms(self, text: str, top_n: int = 5) -> List[str]:
         """Extracts key terms from the provided text."""
         keywords = self.kw_model.extract_keywords(text, top_n=top_n)
         return [word for word, score in keywords]
 
+    def cached_key_terms(self, text: str, top_n: int = 5) -> List[str]:
+        """extract_key_terms, remembered for the most recent texts."""
+        key = (hashlib.sha256(text.encode("utf-8")).hexdigest(), top_n)
+        with self._key_terms_lock:
+            if key in self._key_terms:
+                self._key_terms.move_to_end(key)
+                return self._key_terms[key]
+        key_terms = self.extract_key_terms(text, top_n=top_n)
+        with self._key_terms_lock:
+            self._key_terms[key] = key_terms
+            while len(self._key_terms) > SUMMARY_KEY_TERMS_CACHE_SIZE:
+                self._key_terms.popitem(last=False)
+        return key_terms
+
     def synonym_match_score(self, summary: str, key_terms: List[str]) -> float:
         """Calculates a score for key term presence in summary using synonym/context matching."""
         if not key_terms:
@@ -36,22 +85,68 @@ class LLMCore:
         similarity_matrix = cosine_similarity(tfidf[0:1], tfidf[1:])
         return np.mean(similarity_matrix)
 
+    def synonym_match_scores(
+        self, summaries: List[str], key_terms: List[str]
+    ) -> np.ndarray:
+        """
+        Batched synonym_match_score: the same per-summary TF-IDF similarity.
+
+        Tokens are counted once for every summary and key term. Fitting
+        TF-IDF on one summary plus the key terms only changes the IDF, which
+        is computed for each summary from the key terms' document frequencies.
+        """
+        if not key_terms:
+            return np.ones(len(summaries))
+        try:
+            counts = CountVectorizer().fit_transform(summaries + key_terms)
+        except ValueError:
+            # No summary or key term has a single token.
+            return np.zeros(len(summaries))
+        summary_counts = counts[: len(summaries)].toarray().astype(float)
+        term_counts = counts[len(summaries) :].toarray().astype(float)
+
+        # Smoothed IDF over the summary and the key terms, one row per summary
+        documents = len(key_terms) + 1
+        frequency = (term_counts > 0).sum(axis=0) + (summary_counts > 0)
+        idf = np.log((1 + documents) / (1 + frequency)) + 1.0
+
+        summary_vectors = _l2_normalize(summary_counts * idf)
+        # (summaries, key terms, vocabulary): each key term under each summary's IDF
+        term_vectors = _l2_normalize(term_counts[None, :, :] * idf[:, None, :])
+        similarity = np.einsum("sv,stv->st", summary_vectors, term_vectors)
+        return similarity.mean(axis=1)
+
     def validate_and_score_summary(
         self,
         summary: str,
         original_text: str,
         expectations: Expectations = None,
         max_retries: int = 3,
+        candidates: int = SUMMARY_CANDIDATES,
     ) -> ValidationSummaryResult:
-        """Validates and scores the summarization result with a retry mechanism if it doesn't meet the threshold."""
+        """
+        Validates and scores the summary, retrying if it misses the threshold.
+
+        :param max_retries: Summaries tried one at a time; ignored in
+                            candidate mode, which makes a single round.
+        :param candidates: With more than one, a failing summary is replaced
+                           by the best of that many candidates generated
+                           concurrently (see _validate_candidates) instead
+                           of retrying one summary at a time.
+        """
 
         if expectations is None:
             expectations = {
                 "min_word_count": 30,
                 "threshold": 0.5,
-                "key_terms": self.extract_key_terms(original_text, top_n=5),
+                "key_terms": self.cached_key_terms(original_text, top_n=5),
             }
 
+        if candidates > 1:
+            return self._validate_candidates(
+                summary, original_text, expectations, candidates
+            )
+
         for attempt in range(max_retries):
             # Criteria 1: Check minimum word count
             word_count = len(summary.split())
@@ -62,8 +157,8 @@ class LLMCore:
             key_terms = expectations.get("key_terms", [])
             keyword_coverage = self.synonym_match_score(summary, key_terms)
 
-            # Criteria 3: Relevance score using SequenceMatcher
-            relevance_score = SequenceMatcher(None, summary, original_text).ratio()
+            # Criteria 3: Relevance score against the original text
+            relevance_score = self.relevance_score(summary, original_text)
 
             # Weighted score with emphasis on relevance and keyword coverage
             score = (keyword_coverage * 0.5) + (relevance_score * 0.5)
@@ -86,3 +181,80 @@ class LLMCore:
             "is_valid": False,
             "reason": "Summary did not meet relevance threshold after max retries",
         }
+
+    def _score_summaries(
+        self, summaries: List[str], original_text: str, key_terms: List[str]
+    ) -> np.ndarray:
+        """Weighted keyword coverage and relevance of every summary, in one pass."""
+        keyword_coverage = self.synonym_match_scores(summaries, key_terms)
+        relevance = np.array(
+            [self.relevance_score(summary, original_text) for summary in summaries]
+        )
+        return (keyword_coverage * 0.5) + (relevance * 0.5)
+
+    def _validate_candidates(
+        self,
+        summary: str,
+        original_text: str,
+        expectations: Dict[str, ExpectationValues],
+        candidates: int,
+    ) -> ValidationSummaryResult:
+        """
+        Scores summary; if it fails, generates replacement candidates
+        concurrently and returns the best one that passes.
+
+        Worst-case latency is one extra summarization instead of one per retry.
+        The result includes the summary it describes.
+        """
+        min_word_count = expectations.get("min_word_count", 0)
+        threshold = expectations["threshold"]
+        key_terms = expectations.get("key_terms", [])
+
+        if len(summary.split()) < min_word_count:
+            return {"score": 0, "is_valid": False, "reason": "Summary is too short"}
+        score = float(self._score_summaries([summary], original_text, key_terms)[0])
+        if score >= threshold:
+            return {
+                "score": score,
+                "is_valid": True,
+                "reason": "Summary meets expectations",
+                "summary": summary,
+            }
+
+        with ThreadPoolExecutor(max_workers=candidates) as pool:
+            futures = [
+                pool.submit(self.summarize_text, original_text)
+                for _ in range(candidates)
+            ]
+        generated: List[str] = []
+        for future in futures:
+            try:
+                generated.append(future.result())
+            except Exception as e:
+                logging.error(f"Summary candidate failed: {e}")
+        generated = [
+            candidate
+            for candidate in generated
+            if candidate and len(candidate.split()) >= min_word_count
+        ]
+
+        best_score, best_summary = score, summary
+        if generated:
+            scores = self._score_summaries(generated, original_text, key_terms)
+            logging.info(f"Summary candidate scores: {scores.round(3).tolist()}")
+            best = int(np.argmax(scores))
+            if scores[best] > best_score:
+                best_score, best_summary = float(scores[best]), generated[best]
+        if best_score >= threshold:
+            return {
+                "score": best_score,
+                "is_valid": True,
+                "reason": "Summary candidate meets expectations",
+                "summary": best_summary,
+            }
+        return {
+            "score": best_score,
+            "is_valid": False,
+            "reason": "No summary candidate met the relevance threshold",
+            "summary": best_summary,
+        }
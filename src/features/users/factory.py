@@ -1,14 +1,38 @@
 from src.shared.services.web_search_service import WebSearchService
+from src.shared.services.search_cache import SearchCache
+from src.shared.services.engine_stats import EngineStats
+from src.shared.services.embedding_cache import EmbeddingCache
+from src.shared.services.text_encoder import encoder_id
+from src.shared.services.inference_autotune import ensure_tuned
 from src.shared.services.search_validation_service import SearchValidationService
 from src.features.users.models.user import User
 from src.shared.config.constants import WEB_SEARCH_URL
+from src.shared.config.constants import SEARCH_CACHE_PATH
+from src.shared.config.constants import SEARCH_STATS_PATH
+from src.shared.config.constants import EMBEDDING_CACHE_PATH
+from src.shared.config.constants import SEMANTIC_MODEL_NAME
+from src.shared.config.constants import INFERENCE_AUTOTUNE
 
 
 def create_user_service() -> User:
     """Factory function to instantiate User with dependencies injected."""
+    if INFERENCE_AUTOTUNE:
+        # Benchmarks once per host profile; later starts reuse the saved settings
+        ensure_tuned()
+
     # Dynamically fetch URL, defaulting to port 8080
-    web_search_service = WebSearchService(web_search_url=WEB_SEARCH_URL)
-    validation_service = SearchValidationService()
+    search_cache = SearchCache(path=SEARCH_CACHE_PATH)
+    engine_stats = EngineStats(path=SEARCH_STATS_PATH)
+    web_search_service = WebSearchService(
+        web_search_url=WEB_SEARCH_URL, cache=search_cache, engine_stats=engine_stats
+    )
+    validation_cache = SearchCache(path=SEARCH_CACHE_PATH, table="validations")
+    embedding_cache = EmbeddingCache(
+        encoder_id(SEMANTIC_MODEL_NAME), path=EMBEDDING_CACHE_PATH
+    )
+    validation_service = SearchValidationService(
+        cache=validation_cache, embedding_cache=embedding_cache
+    )
 
     # Pass all services to the User instance
     return User(web_search_service, validation_service)
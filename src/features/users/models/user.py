@@ -1,13 +1,31 @@
 # user_service/user.py
 
+import asyncio
+import logging
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+
+from src.shared.config.constants import SEARCH_MAX_CONCURRENCY
+from src.shared.config.constants import VALIDATION_STREAM_CHUNK
+from src.shared.services.inference_executor import InferenceExecutor
+from src.shared.services.inference_executor import get_inference_executor
+from src.shared.services.result_dedup import ResultDeduplicator
+from src.shared.services.result_dedup import dedupe_results
+from src.shared.services.search_engine_service import ResultMerger
 from src.shared.services.web_search_service import WebSearchService
 
 from src.shared.services.search_validation_service import SearchValidationService
 from src.shared.services.search_validation_service import ValidationResult
 
+from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
+from typing import Tuple
 
 from src.shared.config.types import SearchResponse
+from src.shared.config.types import SearchResult
 
 
 class User:
@@ -15,22 +33,113 @@ class User:
         self,
         web_search_service: WebSearchService,
         validation_service: SearchValidationService,
+        inference_executor: Optional[InferenceExecutor] = None,
     ) -> None:
+        """
+        :param inference_executor: Runs validation off the calling thread;
+                                   defaults to the process-wide executor.
+        """
         self.web_search_service: WebSearchService = web_search_service
         self.validation_service: SearchValidationService = validation_service
+        self.inference_executor: InferenceExecutor = (
+            inference_executor or get_inference_executor()
+        )
 
-    def search(self, user_input: str) -> SearchResponse:
-        """Creates a search term, fetches results, and validates relevance."""
-        search_term = self.web_search_service.create_search_term(user_input)
-        search_results = self.web_search_service.fetch_results(search_term)
+    def close(self) -> None:
+        """Saves search statistics and releases the search service's connections."""
+        self.web_search_service.close()
 
+    def _submit_validation(
+        self, search_term: str, search_results: List[SearchResult]
+    ) -> "Future[List[ValidationResult]]":
         se_descriptions = [result["snippet"] for result in search_results]
+        return self.inference_executor.submit(
+            self.validation_service.validate_batch, search_term, se_descriptions
+        )
+
+    def _validate(
+        self, search_term: str, search_results: List[SearchResult]
+    ) -> SearchResponse:
+        # Duplicates would only cost encoder time and prompt tokens
+        search_results = dedupe_results(search_results)
+        se_descriptions = [result["snippet"] for result in search_results]
+
+        # Validate every result against the query in one batch
+        validation_results: List[ValidationResult] = (
+            self.validation_service.validate_batch(search_term, se_descriptions)
+        )
+        self.web_search_service.record_validation(search_results, validation_results)
 
-        # Validate each result against the query
+        return {
+            "search_term": search_term,
+            "web_results": se_descriptions,
+            "validation_results": validation_results,
+            "all_results": search_results,
+        }
+
+    def search(
+        self,
+        user_input: str,
+        page: int = 1,
+        num_results: Optional[int] = None,
+        deduplicator: Optional[ResultDeduplicator] = None,
+    ) -> SearchResponse:
+        """
+        Creates a search term, fetches results, and validates relevance.
+
+        Results are streamed, so duplicate pages and near-duplicate snippets
+        are dropped as they arrive. The rest are validated on the inference
+        executor in chunks as they come in, while slower engines are still
+        answering. Once every engine is done, the results are ranked and cut
+        to the set WebSearchService.fetch_results returns (ranked_results).
+
+        :param page: SearxNG result page to fetch.
+        :param num_results: Results to fetch instead of the service default.
+        :param deduplicator: Shared across calls to skip results an earlier
+                             page already returned (and validated).
+        """
+        search_term = self.web_search_service.create_search_term(user_input)
+
+        deduplicator = deduplicator or ResultDeduplicator()
+        merger = ResultMerger()
+        search_results: List[SearchResult] = []
+        # id() of the merged result each kept copy was made from
+        sources: List[int] = []
+        validations: List["Future[List[ValidationResult]]"] = []
+        unvalidated: List[SearchResult] = []
+        for result in self.web_search_service.stream_results(
+            search_term, page=page, num_results=num_results, merger=merger
+        ):
+            kept = deduplicator.add(result)
+            if kept is None:
+                continue
+            search_results.append(kept)
+            sources.append(id(result))
+            unvalidated.append(kept)
+            if len(unvalidated) >= VALIDATION_STREAM_CHUNK:
+                validations.append(self._submit_validation(search_term, unvalidated))
+                unvalidated = []
+        if unvalidated:
+            validations.append(self._submit_validation(search_term, unvalidated))
+
+        # Batch scores do not depend on how the batch is split.
         validation_results: List[ValidationResult] = [
-            self.validation_service.validate(search_term, result)
-            for result in se_descriptions
+            validation_result
+            for validation in validations
+            for validation_result in validation.result()
         ]
+        order = sorted(
+            range(len(search_results)), key=lambda i: -merger.score(search_results[i])
+        )
+        # Cache hits leave the merger empty; they are already the ranked set.
+        if len(merger):
+            ranked = self.web_search_service.ranked_results(merger, num_results)
+            top = {id(result) for result in ranked}
+            order = [i for i in order if sources[i] in top]
+        search_results = [search_results[i] for i in order]
+        validation_results = [validation_results[i] for i in order]
+        se_descriptions = [result["snippet"] for result in search_results]
+        self.web_search_service.record_validation(search_results, validation_results)
 
         return {
             "search_term": search_term,
@@ -38,3 +147,120 @@ class User:
             "validation_results": validation_results,
             "all_results": search_results,
         }
+
+    @staticmethod
+    def _failed_response(search_term: str, error: BaseException) -> SearchResponse:
+        logging.warning(f"Search for {search_term!r} failed: {error}")
+        return {
+            "search_term": search_term,
+            "web_results": [],
+            "validation_results": [],
+            "all_results": [],
+            "error": str(error) or type(error).__name__,
+        }
+
+    def _fetch_and_validate(
+        self, search_term: str, fetch: "Future[List[SearchResult]]"
+    ) -> "Future[SearchResponse]":
+        """Submits a finished fetch for validation; a failed fetch resolves to its error."""
+        try:
+            return self.inference_executor.submit(
+                self._validate, search_term, fetch.result()
+            )
+        except Exception as e:
+            failed: "Future[SearchResponse]" = Future()
+            failed.set_result(self._failed_response(search_term, e))
+            return failed
+
+    def _response(
+        self, search_term: str, validation: "Future[SearchResponse]"
+    ) -> SearchResponse:
+        try:
+            return validation.result()
+        except Exception as e:
+            return self._failed_response(search_term, e)
+
+    def search_many(
+        self, user_inputs: List[str], max_concurrency: int = SEARCH_MAX_CONCURRENCY
+    ) -> List[SearchResponse]:
+        """
+        Runs several searches concurrently and returns responses in input order.
+
+        All SearxNG requests are in flight together (at most max_concurrency
+        at a time); each search is validated on the inference executor as
+        soon as its results arrive. A search that fails does not fail the
+        batch: its response has no results and an "error" message instead.
+        """
+        search_terms = [
+            self.web_search_service.create_search_term(user_input)
+            for user_input in user_inputs
+        ]
+        validations: Dict[int, "Future[SearchResponse]"] = {}
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            futures = {
+                pool.submit(self.web_search_service.fetch_results, search_term): index
+                for index, search_term in enumerate(search_terms)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                validations[index] = self._fetch_and_validate(search_terms[index], future)
+
+        return [
+            self._response(search_terms[index], validations[index])
+            for index in range(len(search_terms))
+        ]
+
+    def iter_search_many(
+        self, user_inputs: List[str], max_concurrency: int = SEARCH_MAX_CONCURRENCY
+    ) -> Iterator[Tuple[int, SearchResponse]]:
+        """
+        Like search_many, but yields (input index, response) pairs as searches complete.
+
+        Each response is validated as soon as its results arrive, while the
+        remaining searches are still in flight. Failed searches are yielded
+        with an "error" response, as in search_many.
+        """
+        search_terms = [
+            self.web_search_service.create_search_term(user_input)
+            for user_input in user_inputs
+        ]
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            futures = {
+                pool.submit(self.web_search_service.fetch_results, search_term): index
+                for index, search_term in enumerate(search_terms)
+            }
+            try:
+                for future in as_completed(futures):
+                    index = futures[future]
+                    yield index, self._response(
+                        search_terms[index],
+                        self._fetch_and_validate(search_terms[index], future),
+                    )
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    async def asearch_many(
+        self, user_inputs: List[str], max_concurrency: int = SEARCH_MAX_CONCURRENCY
+    ) -> List[SearchResponse]:
+        """Async variant of search_many; failed searches get an "error" response too."""
+        search_terms = [
+            self.web_search_service.create_search_term(user_input)
+            for user_input in user_inputs
+        ]
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def search(search_term: str) -> SearchResponse:
+            try:
+                async with semaphore:
+                    search_results = await self.web_search_service.afetch_results(
+                        search_term
+                    )
+                # Validation is CPU bound; keep it off the event loop.
+                return await self.inference_executor.arun(
+                    self._validate, search_term, search_results
+                )
+            except Exception as e:
+                return self._failed_response(search_term, e)
+
+        return list(await asyncio.gather(*(search(term) for term in search_terms)))
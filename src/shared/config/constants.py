@@ -1,6 +1,8 @@
 # constants.py
 
 import logging
+import os
+from typing import List
 
 logging.basicConfig(filename="./logs/query.log", level=logging.INFO)
 
@@ -12,3 +14,152 @@ logging.basicConfig(filename="./logs/query.log", level=logging.INFO)
 
 # dev
 WEB_SEARCH_URL: str = "http://localhost:8080/search"
+
+# SearxNG client settings
+SEARCH_TIMEOUT: float = 5.0  # seconds per request
+SEARCH_MAX_CONNECTIONS: int = 20  # size of the keep-alive connection pool
+SEARCH_KEEPALIVE_EXPIRY: float = 30.0  # seconds an idle connection stays open
+SEARCH_LANGUAGE: str = "en"
+
+# Search result cache settings
+SEARCH_CACHE_PATH: str = "./cache/search_cache.sqlite3"
+SEARCH_CACHE_MEMORY_TTL: float = 300.0  # seconds
+SEARCH_CACHE_DISK_TTL: float = 3600.0  # seconds
+SEARCH_CACHE_MAX_MEMORY_ENTRIES: int = 1024
+SEARCH_CACHE_MAX_DISK_ENTRIES: int = 100_000
+
+# Multi-engine fan-out settings
+SEARCH_ENGINES: List[str] = ["brave", "duckduckgo", "google", "qwant", "wikipedia"]
+SEARCH_ENGINE_DEADLINE: float = 3.0  # seconds each engine gets before it is dropped
+SEARCH_HEDGE_PERCENTILE: float = 95.0  # latency percentile that triggers a hedged request
+SEARCH_HEDGE_MIN_SAMPLES: int = 20  # latency samples needed before hedging kicks in
+SEARCH_MERGE_GRACE: float = 0.5  # seconds other engines get once num_results are merged
+
+# Batch search settings
+SEARCH_MAX_CONCURRENCY: int = 8  # concurrent SearxNG requests per search_many call
+
+# SearxNG transport: "live", "record" (capture responses to the corpus) or
+# "replay" (serve the corpus back without a SearxNG instance)
+SEARX_TRANSPORT_MODE: str = os.getenv("SEARX_TRANSPORT_MODE", "live")
+SEARX_CORPUS_PATH: str = os.getenv("SEARX_CORPUS_PATH", "./cache/searx_corpus.jsonl.gz")
+# Replay latency: "none", "recorded" (per response) or "sampled" (from the corpus)
+SEARX_REPLAY_LATENCY: str = os.getenv("SEARX_REPLAY_LATENCY", "none")
+
+# Duplicate result elimination
+DEDUP_SIMHASH_DISTANCE: int = 3  # max differing SimHash bits for near-duplicate snippets
+DEDUP_MIN_TOKENS: int = 6  # shorter snippets are only de-duplicated on exact text
+
+# Adaptive engine selection
+SEARCH_MAX_ENGINES: int = 3  # engines queried per search, picked from SEARCH_ENGINES
+SEARCH_EXPLORATION_RATE: float = 0.1  # chance of swapping in an unselected engine
+SEARCH_STATS_MIN_SAMPLES: int = 20  # samples before an engine is ranked on its stats
+SEARCH_STATS_PATH: str = "./cache/engine_stats.json"
+SEARCH_STATS_SAVE_INTERVAL: float = 60.0  # seconds between stats snapshots on disk
+
+# Pipeline search retries
+SEARCH_RETRY_TARGET_VALID: int = 1  # valid results that end the retry loop early
+SEARCH_RETRY_MAX_RESULTS: int = 10  # largest page requested on a retry (one SearxNG page)
+
+# Full-page content fetching (replaces snippets with page text before summarizing)
+PAGE_FETCH_ENABLED: bool = os.getenv("PAGE_FETCH_ENABLED", "false").lower() == "true"
+PAGE_FETCH_TOP_N: int = 3  # result pages fetched per search
+PAGE_FETCH_TIMEOUT: float = 8.0  # seconds per page, including the body download
+PAGE_FETCH_MAX_BYTES: int = 2_000_000  # body bytes read before a page is truncated
+PAGE_FETCH_MAX_CHARS: int = 8_000  # extracted text kept per page
+PAGE_FETCH_MAX_CONCURRENCY: int = 16  # page downloads in flight overall
+PAGE_FETCH_PER_HOST: int = 2  # page downloads in flight per host
+PAGE_FETCH_USER_AGENT: str = "Mozilla/5.0 (compatible; search-summarizer/1.0)"
+
+# Fetched page cache
+PAGE_CACHE_PATH: str = "./cache/pages"  # directory for the index and compressed blobs
+PAGE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # compressed blob bytes kept on disk
+PAGE_CACHE_TTL: float = 900.0  # seconds a page is served without revalidation
+
+# Summary relevance metric: "sequence" (difflib's SequenceMatcher ratio,
+# quadratic on long texts) or "shingle" (word-shingle Dice, linear time).
+# The summary threshold was set for "sequence"; recalibrate it before switching.
+SUMMARY_RELEVANCE_METRIC: str = os.getenv("SUMMARY_RELEVANCE_METRIC", "sequence")
+SUMMARY_RELEVANCE_SHINGLE_SIZE: int = 2  # words per shingle
+
+# Summary candidates generated concurrently when a summary fails validation;
+# 1 regenerates one summary at a time instead
+SUMMARY_CANDIDATES: int = int(os.getenv("SUMMARY_CANDIDATES", "1"))
+SUMMARY_KEY_TERMS_CACHE_SIZE: int = 256  # original texts whose key terms are kept
+
+# Summary cache (shares the search cache database)
+SUMMARY_CACHE_TTL: float = 3600.0  # seconds a cached summary is reused
+
+# Cache warming for recurring queries
+CACHE_WARM_INTERVAL: float = 1800.0  # seconds between refreshes; below the disk TTLs
+CACHE_WARM_JITTER: float = 0.1  # +/- fraction of the interval added to each run
+CACHE_WARM_RATE: float = 0.2  # warm queries started per second
+CACHE_WARM_BURST: int = 3  # warm queries allowed back to back
+CACHE_WARM_QUERY_LOG: str = "./logs/query.log"
+CACHE_WARM_MIN_COUNT: int = 3  # times a logged query must appear to be warmed
+CACHE_WARM_MAX_QUERIES: int = 200  # most frequent logged queries imported
+
+# Query fingerprinting for cache and single-flight keys
+QUERY_FINGERPRINT_STEM: bool = (
+    os.getenv("QUERY_FINGERPRINT_STEM", "false").lower() == "true"
+)
+
+# Validation models
+SEMANTIC_MODEL_NAME: str = "all-MiniLM-L6-v2"
+KEYWORD_MODEL_NAME: str = "distilbert-base-nli-mean-tokens"
+# Run KeyBERT on the semantic model, reusing its cached embeddings
+VALIDATION_SHARED_ENCODER: bool = (
+    os.getenv("VALIDATION_SHARED_ENCODER", "false").lower() == "true"
+)
+
+# Validation scorers and their weights ("name:weight,..."); weights are normalized
+VALIDATION_SCORERS: str = os.getenv(
+    "VALIDATION_SCORERS", "tfidf:0.3,semantic:0.5,keyword:0.2"
+)
+
+# Validation cascade: results whose TF-IDF cosine falls below LOW or above HIGH
+# are decided without the transformers. The defaults never exit early; run
+# `python -m src.shared.services.search_validation_service --calibrate` to
+# fit a band to your traffic.
+VALIDATION_CASCADE: bool = os.getenv("VALIDATION_CASCADE", "false").lower() == "true"
+VALIDATION_CASCADE_LOW: float = float(os.getenv("VALIDATION_CASCADE_LOW", "0.0"))
+VALIDATION_CASCADE_HIGH: float = float(os.getenv("VALIDATION_CASCADE_HIGH", "1.0"))
+VALIDATION_CASCADE_TOLERANCE: float = 0.01  # decisions allowed to differ when calibrating
+
+# Inference executor for validation (encoder) work
+INFERENCE_WORKERS: int = int(os.getenv("INFERENCE_WORKERS", "2"))  # tasks run in parallel
+INFERENCE_QUEUE_DEPTH: int = 8  # tasks waiting for a worker before submitters block
+# Torch intra-op threads per task; 0 splits the cores between the threads
+# running forward passes (INFERENCE_ENCODING_THREADS)
+INFERENCE_TORCH_THREADS: int = int(os.getenv("INFERENCE_TORCH_THREADS", "0"))
+VALIDATION_STREAM_CHUNK: int = 5  # streamed results validated together while more arrive
+
+# Inference autotuning: the best torch thread count and encoder batch size per
+# host profile, from `python -m src --autotune` or at startup when enabled
+INFERENCE_AUTOTUNE: bool = os.getenv("INFERENCE_AUTOTUNE", "false").lower() == "true"
+INFERENCE_TUNING_PATH: str = "./cache/inference_tuning.json"
+AUTOTUNE_BATCH_SIZES: List[int] = [8, 16, 32, 64]
+AUTOTUNE_SNIPPETS: int = 256  # synthetic snippets encoded per configuration
+
+# Micro-batching of encoder calls across concurrent requests. Off by default:
+# every forward pass then runs on the one batcher thread and each encode waits
+# out the window, which only pays off under many concurrent requests.
+MICRO_BATCH_ENABLED: bool = os.getenv("MICRO_BATCH_ENABLED", "false").lower() == "true"
+MICRO_BATCH_WINDOW: float = float(os.getenv("MICRO_BATCH_WINDOW", "0.005"))  # seconds
+MICRO_BATCH_MAX_TEXTS: int = 128  # queued texts that end the window early
+MICRO_BATCH_BUCKET_SIZE: int = 32  # texts of similar length per forward pass
+# Threads running forward passes at once, which torch threads and autotuning are
+# sized for: the batcher's thread, or else every inference worker
+INFERENCE_ENCODING_THREADS: int = 1 if MICRO_BATCH_ENABLED else INFERENCE_WORKERS
+
+# Encoder inference backend: torch, torch-int8, onnx or onnx-int8
+ENCODER_BACKEND: str = os.getenv("ENCODER_BACKEND", "torch")
+ENCODER_EXPORT_PATH: str = "./cache/encoders"  # exported int8 ONNX models
+# Instruction set the int8 ONNX weights are tuned for: arm64, avx2, avx512, avx512_vnni
+ENCODER_QUANTIZATION: str = os.getenv("ENCODER_QUANTIZATION", "avx512_vnni")
+
+# Embedding cache for encoder outputs
+EMBEDDING_CACHE_PATH: str = "./cache/embeddings"  # one vector matrix and index per model
+EMBEDDING_CACHE_DTYPE: str = os.getenv("EMBEDDING_CACHE_DTYPE", "float32")  # or float16
+EMBEDDING_CACHE_MAX_MEMORY_ENTRIES: int = 10_000  # vectors kept in the in-process LRU
+# Disk tier rows; past this the oldest quarter is compacted out of the matrix file
+EMBEDDING_CACHE_MAX_ROWS: int = int(os.getenv("EMBEDDING_CACHE_MAX_ROWS", "1000000"))
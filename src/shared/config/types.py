@@ -1,15 +1,18 @@
 from typing import List
 from typing import Dict
 from typing import Union
+from typing import TYPE_CHECKING
 
 from typing import TypedDict
 
-from src.shared.services.search_validation_service import ValidationResult
+if TYPE_CHECKING:
+    # Imported for annotations only so the search path does not load the ML stack.
+    from src.shared.services.search_validation_service import ValidationResult
 
 SearchEngineResults = str
 
 
-SearchResponse = Dict[str, Union[str, List[Union[str, ValidationResult]]]]
+SearchResponse = Dict[str, Union[str, List[Union[str, "ValidationResult"]]]]
 
 
 class SearchResult(TypedDict):
@@ -0,0 +1,88 @@
+# src/shared/services/background_loop.py
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any
+from typing import Coroutine
+from typing import Optional
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    """
+    Runs an asyncio event loop on a daemon thread.
+
+    Async resources such as pooled HTTP clients are bound to the loop that
+    created them. Owning a private loop lets the same client serve both
+    blocking callers (``run``) and coroutines running on any other loop
+    (``run_async``) without rebuilding its connection pool.
+    """
+
+    def __init__(self, name: str = "background-loop") -> None:
+        self._name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Returns the running loop, starting it on first use (and again after a fork)."""
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                self._start()
+            assert self._loop is not None
+            return self._loop
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def _run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=_run, name=self._name, daemon=True)
+        thread.start()
+        ready.wait()
+        self._loop = loop
+        self._thread = thread
+        self._pid = os.getpid()
+
+    def in_loop_thread(self) -> bool:
+        """Checks whether the caller is running on the background loop's thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "Future[T]":
+        """Schedules a coroutine on the background loop and returns a concurrent future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Runs a coroutine on the background loop and blocks until it finishes."""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("BackgroundLoop.run() cannot be called from its own loop.")
+        return self.submit(coro).result(timeout)
+
+    async def run_async(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Awaits a coroutine on the background loop from any other event loop."""
+        if self.in_loop_thread():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def stop(self) -> None:
+        """Stops the loop and waits for its thread to exit."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None or thread is None or self._pid != os.getpid():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
@@ -0,0 +1,276 @@
+# src/shared/services/cache_warmer.py
+
+import heapq
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TypedDict
+
+from src.shared.config.constants import CACHE_WARM_BURST
+from src.shared.config.constants import CACHE_WARM_INTERVAL
+from src.shared.config.constants import CACHE_WARM_JITTER
+from src.shared.config.constants import CACHE_WARM_MAX_QUERIES
+from src.shared.config.constants import CACHE_WARM_MIN_COUNT
+from src.shared.config.constants import CACHE_WARM_QUERY_LOG
+from src.shared.config.constants import CACHE_WARM_RATE
+from src.shared.services.query_log import iter_query_log
+from src.shared.services.search_cache import refreshing
+
+# Longest the scheduler thread sleeps, so new queries and stop() are noticed
+_MAX_IDLE = 1.0
+
+
+class WarmQuery(TypedDict):
+    term: str
+    priority: int
+    interval: float
+    runs: int
+    failures: int
+    last_run: Optional[float]
+
+
+def load_query_log(
+    path: str = CACHE_WARM_QUERY_LOG,
+    min_count: int = CACHE_WARM_MIN_COUNT,
+    limit: int = CACHE_WARM_MAX_QUERIES,
+) -> List[Tuple[str, int]]:
+    """
+    Counts the search terms in a query log.
+
+    Returns (term, count) pairs for terms seen at least min_count times,
+    most frequent first and at most limit of them.
+    """
+    counts = Counter(iter_query_log(path))
+    return [
+        (term, count) for term, count in counts.most_common(limit) if count >= min_count
+    ]
+
+
+class TokenBucket:
+    """Allows ``rate`` operations per second with bursts of up to ``capacity``."""
+
+    def __init__(
+        self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._rate = rate
+        self._capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Takes a token if one is available."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    def wait_time(self) -> float:
+        """Seconds until the next token is available."""
+        with self._lock:
+            self._refill()
+            return max(0.0, (1.0 - self._tokens) / self._rate)
+
+
+class CacheWarmer:
+    """
+    Re-runs recurring search terms ahead of demand to keep caches warm.
+
+    Every term is refreshed about once per interval, with random jitter so
+    refreshes do not bunch up. When several terms are due, higher priority
+    terms run first, and a token bucket caps how fast refreshes start.
+    Refreshes run under ``refreshing()``, so cache reads miss and every layer
+    recomputes and stores a fresh entry.
+    """
+
+    def __init__(
+        self,
+        warm: Callable[[str], None],
+        interval: float = CACHE_WARM_INTERVAL,
+        jitter: float = CACHE_WARM_JITTER,
+        rate: float = CACHE_WARM_RATE,
+        burst: int = CACHE_WARM_BURST,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        :param warm: Runs one term through the layers to warm, e.g. search and summary.
+        :param interval: Default seconds between refreshes of a term.
+        :param jitter: Fraction of the interval each refresh is randomly moved by.
+        :param rate: Refreshes started per second.
+        :param burst: Refreshes allowed back to back before the rate applies.
+        :param clock: Monotonic clock, replaceable in tests.
+        """
+        self._warm = warm
+        self._interval = interval
+        self._jitter = jitter
+        self._clock = clock
+        self._bucket = TokenBucket(rate, burst, clock)
+        self._queries: Dict[str, WarmQuery] = {}
+        # (due time, -priority, version, term); stale versions are skipped
+        self._schedule: List[Tuple[float, int, int, str]] = []
+        self._versions: Dict[str, int] = {}
+        self._random = random.Random()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _jittered(self, interval: float) -> float:
+        return interval * (1.0 + self._random.uniform(-self._jitter, self._jitter))
+
+    def _push(self, term: str, due: float) -> None:
+        version = self._versions.get(term, 0) + 1
+        self._versions[term] = version
+        priority = self._queries[term]["priority"]
+        heapq.heappush(self._schedule, (due, -priority, version, term))
+
+    def add(
+        self, term: str, priority: int = 0, interval: Optional[float] = None
+    ) -> None:
+        """
+        Schedules term for warming, or updates its priority and interval.
+
+        New terms first run within one jitter window, so a large import does
+        not all come due at once.
+        """
+        interval = self._interval if interval is None else interval
+        with self._lock:
+            existing = self._queries.get(term)
+            if existing is not None:
+                existing["priority"] = priority
+                existing["interval"] = interval
+                last_run = existing["last_run"]
+                start = self._clock() if last_run is None else last_run
+                due = start + self._jittered(interval)
+            else:
+                self._queries[term] = {
+                    "term": term,
+                    "priority": priority,
+                    "interval": interval,
+                    "runs": 0,
+                    "failures": 0,
+                    "last_run": None,
+                }
+                due = self._clock() + self._random.uniform(0, interval * self._jitter)
+            self._push(term, due)
+        self._wake.set()
+
+    def remove(self, term: str) -> None:
+        """Stops warming term."""
+        with self._lock:
+            self._queries.pop(term, None)
+            # Bumping the version orphans any schedule entry still queued.
+            self._versions[term] = self._versions.get(term, 0) + 1
+
+    def add_from_log(
+        self,
+        path: str = CACHE_WARM_QUERY_LOG,
+        min_count: int = CACHE_WARM_MIN_COUNT,
+        limit: int = CACHE_WARM_MAX_QUERIES,
+    ) -> int:
+        """Schedules the most frequent logged terms, prioritized by how often they appear."""
+        entries = load_query_log(path, min_count, limit)
+        for term, count in entries:
+            self.add(term, priority=count)
+        logging.info(f"Imported {len(entries)} queries to warm from {path}")
+        return len(entries)
+
+    def queries(self) -> List[WarmQuery]:
+        """Returns the scheduled terms and their run counters."""
+        with self._lock:
+            return [WarmQuery(**query) for query in self._queries.values()]
+
+    def _due(self, now: float) -> List[Tuple[float, int, int, str]]:
+        due: List[Tuple[float, int, int, str]] = []
+        while self._schedule and self._schedule[0][0] <= now:
+            entry = heapq.heappop(self._schedule)
+            if entry[3] in self._queries and self._versions[entry[3]] == entry[2]:
+                due.append(entry)
+        # Highest priority first; earliest due breaks ties.
+        due.sort(key=lambda entry: (entry[1], entry[0]))
+        return due
+
+    def run_pending(self) -> int:
+        """Warms due terms while the rate limit allows; returns how many ran."""
+        with self._lock:
+            due = self._due(self._clock())
+        ran = 0
+        for index, (_, _, _, term) in enumerate(due):
+            if self._stop.is_set() or not self._bucket.try_acquire():
+                # Put the rest back; they stay due for the next round.
+                with self._lock:
+                    for entry in due[index:]:
+                        heapq.heappush(self._schedule, entry)
+                break
+            self._run(term)
+            ran += 1
+        return ran
+
+    def _run(self, term: str) -> None:
+        failed = False
+        try:
+            with refreshing():
+                self._warm(term)
+        except Exception as e:
+            failed = True
+            logging.warning(f"Cache warming failed for {term}: {e}")
+        with self._lock:
+            query = self._queries.get(term)
+            if query is None:
+                return
+            now = self._clock()
+            query["runs"] += 1
+            query["failures"] += int(failed)
+            query["last_run"] = now
+            self._push(term, now + self._jittered(query["interval"]))
+
+    def next_wake(self) -> float:
+        """Seconds until a term is due or a rate-limit token frees up, capped at 1s."""
+        with self._lock:
+            if not self._schedule:
+                return _MAX_IDLE
+            until_due = self._schedule[0][0] - self._clock()
+        if until_due > 0:
+            return min(until_due, _MAX_IDLE)
+        return min(max(self._bucket.wait_time(), 0.01), _MAX_IDLE)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.run_pending()
+            self._wake.wait(self.next_wake())
+            self._wake.clear()
+
+    def start(self) -> None:
+        """Starts warming on a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="cache-warmer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stops the warming thread after the refresh in progress, if any."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
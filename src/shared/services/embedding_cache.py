@@ -0,0 +1,400 @@
+# src/shared/services/embedding_cache.py
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import TypedDict
+
+import numpy as np
+
+from src.shared.config.constants import EMBEDDING_CACHE_DTYPE
+from src.shared.config.constants import EMBEDDING_CACHE_MAX_MEMORY_ENTRIES
+from src.shared.config.constants import EMBEDDING_CACHE_MAX_ROWS
+
+# SQLite's default limit on bound parameters is 999.
+_QUERY_CHUNK = 500
+
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9._-]+")
+
+# Share of max_rows, newest first, kept when the disk tier is compacted.
+_COMPACT_KEEP = 0.75
+
+
+class EmbeddingCacheStats(TypedDict):
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    vectors: int
+
+
+def normalize_text(text: str) -> str:
+    """NFKC-normalizes text and collapses whitespace; the form cache keys are built from."""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache for text embeddings of one model.
+
+    Vectors are keyed by the model name and the SHA-256 of the normalized
+    text, so texts that differ only in Unicode form or whitespace share one
+    vector. The memory tier is a per-process LRU. The optional disk tier is
+    an append-only matrix file, read through a read-only memory map so worker
+    processes share its pages, with a SQLite index (WAL mode) mapping keys
+    to rows. Rows are written before their index entry is committed, so
+    readers never see a half-written vector.
+
+    Once the matrix holds more than max_rows vectors, the newest are copied
+    to a new matrix file (the next generation) and the old one is removed.
+    Readers check the generation with every index lookup and remap.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        path: Optional[str] = None,
+        dtype: str = EMBEDDING_CACHE_DTYPE,
+        max_memory_entries: int = EMBEDDING_CACHE_MAX_MEMORY_ENTRIES,
+        max_rows: int = EMBEDDING_CACHE_MAX_ROWS,
+    ) -> None:
+        """
+        :param model_name: Encoder the vectors come from; each model gets its own files.
+        :param path: Directory for the disk tier; None keeps the cache in memory only.
+        :param dtype: Storage type of the matrix file, "float32" or "float16".
+        :param max_memory_entries: LRU bound for the memory tier.
+        :param max_rows: Disk tier vectors kept before the oldest are compacted away.
+        """
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported embedding cache dtype: {dtype}")
+        self._model_name = model_name
+        self._dtype = np.dtype(dtype)
+        self._max_memory_entries = max_memory_entries
+        self._max_rows = max_rows
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._map: Optional[np.memmap] = None
+        self._dim: Optional[int] = None
+        self._generation = 0
+        self._stats: EmbeddingCacheStats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "vectors": 0,
+        }
+
+        self._dir: Optional[str] = None
+        if path is not None:
+            self._dir = os.path.join(path, _UNSAFE_NAME.sub("_", model_name))
+            os.makedirs(self._dir, exist_ok=True)
+            self._init_index()
+
+    @property
+    def model_name(self) -> str:
+        return self._model_name
+
+    def key(self, text: str) -> str:
+        """Builds the cache key for text: the model name plus a hash of the normalized text."""
+        raw = "\x1f".join([self._model_name, normalize_text(text)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared across threads (or forks).
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            assert self._dir is not None
+            conn = sqlite3.connect(
+                os.path.join(self._dir, "index.sqlite3"),
+                timeout=5.0,
+                isolation_level=None,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_index(self) -> None:
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS vectors (key TEXT PRIMARY KEY, row INTEGER NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._load_dim()
+
+    def _matrix_path(self, generation: int) -> str:
+        assert self._dir is not None
+        # The dtype is part of the file name, so switching it starts a new matrix.
+        name = f"vectors.{self._dtype.name}"
+        return os.path.join(self._dir, f"{name}.{generation}" if generation else name)
+
+    def _read_generation(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute(
+            "SELECT value FROM meta WHERE name = ?", (f"generation.{self._dtype.name}",)
+        ).fetchone()
+        return int(row[0]) if row is not None else 0
+
+    def _use_generation(self, generation: int) -> None:
+        # A compaction renumbered the rows; drop the map of the old matrix.
+        with self._lock:
+            if generation != self._generation:
+                self._generation = generation
+                self._map = None
+
+    def _load_dim(self) -> None:
+        # Unknown until the first vector is stored, possibly by another process.
+        row = (
+            self._connection()
+            .execute("SELECT value FROM meta WHERE name = ?", (f"dim.{self._dtype.name}",))
+            .fetchone()
+        )
+        if row is not None:
+            self._dim = int(row[0])
+
+    def _memory_get(self, key: str) -> Optional[np.ndarray]:
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._memory.move_to_end(key)
+        return vector
+
+    def _memory_set(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _rows(self, keys: List[str]) -> Dict[str, int]:
+        conn = self._connection()
+        rows: Dict[str, int] = {}
+        for start in range(0, len(keys), _QUERY_CHUNK):
+            chunk = keys[start : start + _QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows.update(
+                conn.execute(
+                    f"SELECT key, row FROM vectors WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+            )
+        return rows
+
+    def _matrix(self, min_rows: int) -> Optional[np.memmap]:
+        # Other processes append rows, so remap once the file has grown.
+        with self._lock:
+            if self._map is not None and len(self._map) >= min_rows:
+                return self._map
+            path = self._matrix_path(self._generation)
+            if self._dim is None or not os.path.exists(path):
+                return None
+            rows = os.path.getsize(path) // (self._dim * self._dtype.itemsize)
+            if rows < min_rows:
+                return None
+            self._map = np.memmap(path, dtype=self._dtype, mode="r", shape=(rows, self._dim))
+            return self._map
+
+    def _disk_get(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        if self._dim is None:
+            self._load_dim()
+            if self._dim is None:
+                return {}
+        conn = self._connection()
+        # One read transaction, so the rows belong to the generation read with them.
+        conn.execute("BEGIN")
+        try:
+            generation = self._read_generation(conn)
+            rows = self._rows(keys)
+        finally:
+            conn.execute("COMMIT")
+        if not rows:
+            return {}
+        self._use_generation(generation)
+        matrix = self._matrix(max(rows.values()) + 1)
+        if matrix is None:
+            return {}
+        return {
+            key: np.asarray(matrix[row], dtype=np.float32) for key, row in rows.items()
+        }
+
+    def _disk_set(self, vectors: Dict[str, np.ndarray]) -> None:
+        dim = len(next(iter(vectors.values())))
+        conn = self._connection()
+        # BEGIN IMMEDIATE takes the write lock, so row numbers are allocated
+        # by one process at a time.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            stored = conn.execute(
+                "SELECT value FROM meta WHERE name = ?", (f"dim.{self._dtype.name}",)
+            ).fetchone()
+            if stored is None:
+                conn.execute(
+                    "INSERT INTO meta (name, value) VALUES (?, ?)",
+                    (f"dim.{self._dtype.name}", str(dim)),
+                )
+            elif int(stored[0]) != dim:
+                raise ValueError(
+                    f"Embedding dimension {dim} does not match the cached {stored[0]}"
+                )
+            generation = self._read_generation(conn)
+            existing = self._rows(list(vectors))
+            new_keys = [key for key in vectors if key not in existing]
+            next_row = conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+            compacted: Optional[int] = None
+            if new_keys:
+                data = np.stack([vectors[key] for key in new_keys]).astype(self._dtype)
+                path = self._matrix_path(generation)
+                fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    # Rows from a writer that died before committing are overwritten.
+                    os.pwrite(fd, data.tobytes(), next_row * dim * self._dtype.itemsize)
+                finally:
+                    os.close(fd)
+                conn.executemany(
+                    "INSERT INTO vectors (key, row) VALUES (?, ?)",
+                    [(key, next_row + offset) for offset, key in enumerate(new_keys)],
+                )
+                if next_row + len(new_keys) > self._max_rows:
+                    compacted = self._compact(
+                        conn, generation, dim, next_row + len(new_keys)
+                    )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            if compacted is not None:
+                self._remove_matrix(compacted)
+            raise
+        self._dim = dim
+        if compacted is not None:
+            self._remove_matrix(generation)
+            self._use_generation(compacted)
+
+    def _compact(
+        self, conn: sqlite3.Connection, generation: int, dim: int, total: int
+    ) -> int:
+        """
+        Copies the newest rows into the next generation's matrix and renumbers them.
+
+        Runs inside _disk_set's write transaction; returns the new generation.
+        """
+        keep = max(1, int(self._max_rows * _COMPACT_KEEP))
+        start = total - keep
+        old = np.memmap(
+            self._matrix_path(generation), dtype=self._dtype, mode="r", shape=(total, dim)
+        )
+        new_generation = generation + 1
+        path = self._matrix_path(new_generation)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as matrix_file:
+            matrix_file.write(np.ascontiguousarray(old[start:total]).tobytes())
+        del old
+        os.replace(temp_path, path)
+        conn.execute("DELETE FROM vectors WHERE row < ?", (start,))
+        conn.execute("UPDATE vectors SET row = row - ?", (start,))
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+            (f"generation.{self._dtype.name}", str(new_generation)),
+        )
+        logging.info(
+            f"Compacted embedding cache {self._model_name}: kept {keep} of {total} vectors"
+        )
+        return new_generation
+
+    def _remove_matrix(self, generation: int) -> None:
+        # Processes still mapping the file keep reading it until they remap.
+        try:
+            os.remove(self._matrix_path(generation))
+        except FileNotFoundError:
+            pass
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Returns the cached vector of every text, or None where it is not cached."""
+        keys = [self.key(text) for text in texts]
+        with self._lock:
+            found = {key: self._memory_get(key) for key in keys}
+        memory_hits = sum(1 for vector in found.values() if vector is not None)
+        missing = [key for key, vector in found.items() if vector is None]
+
+        disk: Dict[str, np.ndarray] = {}
+        if missing and self._dir is not None:
+            try:
+                disk = self._disk_get(missing)
+            except (OSError, sqlite3.Error) as e:
+                logging.warning(f"Embedding cache read failed: {e}")
+
+        with self._lock:
+            for key, vector in disk.items():
+                self._memory_set(key, vector)
+                found[key] = vector
+            self._stats["memory_hits"] += memory_hits
+            self._stats["disk_hits"] += len(disk)
+            self._stats["misses"] += len(missing) - len(disk)
+        return [found[key] for key in keys]
+
+    def _stored(self, vectors: np.ndarray) -> np.ndarray:
+        # Round through the storage type so both tiers return the same values.
+        return np.asarray(vectors).astype(self._dtype).astype(np.float32)
+
+    def set_many(self, texts: List[str], vectors: np.ndarray) -> None:
+        """Stores one vector per text in both tiers."""
+        entries = {
+            self.key(text): vector for text, vector in zip(texts, self._stored(vectors))
+        }
+        if not entries:
+            return
+        with self._lock:
+            for key, vector in entries.items():
+                self._memory_set(key, vector)
+        if self._dir is not None:
+            try:
+                self._disk_set(entries)
+            except (OSError, sqlite3.Error) as e:
+                logging.warning(f"Embedding cache write failed: {e}")
+
+    def encode(
+        self, texts: List[str], encode: Callable[[List[str]], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Returns the embeddings of texts, one row each, as float32.
+
+        Only texts missing from the cache are passed to encode, as given and
+        in a single call; their vectors are then cached. Texts with the same
+        normalized form are encoded once, from the first of them.
+        """
+        cached = self.get_many(texts)
+        pending: Dict[str, str] = {}
+        for text, vector in zip(texts, cached):
+            if vector is None:
+                pending.setdefault(self.key(text), text)
+        if pending:
+            encoded = self._stored(encode(list(pending.values())))
+            self.set_many(list(pending.values()), encoded)
+            fresh = dict(zip(pending, encoded))
+            cached = [
+                fresh[self.key(text)] if vector is None else vector
+                for text, vector in zip(texts, cached)
+            ]
+        if not cached:
+            return np.zeros((0, self._dim or 0), dtype=np.float32)
+        return np.stack(cached)
+
+    def size(self) -> int:
+        """Returns the number of vectors in the disk tier, or the memory tier without one."""
+        if self._dir is None:
+            with self._lock:
+                return len(self._memory)
+        return int(self._connection().execute("SELECT COUNT(*) FROM vectors").fetchone()[0])
+
+    def stats(self) -> EmbeddingCacheStats:
+        """Returns hit/miss counters for this process."""
+        with self._lock:
+            stats = EmbeddingCacheStats(**self._stats)
+        stats["vectors"] = self.size()
+        return stats
@@ -0,0 +1,255 @@
+# src/shared/services/engine_stats.py
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from collections import deque
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import TypedDict
+
+import numpy as np
+
+from src.shared.config.constants import SEARCH_EXPLORATION_RATE
+from src.shared.config.constants import SEARCH_HEDGE_MIN_SAMPLES
+from src.shared.config.constants import SEARCH_HEDGE_PERCENTILE
+from src.shared.config.constants import SEARCH_MAX_ENGINES
+from src.shared.config.constants import SEARCH_STATS_MIN_SAMPLES
+from src.shared.config.constants import SEARCH_STATS_SAVE_INTERVAL
+
+# Number of recent samples kept per engine for each statistic.
+_LATENCY_WINDOW = 256
+_OUTCOME_WINDOW = 256
+_VALIDATION_WINDOW = 512
+
+
+class EngineSnapshot(TypedDict):
+    requests: int
+    error_rate: float
+    latency_p50: Optional[float]
+    latency_p95: Optional[float]
+    validated: int
+    pass_rate: Optional[float]
+
+
+class EngineStats:
+    """
+    Rolling per-engine statistics for the search layer.
+
+    Tracks latency samples, request outcomes and how many of an engine's
+    results pass validation. Statistics can be saved to a JSON file and are
+    reloaded on construction, so they survive restarts.
+    """
+
+    def __init__(
+        self, path: Optional[str] = None, window: int = _LATENCY_WINDOW
+    ) -> None:
+        """
+        :param path: JSON file to persist statistics to; None keeps them in memory.
+        :param window: Number of recent latency samples kept per engine.
+        """
+        self._path = path
+        self._window = window
+        self._latencies: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=self._window)
+        )
+        self._outcomes: Dict[str, Deque[bool]] = defaultdict(
+            lambda: deque(maxlen=_OUTCOME_WINDOW)
+        )
+        self._validations: Dict[str, Deque[bool]] = defaultdict(
+            lambda: deque(maxlen=_VALIDATION_WINDOW)
+        )
+        self._errors: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._last_save = 0.0
+        if path is not None and os.path.exists(path):
+            self._load(path)
+
+    def record_latency(self, engine: str, seconds: float) -> None:
+        """Records the wall time of one successful engine request."""
+        with self._lock:
+            self._latencies[engine].append(seconds)
+            self._outcomes[engine].append(True)
+
+    def record_timeout(self, engine: str, deadline: float) -> None:
+        """Records a request that missed its deadline as an error taking the full deadline."""
+        with self._lock:
+            self._latencies[engine].append(deadline)
+            self._errors[engine] += 1
+            self._outcomes[engine].append(False)
+
+    def record_error(self, engine: str) -> None:
+        """Records a failed or timed-out engine request."""
+        with self._lock:
+            self._errors[engine] += 1
+            self._outcomes[engine].append(False)
+
+    def record_validation(self, engine: str, is_valid: bool) -> None:
+        """Records whether one of the engine's results passed validation."""
+        with self._lock:
+            self._validations[engine].append(is_valid)
+
+    def latency_percentile(self, engine: str, percentile: float) -> Optional[float]:
+        """Returns the given latency percentile in seconds, or None without samples."""
+        with self._lock:
+            samples = list(self._latencies.get(engine, ()))
+        if not samples:
+            return None
+        return float(np.percentile(samples, percentile))
+
+    def hedge_delay(
+        self,
+        engine: str,
+        percentile: float = SEARCH_HEDGE_PERCENTILE,
+        min_samples: int = SEARCH_HEDGE_MIN_SAMPLES,
+    ) -> Optional[float]:
+        """
+        Returns how long to wait before sending a hedged duplicate request.
+
+        Hedging stays off until enough samples exist to trust the percentile.
+        """
+        with self._lock:
+            sample_count = len(self._latencies.get(engine, ()))
+        if sample_count < min_samples:
+            return None
+        return self.latency_percentile(engine, percentile)
+
+    def snapshot(self, engine: str) -> EngineSnapshot:
+        """Returns the current statistics for one engine."""
+        with self._lock:
+            outcomes = list(self._outcomes.get(engine, ()))
+            validations = list(self._validations.get(engine, ()))
+        return {
+            "requests": len(outcomes),
+            "error_rate": outcomes.count(False) / len(outcomes) if outcomes else 0.0,
+            "latency_p50": self.latency_percentile(engine, 50),
+            "latency_p95": self.latency_percentile(engine, 95),
+            "validated": len(validations),
+            "pass_rate": sum(validations) / len(validations) if validations else None,
+        }
+
+    def engines(self) -> List[str]:
+        """Returns every engine with recorded statistics."""
+        with self._lock:
+            names = set(self._outcomes) | set(self._validations)
+        return sorted(names)
+
+    def report(self) -> Dict[str, EngineSnapshot]:
+        """Returns snapshots for every engine with recorded statistics."""
+        return {engine: self.snapshot(engine) for engine in self.engines()}
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path, "r", encoding="utf-8") as stats_file:
+                data = json.load(stats_file)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not load engine statistics from {path}: {e}")
+            return
+        for engine, entry in data.items():
+            self._latencies[engine].extend(entry.get("latencies", []))
+            self._outcomes[engine].extend(entry.get("outcomes", []))
+            self._validations[engine].extend(entry.get("validations", []))
+            self._errors[engine] = entry.get("errors", 0)
+
+    def save(self) -> None:
+        """Writes statistics to the configured file (last writer wins across processes)."""
+        if self._path is None:
+            return
+        with self._lock:
+            data = {
+                engine: {
+                    "latencies": list(self._latencies.get(engine, ())),
+                    "outcomes": list(self._outcomes.get(engine, ())),
+                    "validations": list(self._validations.get(engine, ())),
+                    "errors": self._errors.get(engine, 0),
+                }
+                for engine in set(self._outcomes) | set(self._validations)
+            }
+        directory = os.path.dirname(os.path.abspath(self._path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self._path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as stats_file:
+                json.dump(data, stats_file)
+            os.replace(temp_path, self._path)
+        except OSError as e:
+            logging.warning(f"Could not save engine statistics to {self._path}: {e}")
+
+    def maybe_save(self, interval: float = SEARCH_STATS_SAVE_INTERVAL) -> None:
+        """Saves at most once per interval seconds."""
+        now = time.monotonic()
+        with self._lock:
+            if self._path is None or now - self._last_save < interval:
+                return
+            self._last_save = now
+        self.save()
+
+
+class EngineSelector:
+    """
+    Picks the engines to query from a configured pool.
+
+    Engines are ranked by validation pass rate and reliability per second of
+    median latency. Engines without enough requests rank first so they get
+    measured, and with probability ``exploration`` one selected engine is
+    swapped for a random unselected one to keep every engine's stats fresh.
+    """
+
+    def __init__(
+        self,
+        pool: List[str],
+        stats: EngineStats,
+        max_engines: int = SEARCH_MAX_ENGINES,
+        exploration: float = SEARCH_EXPLORATION_RATE,
+        min_samples: int = SEARCH_STATS_MIN_SAMPLES,
+    ) -> None:
+        self._pool = list(pool)
+        self._stats = stats
+        self._max_engines = max_engines
+        self._exploration = exploration
+        self._min_samples = min_samples
+        self._random = random.Random()
+
+    @property
+    def pool(self) -> List[str]:
+        return list(self._pool)
+
+    def score(self, engine: str) -> float:
+        """
+        Returns the engine's utility; engines with too few requests score infinity.
+
+        Timed-out and cancelled requests count at the full deadline, so an
+        engine that rarely answers in time (and so rarely gets results
+        validated) still loses rank. Its pass rate is smoothed towards 0.5
+        until enough validations come in.
+        """
+        snapshot = self._stats.snapshot(engine)
+        if snapshot["requests"] < self._min_samples:
+            return float("inf")
+        passed = (snapshot["pass_rate"] or 0.0) * snapshot["validated"]
+        pass_rate = (passed + 1.0) / (snapshot["validated"] + 2.0)
+        latency = snapshot["latency_p50"] or 0.0
+        return pass_rate * (1.0 - snapshot["error_rate"]) / (1.0 + latency)
+
+    def select(self) -> List[str]:
+        """Returns the engines to query for the next search."""
+        if len(self._pool) <= self._max_engines:
+            return list(self._pool)
+        ranked = sorted(self._pool, key=self.score, reverse=True)
+        chosen = ranked[: self._max_engines]
+        if self._random.random() < self._exploration:
+            chosen[-1] = self._random.choice(ranked[self._max_engines :])
+        return chosen
+
+    def report(self) -> Dict[str, Dict[str, object]]:
+        """Returns each pooled engine's statistics and current selection score."""
+        return {
+            engine: {**self._stats.snapshot(engine), "score": self.score(engine)}
+            for engine in self._pool
+        }
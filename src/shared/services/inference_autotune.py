@@ -0,0 +1,238 @@
+# src/shared/services/inference_autotune.py
+
+import argparse
+import logging
+import os
+import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import TypedDict
+
+import orjson
+import torch
+
+from src.shared.config.constants import AUTOTUNE_BATCH_SIZES
+from src.shared.config.constants import AUTOTUNE_SNIPPETS
+from src.shared.config.constants import ENCODER_BACKEND
+from src.shared.config.constants import INFERENCE_TUNING_PATH
+from src.shared.config.constants import INFERENCE_ENCODING_THREADS
+from src.shared.config.constants import KEYWORD_MODEL_NAME
+from src.shared.config.constants import MICRO_BATCH_BUCKET_SIZE
+from src.shared.config.constants import SEMANTIC_MODEL_NAME
+from src.shared.services.text_encoder import encoder_id
+from src.shared.services.synthetic_text import synthetic_snippets
+from src.shared.services.text_encoder import get_encoder
+
+
+class TuningResult(TypedDict):
+    torch_threads: int
+    batch_size: int
+    texts_per_sec: float
+
+
+# Tuning results by host profile, then by encoder id
+Tunings = Dict[str, Dict[str, TuningResult]]
+
+_tuning_lock = threading.Lock()
+
+
+def host_profile(
+    workers: int = INFERENCE_ENCODING_THREADS, backend: str = ENCODER_BACKEND
+) -> str:
+    """
+    Names the hardware and deployment shape tuning results apply to.
+
+    Nodes with the same architecture, core count, encoding threads (inference
+    workers, or the micro-batcher's one thread) and encoder backend share
+    settings; the hostname is deliberately left out.
+    """
+    return f"{platform.machine()}-{os.cpu_count() or 1}cpu-{workers}workers-{backend}"
+
+
+def thread_candidates(workers: int = INFERENCE_ENCODING_THREADS) -> List[int]:
+    """Powers of two up to the cores each worker gets, plus that share itself."""
+    share = max(1, (os.cpu_count() or 1) // workers)
+    candidates = {share}
+    threads = 1
+    while threads < share:
+        candidates.add(threads)
+        threads *= 2
+    return sorted(candidates)
+
+
+def benchmark(
+    model: Any, torch_threads: int, batch_size: int, texts: List[str], workers: int
+) -> float:
+    """
+    Measures texts per second with workers threads encoding their share of texts.
+
+    Concurrent workers compete for the cores like inference executor workers do;
+    with micro-batching a single thread runs every forward pass.
+    """
+    torch.set_num_threads(torch_threads)
+    shares = [texts[worker::workers] for worker in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        model.encode(texts[:batch_size], batch_size=batch_size)  # warm up
+        started = time.perf_counter()
+        list(pool.map(lambda share: model.encode(share, batch_size=batch_size), shares))
+        return len(texts) / (time.perf_counter() - started)
+
+
+def autotune(
+    model_name: str = SEMANTIC_MODEL_NAME,
+    workers: int = INFERENCE_ENCODING_THREADS,
+    thread_options: Optional[Sequence[int]] = None,
+    batch_sizes: Sequence[int] = AUTOTUNE_BATCH_SIZES,
+    texts: Optional[List[str]] = None,
+) -> TuningResult:
+    """
+    Benchmarks every thread count and batch size pair and returns the fastest.
+
+    The process-wide torch thread count is restored afterwards.
+    """
+    model = get_encoder(model_name)
+    texts = texts or synthetic_snippets(AUTOTUNE_SNIPPETS)
+    previous_threads = torch.get_num_threads()
+    best: Optional[TuningResult] = None
+    try:
+        for torch_threads in thread_options or thread_candidates(workers):
+            for batch_size in batch_sizes:
+                texts_per_sec = benchmark(model, torch_threads, batch_size, texts, workers)
+                logging.info(
+                    f"Autotune {model_name}: {torch_threads} threads, batch "
+                    f"{batch_size}: {texts_per_sec:.0f} texts/s"
+                )
+                if best is None or texts_per_sec > best["texts_per_sec"]:
+                    best = {
+                        "torch_threads": torch_threads,
+                        "batch_size": batch_size,
+                        "texts_per_sec": texts_per_sec,
+                    }
+    finally:
+        torch.set_num_threads(previous_threads)
+    if best is None:
+        raise ValueError("Autotune needs at least one thread count and batch size")
+    return best
+
+
+def load_tunings(path: str = INFERENCE_TUNING_PATH) -> Tunings:
+    """Reads every saved tuning result; a missing or unreadable file has none."""
+    try:
+        with open(path, "rb") as tuning_file:
+            tunings: Tunings = orjson.loads(tuning_file.read())
+            return tunings
+    except FileNotFoundError:
+        return {}
+    except orjson.JSONDecodeError as e:
+        logging.warning(f"Ignoring unreadable inference tuning file {path}: {e}")
+        return {}
+
+
+def save_tuning(
+    model_name: str,
+    result: TuningResult,
+    path: str = INFERENCE_TUNING_PATH,
+    profile: Optional[str] = None,
+) -> None:
+    """Records result for model_name under the host profile, keeping other entries."""
+    with _tuning_lock:
+        tunings = load_tunings(path)
+        tunings.setdefault(profile or host_profile(), {})[encoder_id(model_name)] = result
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as tuning_file:
+            tuning_file.write(orjson.dumps(tunings, option=orjson.OPT_INDENT_2))
+        os.replace(temporary_path, path)
+
+
+def tuned_settings(
+    model_name: str, path: str = INFERENCE_TUNING_PATH, profile: Optional[str] = None
+) -> Optional[TuningResult]:
+    """Returns the saved tuning result for model_name on this host profile, if any."""
+    return load_tunings(path).get(profile or host_profile(), {}).get(encoder_id(model_name))
+
+
+def encoder_batch_size(model_name: str) -> int:
+    """
+    The tuned batch size for model_name, or MICRO_BATCH_BUCKET_SIZE untuned.
+
+    Used for direct encode calls and as the micro-batcher's bucket size.
+    """
+    settings = tuned_settings(model_name)
+    return settings["batch_size"] if settings else MICRO_BATCH_BUCKET_SIZE
+
+
+def tuned_torch_threads(workers: int = INFERENCE_ENCODING_THREADS) -> Optional[int]:
+    """The tuned intra-op thread count for the semantic model with workers workers."""
+    settings = tuned_settings(SEMANTIC_MODEL_NAME, profile=host_profile(workers))
+    return settings["torch_threads"] if settings else None
+
+
+def ensure_tuned(
+    model_names: Iterable[str] = (SEMANTIC_MODEL_NAME, KEYWORD_MODEL_NAME),
+    path: str = INFERENCE_TUNING_PATH,
+) -> Dict[str, TuningResult]:
+    """Autotunes the models with no saved result for this host profile and saves them."""
+    results: Dict[str, TuningResult] = {}
+    for model_name in model_names:
+        settings = tuned_settings(model_name, path)
+        if settings is None:
+            logging.info(f"No inference tuning for {model_name} on {host_profile()}")
+            settings = autotune(model_name)
+            save_tuning(model_name, settings, path)
+        results[model_name] = settings
+    return results
+
+
+def run_autotune(
+    model_names: Optional[List[str]] = None,
+    workers: int = INFERENCE_ENCODING_THREADS,
+    thread_options: Optional[List[int]] = None,
+    batch_sizes: Optional[List[int]] = None,
+    dry_run: bool = False,
+) -> None:
+    """Tunes each model, prints the winners and saves them for this host profile."""
+    profile = host_profile(workers)
+    for model_name in model_names or [SEMANTIC_MODEL_NAME, KEYWORD_MODEL_NAME]:
+        result = autotune(
+            model_name, workers, thread_options, batch_sizes or AUTOTUNE_BATCH_SIZES
+        )
+        print(
+            f"{model_name} on {profile}: {result['torch_threads']} threads, "
+            f"batch size {result['batch_size']} ({result['texts_per_sec']:.0f} texts/s)"
+        )
+        if not dry_run:
+            save_tuning(model_name, result, profile=profile)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark torch thread counts and encoder batch sizes on this host"
+    )
+    parser.add_argument("--model", action="append", dest="models")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=INFERENCE_ENCODING_THREADS,
+        help="Threads running forward passes at once (1 with micro-batching)",
+    )
+    parser.add_argument("--threads", type=int, action="append", dest="thread_options")
+    parser.add_argument(
+        "--batch-size", type=int, action="append", dest="batch_sizes"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Report without saving")
+    args = parser.parse_args()
+    run_autotune(
+        args.models, args.workers, args.thread_options, args.batch_sizes, args.dry_run
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# src/shared/services/inference_executor.py
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import TypedDict
+from typing import TypeVar
+
+import torch
+
+from src.shared.config.constants import INFERENCE_ENCODING_THREADS
+from src.shared.config.constants import INFERENCE_QUEUE_DEPTH
+from src.shared.config.constants import INFERENCE_TORCH_THREADS
+from src.shared.config.constants import INFERENCE_WORKERS
+from src.shared.services.inference_autotune import tuned_torch_threads
+
+T = TypeVar("T")
+
+
+class InferenceStats(TypedDict):
+    workers: int
+    torch_threads: int
+    pending: int
+    submitted: int
+    completed: int
+    throttled: int
+
+
+class InferenceExecutor:
+    """
+    Runs CPU-bound encoder work on a small dedicated thread pool.
+
+    Torch releases the GIL while it computes, so a few workers keep the cores
+    busy while request threads wait on the network. At most workers +
+    queue_depth tasks are pending at once; further submissions block (or time
+    out) until a slot frees, so a burst of requests queues up instead of
+    oversubscribing the cores.
+    """
+
+    def __init__(
+        self,
+        workers: int = INFERENCE_WORKERS,
+        queue_depth: int = INFERENCE_QUEUE_DEPTH,
+        torch_threads: int = INFERENCE_TORCH_THREADS,
+        name: str = "inference",
+        encoding_threads: int = INFERENCE_ENCODING_THREADS,
+    ) -> None:
+        """
+        :param workers: Inference tasks run in parallel.
+        :param queue_depth: Tasks allowed to wait for a worker before
+                            submitters block.
+        :param torch_threads: Intra-op threads per torch operation; 0 uses the
+                              autotuned count for this host profile, or splits
+                              the cores evenly between the workers (all of them
+                              go to the micro-batcher's thread when it runs the
+                              forward passes). Torch applies this process-wide.
+        :param encoding_threads: Threads running forward passes at once, which
+                                 share the cores: the workers, or the
+                                 micro-batcher's one thread.
+        """
+        if workers < 1 or queue_depth < 0:
+            raise ValueError("An inference executor needs a worker and a non-negative queue")
+        self.workers = workers
+        self.max_pending = workers + queue_depth
+        self.torch_threads = (
+            torch_threads
+            or tuned_torch_threads(encoding_threads)
+            or max(1, (os.cpu_count() or 1) // encoding_threads)
+        )
+        torch.set_num_threads(self.torch_threads)
+
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._submitted = 0
+        self._completed = 0
+        self._throttled = 0
+
+    def _acquire(self, timeout: Optional[float]) -> None:
+        if self._slots.acquire(blocking=False):
+            return
+        with self._lock:
+            self._throttled += 1
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(
+                f"Inference queue stayed full ({self.max_pending} pending) for {timeout}s"
+            )
+
+    def _release(self, _: "Future[Any]") -> None:
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+        self._slots.release()
+
+    def _submit(self, fn: Callable[..., T], *args: Any) -> "Future[T]":
+        with self._lock:
+            self._pending += 1
+            self._submitted += 1
+        try:
+            # Like asyncio.to_thread, carry context variables (such as the
+            # cache refresh flag) over to the worker.
+            future = self._pool.submit(contextvars.copy_context().run, fn, *args)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def submit(
+        self, fn: Callable[..., T], *args: Any, timeout: Optional[float] = None
+    ) -> "Future[T]":
+        """
+        Schedules fn(*args), blocking while the queue is full.
+
+        :param timeout: Seconds to wait for a free slot; None waits as long
+                        as it takes. Raises TimeoutError when it runs out.
+        """
+        self._acquire(timeout)
+        return self._submit(fn, *args)
+
+    def run(self, fn: Callable[..., T], *args: Any, timeout: Optional[float] = None) -> T:
+        """Runs fn(*args) on the executor and waits for its result."""
+        return self.submit(fn, *args, timeout=timeout).result()
+
+    async def arun(
+        self, fn: Callable[..., T], *args: Any, timeout: Optional[float] = None
+    ) -> T:
+        """Awaits fn(*args) on the executor; waiting for a slot never blocks the event loop."""
+        if not self._slots.acquire(blocking=False):
+            acquire = asyncio.ensure_future(asyncio.to_thread(self._acquire, timeout))
+            try:
+                await asyncio.shield(acquire)
+            except asyncio.CancelledError:
+                # The waiting thread cannot be interrupted; hand back its slot.
+                acquire.add_done_callback(
+                    lambda task: task.cancelled()
+                    or task.exception() is not None
+                    or self._slots.release()
+                )
+                raise
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def stats(self) -> InferenceStats:
+        """Returns the pool size and counters; throttled counts submissions that had to wait."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "torch_threads": self.torch_threads,
+                "pending": self._pending,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "throttled": self._throttled,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stops accepting work; waits for pending tasks unless wait is False."""
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+
+
+_executor: Optional[InferenceExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """Returns the process-wide inference executor, starting it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = InferenceExecutor()
+            logging.info(
+                f"Inference executor started with {_executor.workers} workers "
+                f"and {_executor.torch_threads} torch threads each"
+            )
+        return _executor
@@ -0,0 +1,191 @@
+# src/shared/services/micro_batcher.py
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TypedDict
+
+import numpy as np
+from keybert.backend import BaseEmbedder
+
+from src.shared.config.constants import MICRO_BATCH_BUCKET_SIZE
+from src.shared.config.constants import MICRO_BATCH_MAX_TEXTS
+from src.shared.config.constants import MICRO_BATCH_WINDOW
+
+EncodeFn = Callable[[List[str]], Any]
+
+
+class MicroBatchStats(TypedDict):
+    requests: int
+    texts: int
+    batches: int
+    forward_passes: int
+
+
+class MicroBatcher:
+    """
+    Merges concurrent encode calls into shared forward passes.
+
+    Callers block in encode while a worker thread collects requests for up to
+    window seconds (or until max_texts texts are queued). It then encodes the
+    distinct texts, shortest first in buckets of bucket_size so each forward
+    pass pads to similar lengths, and hands every caller its own rows.
+    Requests that arrive during a forward pass join the next batch, so under
+    load batches grow without any extra waiting.
+    """
+
+    def __init__(
+        self,
+        encode: EncodeFn,
+        window: float = MICRO_BATCH_WINDOW,
+        max_texts: int = MICRO_BATCH_MAX_TEXTS,
+        bucket_size: int = MICRO_BATCH_BUCKET_SIZE,
+        name: str = "micro-batcher",
+    ) -> None:
+        """
+        :param encode: Encodes a list of texts into one row per text.
+        :param window: Seconds the first request in a batch waits for others.
+        :param max_texts: Queued texts that close the window early.
+        :param bucket_size: Texts per forward pass.
+        """
+        self._encode = encode
+        self.window = window
+        self.max_texts = max_texts
+        self.bucket_size = bucket_size
+        self._name = name
+        self._queue: List[Tuple[List[str], "Future[np.ndarray]"]] = []
+        self._queued_texts = 0
+        self._ready = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._stats: MicroBatchStats = {
+            "requests": 0,
+            "texts": 0,
+            "batches": 0,
+            "forward_passes": 0,
+        }
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encodes texts as part of the next micro-batch and returns their rows."""
+        texts = list(texts)
+        if not texts:
+            return np.asarray(self._encode([]))
+        request: "Future[np.ndarray]" = Future()
+        with self._ready:
+            # A forked child inherits the queue but not the worker thread.
+            if self._thread is None or self._pid != os.getpid():
+                self._start()
+            self._queue.append((texts, request))
+            self._queued_texts += len(texts)
+            self._ready.notify()
+        return request.result()
+
+    def stats(self) -> MicroBatchStats:
+        """Returns request, text, batch and forward pass counts so far."""
+        with self._ready:
+            return dict(self._stats)  # type: ignore[return-value]
+
+    def _start(self) -> None:
+        self._queue = []
+        self._queued_texts = 0
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._pid = os.getpid()
+        self._thread.start()
+
+    def _collect(self) -> List[Tuple[List[str], "Future[np.ndarray]"]]:
+        with self._ready:
+            while not self._queue:
+                self._ready.wait()
+            deadline = time.monotonic() + self.window
+            while self._queued_texts < self.max_texts:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._ready.wait(remaining)
+            batch, self._queue = self._queue, []
+            self._queued_texts = 0
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            try:
+                rows = self._encode_batch([texts for texts, _ in batch])
+            except BaseException as e:
+                logging.error(f"Micro-batch of {len(batch)} requests failed: {e}")
+                for _, request in batch:
+                    request.set_exception(e)
+                continue
+            for (texts, request), request_rows in zip(batch, rows):
+                request.set_result(request_rows)
+
+    def _encode_batch(self, requests: List[List[str]]) -> List[np.ndarray]:
+        # Texts repeated across requests, e.g. the same query, are encoded once.
+        distinct = sorted({text for texts in requests for text in texts}, key=len)
+        buckets = [
+            np.asarray(self._encode(distinct[start : start + self.bucket_size]))
+            for start in range(0, len(distinct), self.bucket_size)
+        ]
+        embeddings = np.concatenate(buckets)
+        index: Dict[str, int] = {text: row for row, text in enumerate(distinct)}
+        with self._ready:
+            self._stats["requests"] += len(requests)
+            self._stats["texts"] += sum(len(texts) for texts in requests)
+            self._stats["batches"] += 1
+            self._stats["forward_passes"] += len(buckets)
+        return [embeddings[[index[text] for text in texts]] for texts in requests]
+
+
+class MicroBatchedBackend(BaseEmbedder):
+    """KeyBERT backend that embeds documents and candidate words through a MicroBatcher."""
+
+    def __init__(self, model: Any, batcher: MicroBatcher) -> None:
+        super().__init__(embedding_model=model)
+        self.batcher = batcher
+
+    def embed(self, documents: List[str], verbose: bool = False) -> np.ndarray:
+        return self.batcher.encode(list(documents))
+
+
+class EncoderBackend(BaseEmbedder):
+    """KeyBERT backend that encodes directly with the model, batch_size texts per pass."""
+
+    def __init__(self, model: Any, batch_size: int) -> None:
+        super().__init__(embedding_model=model)
+        self.batch_size = batch_size
+
+    def embed(self, documents: List[str], verbose: bool = False) -> np.ndarray:
+        embeddings: np.ndarray = self.embedding_model.encode(
+            list(documents), batch_size=self.batch_size
+        )
+        return embeddings
+
+
+_batchers: Dict[int, Tuple[Any, MicroBatcher]] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(model: Any, bucket_size: int = MICRO_BATCH_BUCKET_SIZE) -> MicroBatcher:
+    """
+    Returns the process-wide batcher for a model, so every caller shares its batches.
+
+    :param bucket_size: Texts per forward pass, used when the batcher is created.
+    """
+    with _batchers_lock:
+        # The model is kept alive alongside its batcher, so its id stays unique.
+        entry = _batchers.get(id(model))
+        if entry is None:
+            batcher = MicroBatcher(
+                lambda texts: model.encode(texts), bucket_size=bucket_size
+            )
+            entry = (model, batcher)
+            _batchers[id(model)] = entry
+        return entry[1]
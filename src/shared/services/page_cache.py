@@ -0,0 +1,305 @@
+# src/shared/services/page_cache.py
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import defaultdict
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import TYPE_CHECKING
+from typing import TypedDict
+from urllib.parse import urlsplit
+
+import orjson
+
+from src.shared.config.constants import PAGE_CACHE_MAX_BYTES
+from src.shared.config.constants import PAGE_CACHE_PATH
+from src.shared.config.constants import PAGE_CACHE_TTL
+
+if TYPE_CHECKING:
+    from src.shared.services.page_fetch_service import FetchedPage
+
+# Trim the blob store every N writes instead of on every write.
+_TRIM_INTERVAL = 32
+
+# FetchedPage fields stored in a blob; the URL is kept in the index only, so
+# identical pages served under several URLs share one blob.
+_PAYLOAD_FIELDS = ("status", "content_type", "title", "text", "bytes_read", "truncated")
+
+
+def _host(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+class CachedPage(TypedDict):
+    page: "FetchedPage"
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fresh: bool
+
+
+class HostStats(TypedDict):
+    hits: int
+    revalidated: int
+    misses: int
+    hit_rate: float
+
+
+class PageCache:
+    """
+    Disk cache for fetched pages and their extracted text.
+
+    Page payloads are zlib-compressed blobs named by the SHA-256 of their
+    content; a SQLite index maps URLs to blobs along with the validators
+    (ETag / Last-Modified) needed to revalidate them with a conditional GET.
+    The blob store is capped in bytes and evicts least recently used pages.
+    """
+
+    def __init__(
+        self,
+        path: str = PAGE_CACHE_PATH,
+        max_bytes: int = PAGE_CACHE_MAX_BYTES,
+        ttl: float = PAGE_CACHE_TTL,
+    ) -> None:
+        """
+        :param path: Directory holding the index database and blob files.
+        :param max_bytes: Compressed bytes kept before old pages are evicted.
+        :param ttl: Seconds a page is served without revalidating it.
+        """
+        self._path = path
+        self._blob_dir = os.path.join(path, "blobs")
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes_since_trim = 0
+        self._host_counts: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "revalidated": 0, "misses": 0}
+        )
+        os.makedirs(self._blob_dir, exist_ok=True)
+        self._init_index()
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared across threads (or forks).
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(
+                os.path.join(self._path, "index.sqlite3"),
+                timeout=5.0,
+                isolation_level=None,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_index(self) -> None:
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, host TEXT NOT NULL, digest TEXT NOT NULL, "
+            "etag TEXT, last_modified TEXT, "
+            "fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS pages_digest ON pages (digest)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            "digest TEXT PRIMARY KEY, size INTEGER NOT NULL)"
+        )
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self._blob_dir, digest[:2], f"{digest}.zz")
+
+    def _write_blob(self, digest: str, data: bytes) -> None:
+        path = self._blob_path(digest)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as blob_file:
+            blob_file.write(data)
+        os.replace(temp_path, path)
+
+    def _read_blob(self, digest: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._blob_path(digest), "rb") as blob_file:
+                return orjson.loads(zlib.decompress(blob_file.read()))
+        except (OSError, zlib.error, orjson.JSONDecodeError) as e:
+            logging.warning(f"Page cache blob {digest} is unreadable: {e}")
+            return None
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        """Returns the cached page for url with its validators, or None on a miss."""
+        now = time.time()
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT digest, etag, last_modified, fetched_at FROM pages WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            payload = self._read_blob(row[0])
+            if payload is None:
+                conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+                return None
+            conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, url))
+        except sqlite3.Error as e:
+            logging.warning(f"Page cache read failed: {e}")
+            return None
+        return {
+            "page": {"url": url, **payload, "error": ""},
+            "etag": row[1],
+            "last_modified": row[2],
+            "fresh": now - row[3] < self._ttl,
+        }
+
+    @staticmethod
+    def conditional_headers(cached: Optional[CachedPage]) -> Dict[str, str]:
+        """Builds If-None-Match / If-Modified-Since headers for revalidating cached."""
+        headers: Dict[str, str] = {}
+        if cached is None:
+            return headers
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    def store(
+        self,
+        url: str,
+        page: "FetchedPage",
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Stores a fetched page under its content digest and indexes it by URL."""
+        payload = orjson.dumps(
+            {field: page[field] for field in _PAYLOAD_FIELDS},
+            option=orjson.OPT_SORT_KEYS,
+        )
+        digest = hashlib.sha256(payload).hexdigest()
+        data = zlib.compress(payload, 6)
+        now = time.time()
+        try:
+            self._write_blob(digest, data)
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR IGNORE INTO blobs (digest, size) VALUES (?, ?)",
+                (digest, len(data)),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(url, host, digest, etag, last_modified, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, _host(url), digest, etag, last_modified, now, now),
+            )
+        except (OSError, sqlite3.Error) as e:
+            logging.warning(f"Page cache write failed: {e}")
+            return
+
+        with self._lock:
+            self._writes_since_trim += 1
+            should_trim = self._writes_since_trim >= _TRIM_INTERVAL
+            if should_trim:
+                self._writes_since_trim = 0
+        if should_trim:
+            self.trim()
+
+    def revalidated(self, url: str) -> None:
+        """Marks a cached page fresh again after the origin answered 304 Not Modified."""
+        now = time.time()
+        try:
+            self._connection().execute(
+                "UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url),
+            )
+        except sqlite3.Error as e:
+            logging.warning(f"Page cache update failed: {e}")
+
+    def size(self) -> int:
+        """Returns the compressed bytes held in the blob store."""
+        row = (
+            self._connection()
+            .execute("SELECT COALESCE(SUM(size), 0) FROM blobs")
+            .fetchone()
+        )
+        return int(row[0])
+
+    def _drop_orphans(self, conn: sqlite3.Connection) -> None:
+        orphans: List[str] = [
+            row[0]
+            for row in conn.execute(
+                "SELECT digest FROM blobs WHERE digest NOT IN (SELECT digest FROM pages)"
+            )
+        ]
+        for digest in orphans:
+            try:
+                os.remove(self._blob_path(digest))
+            except FileNotFoundError:
+                pass
+        conn.executemany(
+            "DELETE FROM blobs WHERE digest = ?", [(digest,) for digest in orphans]
+        )
+
+    def trim(self) -> None:
+        """Evicts least recently used pages until the blob store fits max_bytes."""
+        try:
+            conn = self._connection()
+            excess = self.size() - self._max_bytes
+            if excess > 0:
+                rows = conn.execute(
+                    "SELECT url, digest FROM pages ORDER BY accessed_at ASC"
+                ).fetchall()
+                for url, digest in rows:
+                    if excess <= 0:
+                        break
+                    conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+                    # A blob only frees space once no other URL points at it.
+                    shared = conn.execute(
+                        "SELECT 1 FROM pages WHERE digest = ? LIMIT 1", (digest,)
+                    ).fetchone()
+                    if shared is None:
+                        size = conn.execute(
+                            "SELECT size FROM blobs WHERE digest = ?", (digest,)
+                        ).fetchone()
+                        excess -= size[0] if size else 0
+            self._drop_orphans(conn)
+        except (OSError, sqlite3.Error) as e:
+            logging.warning(f"Page cache trim failed: {e}")
+
+    def clear(self) -> None:
+        """Removes every cached page."""
+        conn = self._connection()
+        conn.execute("DELETE FROM pages")
+        self._drop_orphans(conn)
+
+    def record(self, url: str, outcome: str) -> None:
+        """Counts a lookup outcome ("hits", "revalidated" or "misses") for url's host."""
+        with self._lock:
+            self._host_counts[_host(url)][outcome] += 1
+
+    def host_stats(self) -> Dict[str, HostStats]:
+        """Returns per-host hit rates for this process; revalidations count as hits."""
+        with self._lock:
+            counts = {host: dict(entry) for host, entry in self._host_counts.items()}
+        stats: Dict[str, HostStats] = {}
+        for host, entry in counts.items():
+            total = entry["hits"] + entry["revalidated"] + entry["misses"]
+            stats[host] = {
+                "hits": entry["hits"],
+                "revalidated": entry["revalidated"],
+                "misses": entry["misses"],
+                "hit_rate": (
+                    (entry["hits"] + entry["revalidated"]) / total if total else 0.0
+                ),
+            }
+        return stats
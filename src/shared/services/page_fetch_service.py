@@ -0,0 +1,340 @@
+# src/shared/services/page_fetch_service.py
+
+import asyncio
+import codecs
+import logging
+import re
+from collections import defaultdict
+from html.parser import HTMLParser
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TypedDict
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.shared.config.constants import PAGE_FETCH_MAX_BYTES
+from src.shared.config.constants import PAGE_FETCH_MAX_CHARS
+from src.shared.config.constants import PAGE_FETCH_MAX_CONCURRENCY
+from src.shared.config.constants import PAGE_FETCH_PER_HOST
+from src.shared.config.constants import PAGE_FETCH_TIMEOUT
+from src.shared.config.constants import PAGE_FETCH_USER_AGENT
+from src.shared.config.constants import SEARCH_KEEPALIVE_EXPIRY
+from src.shared.services.background_loop import BackgroundLoop
+from src.shared.services.page_cache import CachedPage
+from src.shared.services.page_cache import PageCache
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+TEXT_CONTENT_TYPES = ("text/plain",)
+
+# Elements whose content is never readable page text
+SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "iframe"}
+# Elements that start a new line of text
+BLOCK_TAGS = set(
+    "address article aside blockquote br dd div dl dt figcaption footer form "
+    "h1 h2 h3 h4 h5 h6 header hr li main nav ol p pre section table td th tr ul".split()
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class FetchedPage(TypedDict):
+    url: str
+    status: int
+    content_type: str
+    title: str
+    text: str
+    bytes_read: int
+    truncated: bool
+    error: str
+
+
+class HTMLTextExtractor(HTMLParser):
+    """
+    Incremental HTML-to-text converter.
+
+    Feed it decoded chunks as they arrive; only the extracted text (capped
+    at ``max_chars``) is kept, so memory does not grow with the page size.
+    """
+
+    def __init__(self, max_chars: int = PAGE_FETCH_MAX_CHARS) -> None:
+        super().__init__(convert_charrefs=True)
+        self._max_chars = max_chars
+        self._parts: List[str] = []
+        self._chars = 0
+        self._skip_depth = 0
+        self._in_title = False
+        self._title: List[str] = []
+
+    @property
+    def full(self) -> bool:
+        """True once max_chars of text have been collected."""
+        return self._chars >= self._max_chars
+
+    @property
+    def title(self) -> str:
+        return _WHITESPACE.sub(" ", "".join(self._title)).strip()
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag == "title":
+            self._in_title = True
+        elif tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title":
+            self._in_title = False
+        elif tag in SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self._title.append(data)
+            return
+        if self._skip_depth or self.full:
+            return
+        text = _WHITESPACE.sub(" ", data)
+        if not text.strip():
+            self._parts.append(" ")
+            return
+        text = text[: self._max_chars - self._chars]
+        self._parts.append(text)
+        self._chars += len(text)
+
+    def text(self) -> str:
+        """Returns the extracted text, one block per line."""
+        # Data can arrive split across chunks, so spaces are collapsed again here.
+        lines = (" ".join(line.split()) for line in "".join(self._parts).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+
+def _decoder(charset: Optional[str]) -> codecs.IncrementalDecoder:
+    try:
+        return codecs.getincrementaldecoder(charset or "utf-8")(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+def _failed(url: str, error: str, status: int = 0) -> FetchedPage:
+    return {
+        "url": url,
+        "status": status,
+        "content_type": "",
+        "title": "",
+        "text": "",
+        "bytes_read": 0,
+        "truncated": False,
+        "error": error,
+    }
+
+
+class PageFetchService:
+    """
+    Downloads result pages concurrently and extracts their readable text.
+
+    Pages stream through one pooled ``httpx.AsyncClient`` on a background
+    loop. Downloads are capped overall and per host, bodies stop at
+    ``max_bytes`` and every page has a total deadline, so one slow or huge
+    site cannot hold up the rest.
+    """
+
+    def __init__(
+        self,
+        timeout: float = PAGE_FETCH_TIMEOUT,
+        max_bytes: int = PAGE_FETCH_MAX_BYTES,
+        max_chars: int = PAGE_FETCH_MAX_CHARS,
+        max_concurrency: int = PAGE_FETCH_MAX_CONCURRENCY,
+        per_host: int = PAGE_FETCH_PER_HOST,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        loop: Optional[BackgroundLoop] = None,
+        cache: Optional[PageCache] = None,
+    ) -> None:
+        """
+        :param timeout: Seconds allowed per page, including the body download.
+        :param max_bytes: Body bytes read before the rest of a page is dropped.
+        :param max_chars: Extracted characters kept per page.
+        :param max_concurrency: Downloads in flight across all hosts.
+        :param per_host: Downloads in flight against any one host.
+        :param transport: Optional httpx transport, e.g. for tests.
+        :param loop: Background loop to run downloads on; one is created if omitted.
+        :param cache: Optional page cache; stale entries are revalidated with
+                      conditional GETs instead of being downloaded again.
+        """
+        self._timeout = timeout
+        self._max_bytes = max_bytes
+        self._max_chars = max_chars
+        self._max_concurrency = max_concurrency
+        self._per_host = per_host
+        self._transport = transport
+        self._loop = loop or BackgroundLoop(name="page-fetch")
+        self._cache = cache
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def loop(self) -> BackgroundLoop:
+        return self._loop
+
+    @property
+    def cache(self) -> Optional[PageCache]:
+        return self._cache
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Only ever called on the background loop, so no locking is needed.
+        if self._client is None or self._client.is_closed:
+            limits = httpx.Limits(
+                max_connections=self._max_concurrency,
+                max_keepalive_connections=self._max_concurrency,
+                keepalive_expiry=SEARCH_KEEPALIVE_EXPIRY,
+            )
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=limits,
+                transport=self._transport,
+                follow_redirects=True,
+                max_redirects=5,
+                headers={"User-Agent": PAGE_FETCH_USER_AGENT},
+            )
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._host_semaphores = defaultdict(
+                lambda: asyncio.Semaphore(self._per_host)
+            )
+        return self._client
+
+    async def _download(
+        self, client: httpx.AsyncClient, url: str, headers: Dict[str, str]
+    ) -> Tuple[FetchedPage, httpx.Headers]:
+        async with client.stream("GET", url, headers=headers) as response:
+            status = response.status_code
+            content_type = response.headers.get("content-type", "")
+            media_type = content_type.split(";")[0].strip().lower()
+            if status == 304:
+                return _failed(url, "Not modified", status), response.headers
+            if status >= 400:
+                return _failed(url, f"HTTP {status}", status), response.headers
+            if media_type not in HTML_CONTENT_TYPES + TEXT_CONTENT_TYPES:
+                error = f"Unsupported content type: {media_type}"
+                return _failed(url, error, status), response.headers
+
+            decoder = _decoder(response.charset_encoding)
+            extractor = HTMLTextExtractor(self._max_chars)
+            plain: List[str] = []
+            plain_chars = 0
+            bytes_read = 0
+            truncated = False
+            async for chunk in response.aiter_bytes():
+                chunk = chunk[: self._max_bytes - bytes_read]
+                bytes_read += len(chunk)
+                text = decoder.decode(chunk)
+                if media_type in HTML_CONTENT_TYPES:
+                    extractor.feed(text)
+                    enough = extractor.full
+                else:
+                    plain.append(text[: self._max_chars - plain_chars])
+                    plain_chars += len(plain[-1])
+                    enough = plain_chars >= self._max_chars
+                if bytes_read >= self._max_bytes or enough:
+                    # Leaving the stream early closes the connection mid-body.
+                    truncated = True
+                    break
+
+            tail = decoder.decode(b"", final=True)
+            if media_type in HTML_CONTENT_TYPES:
+                extractor.feed(tail)
+                extractor.close()
+                title, text = extractor.title, extractor.text()
+            else:
+                title, text = "", "".join(plain + [tail])[: self._max_chars].strip()
+
+            page: FetchedPage = {
+                "url": url,
+                "status": status,
+                "content_type": media_type,
+                "title": title,
+                "text": text,
+                "bytes_read": bytes_read,
+                "truncated": truncated,
+                "error": "",
+            }
+            return page, response.headers
+
+    async def _fetch(self, url: str) -> FetchedPage:
+        client = self._get_client()
+        assert self._semaphore is not None
+        host = (urlsplit(url).hostname or "").lower()
+        if not host:
+            return _failed(url, "Invalid URL")
+
+        cached: Optional[CachedPage] = None
+        if self._cache is not None:
+            # SQLite, blob file I/O and zlib stay off the event loop.
+            cached = await asyncio.to_thread(self._cache.lookup, url)
+            if cached is not None and cached["fresh"]:
+                self._cache.record(url, "hits")
+                return cached["page"]
+
+        try:
+            # Wait for the host's slot before taking a global one, so requests
+            # queued behind a busy host don't hold slots other hosts could use.
+            async with self._host_semaphores[host], self._semaphore:
+                page, headers = await asyncio.wait_for(
+                    self._download(client, url, PageCache.conditional_headers(cached)),
+                    timeout=self._timeout,
+                )
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            # httpx's own timeouts use the same budget and can fire first.
+            logging.warning(f"Page fetch timed out after {self._timeout}s: {url}")
+            return _failed(url, "Timed out")
+        except httpx.HTTPError as e:
+            logging.warning(f"Page fetch failed for {url}: {e}")
+            return _failed(url, str(e) or type(e).__name__)
+
+        if self._cache is None:
+            return page
+        if page["status"] == 304 and cached is not None:
+            await asyncio.to_thread(self._cache.revalidated, url)
+            self._cache.record(url, "revalidated")
+            return cached["page"]
+        self._cache.record(url, "misses")
+        if page["text"]:
+            await asyncio.to_thread(
+                self._cache.store,
+                url,
+                page,
+                headers.get("etag"),
+                headers.get("last-modified"),
+            )
+        return page
+
+    async def _fetch_many(self, urls: List[str]) -> List[FetchedPage]:
+        return list(await asyncio.gather(*(self._fetch(url) for url in urls)))
+
+    def fetch(self, url: str) -> FetchedPage:
+        """Downloads one page and returns its extracted text; errors are reported, not raised."""
+        return self._loop.run(self._fetch(url))
+
+    def fetch_many(self, urls: List[str]) -> List[FetchedPage]:
+        """Downloads pages concurrently; results keep the order of urls."""
+        return self._loop.run(self._fetch_many(urls))
+
+    async def afetch_many(self, urls: List[str]) -> List[FetchedPage]:
+        """Async variant of fetch_many."""
+        return await self._loop.run_async(self._fetch_many(urls))
+
+    async def _aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def close(self) -> None:
+        """Closes pooled connections and stops the background loop."""
+        if self._client is not None:
+            self._loop.run(self._aclose())
+        self._loop.stop()
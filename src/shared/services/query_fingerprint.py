@@ -0,0 +1,183 @@
+# src/shared/services/query_fingerprint.py
+
+import argparse
+import hashlib
+import re
+import unicodedata
+from typing import Callable
+from typing import FrozenSet
+from typing import Iterable
+from typing import List
+from typing import Set
+
+from src.shared.config.constants import CACHE_WARM_QUERY_LOG
+from src.shared.config.constants import QUERY_FINGERPRINT_STEM
+from src.shared.services.query_log import iter_query_log
+
+# Function words that rarely change what a web search returns. Negations
+# ("no", "not", "without", ...) and DIRECTIONAL_WORDS are deliberately
+# absent: dropping them would merge queries with opposite meanings. Kept
+# local so the search path does not import scikit-learn just for its
+# stopword list.
+STOP_WORDS: FrozenSet[str] = frozenset(
+    "a about again all also am an and any are as at be because been being between "
+    "both but by can could did do does doing down during each few for further had "
+    "has have having he her here hers herself him himself his how i if in is it "
+    "its itself just me more most my myself of off on once only or other our ours "
+    "ourselves out own same she should so some such that the their theirs them "
+    "themselves then there these they this those through too up very was we were "
+    "what when where which while who whom why will with would you your yours "
+    "yourself yourselves".split()
+)
+
+# Words that relate the terms on either side ("flights from paris to london").
+# They are kept, and terms are only sorted within the runs between them, so
+# swapping the terms around them changes the fingerprint.
+DIRECTIONAL_WORDS: FrozenSet[str] = frozenset(
+    "above after before below from into onto over than to toward towards under "
+    "until".split()
+)
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+# Singular words ending in "ies", which the plural rule would turn into nonwords
+_SINGULAR_IES: FrozenSet[str] = frozenset(
+    "caries congeries facies rabies scabies series species".split()
+)
+
+
+def normalize_query(query: str) -> str:
+    """NFKC-normalizes and casefolds a query, turning punctuation runs into single spaces."""
+    text = unicodedata.normalize("NFKC", query).casefold()
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def light_stem(token: str) -> str:
+    """
+    Strips common English inflections ("schedules", "scheduled" -> "schedul").
+
+    Deliberately conservative: words of four letters or fewer and anything
+    containing digits are left alone so unrelated terms are not merged.
+    """
+    if len(token) <= 4 or not token.isalpha():
+        return token
+    if token in _SINGULAR_IES:
+        return token
+    if token.endswith("ies"):
+        token = token[:-3] + "y"
+    elif token.endswith("sses"):
+        token = token[:-2]
+    elif token.endswith("ing") and len(token) > 6:
+        token = token[:-3]
+    elif token.endswith("ed") and len(token) > 5:
+        token = token[:-2]
+    elif token.endswith("es") and token[:-2].endswith(("s", "x", "z", "ch", "sh")):
+        token = token[:-2]
+    elif token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        token = token[:-1]
+    # "schedule" and "schedul(ed)" should meet on the same stem
+    if token.endswith("e") and len(token) > 4:
+        token = token[:-1]
+    return token
+
+
+class QueryFingerprinter:
+    """
+    Maps equivalent phrasings of a query to one stable key.
+
+    "Giants schedule Germany" and "germany giants  schedule?" share a
+    fingerprint: text is unicode-normalized and casefolded, punctuation and
+    whitespace collapse, stopwords drop out and the remaining tokens are
+    sorted, except across directional words such as "from" and "to".
+    Optional light stemming also merges simple inflections. The
+    fingerprint is only a key; the original term is still sent upstream.
+    """
+
+    def __init__(
+        self,
+        stem: bool = QUERY_FINGERPRINT_STEM,
+        stop_words: Iterable[str] = STOP_WORDS,
+        directional_words: Iterable[str] = DIRECTIONAL_WORDS,
+    ) -> None:
+        """
+        :param stem: Apply light_stem to every token.
+        :param stop_words: Tokens ignored when building the key.
+        :param directional_words: Tokens kept in place; tokens are only
+                                  sorted within the runs between them.
+        """
+        self._stem = stem
+        self._stop_words: Set[str] = set(stop_words)
+        self._directional_words: Set[str] = set(directional_words)
+
+    def tokens(self, query: str) -> List[str]:
+        """Returns the content tokens of a query, sorted between directional words."""
+        tokens = normalize_query(query).split()
+        # A query made only of stopwords ("the who") keeps all of them.
+        content = [token for token in tokens if token not in self._stop_words] or tokens
+        ordered: List[str] = []
+        run: List[str] = []
+        for token in content:
+            if token in self._directional_words:
+                ordered += sorted(run) + [token]
+                run = []
+            else:
+                run.append(light_stem(token) if self._stem else token)
+        return ordered + sorted(run)
+
+    def canonical(self, query: str) -> str:
+        """Returns the human-readable canonical form, e.g. "germany giants schedule"."""
+        return " ".join(self.tokens(query))
+
+    def fingerprint(self, query: str) -> str:
+        """Returns a stable hex key for the query's canonical form."""
+        canonical = self.canonical(query)
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+_default = QueryFingerprinter()
+
+
+def query_fingerprint(query: str) -> str:
+    """Fingerprints a query with the default settings."""
+    return _default.fingerprint(query)
+
+
+def replay_hit_rate(queries: Iterable[str], key: Callable[[str], str]) -> float:
+    """
+    Replays queries against an unbounded cache keyed by key(query).
+
+    Returns the fraction of queries that would have been cache hits.
+    """
+    seen: Set[str] = set()
+    hits = 0
+    total = 0
+    for query in queries:
+        total += 1
+        query_key = key(query)
+        if query_key in seen:
+            hits += 1
+        else:
+            seen.add(query_key)
+    return hits / total if total else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare cache hit rates of raw and fingerprinted query keys"
+    )
+    parser.add_argument("--log", default=CACHE_WARM_QUERY_LOG)
+    args = parser.parse_args()
+
+    queries = list(iter_query_log(args.log))
+    keys = {
+        "sanitized": lambda query: " ".join(query.strip().lower().split()),
+        "fingerprint": QueryFingerprinter(stem=False).fingerprint,
+        "fingerprint+stem": QueryFingerprinter(stem=True).fingerprint,
+    }
+    print(f"Replayed {len(queries)} queries from {args.log}")
+    for name, key in keys.items():
+        print(f"{name:>18}: {replay_hit_rate(queries, key):.1%} hit rate")
+
+
+if __name__ == "__main__":
+    main()
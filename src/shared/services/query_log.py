@@ -0,0 +1,26 @@
+# src/shared/services/query_log.py
+
+import logging
+import os
+from typing import Iterator
+
+from src.shared.config.constants import CACHE_WARM_QUERY_LOG
+
+# Marker WebSearchService writes before every query it runs
+QUERY_LOG_MARKER = "Executing search query: "
+# Marker for queries re-run by cache warming; iter_query_log skips them, so
+# warm runs do not count as demand for their own terms.
+REFRESH_LOG_MARKER = "Refreshing search query: "
+
+
+def iter_query_log(path: str = CACHE_WARM_QUERY_LOG) -> Iterator[str]:
+    """Yields every logged search term in order; nothing if the log is missing."""
+    if not os.path.exists(path):
+        logging.warning(f"Query log not found: {path}")
+        return
+    with open(path, "r", encoding="utf-8", errors="replace") as log_file:
+        for line in log_file:
+            _, marker, term = line.partition(QUERY_LOG_MARKER)
+            term = term.strip()
+            if marker and term:
+                yield term
@@ -0,0 +1,192 @@
+# src/shared/services/result_dedup.py
+
+import hashlib
+import re
+from collections import Counter
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from urllib.parse import parse_qsl
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+from urllib.parse import urlunsplit
+
+from src.shared.config.constants import DEDUP_MIN_TOKENS
+from src.shared.config.constants import DEDUP_SIMHASH_DISTANCE
+from src.shared.config.types import SearchResult
+
+# Query parameters that only track the click and never change the page
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "yclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "ref",
+    "ref_src",
+    "cmpid",
+    "ncid",
+    "ocid",
+    "spm",
+    "_ga",
+}
+TRACKING_PREFIXES = ("utm_",)
+HOST_PREFIXES = ("www.", "m.", "amp.")
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalizes a URL so tracking variants of the same page compare equal.
+
+    Drops the scheme difference, www./m./amp. host prefixes, default ports,
+    fragments, trailing slashes and tracking parameters; keeps the other
+    query parameters in sorted order.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    params = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMS
+        and not name.lower().startswith(TRACKING_PREFIXES)
+    ]
+    return urlunsplit(("https", host, path, urlencode(sorted(params)), ""))
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _hash64(feature: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def shingles(tokens: List[str], size: int = 3) -> Set[int]:
+    """Hashes every run of ``size`` consecutive tokens (all tokens if fewer)."""
+    if len(tokens) < size:
+        return {_hash64(" ".join(tokens))} if tokens else set()
+    return {
+        _hash64(" ".join(tokens[index : index + size]))
+        for index in range(len(tokens) - size + 1)
+    }
+
+
+def simhash(tokens: List[str], size: int = 3) -> int:
+    """64-bit SimHash over word shingles; similar texts differ in few bits."""
+    if len(tokens) < size:
+        features = Counter(tokens)
+    else:
+        features = Counter(
+            " ".join(tokens[index : index + size])
+            for index in range(len(tokens) - size + 1)
+        )
+    weights = [0] * 64
+    for feature, count in features.items():
+        hashed = _hash64(feature)
+        for bit in range(64):
+            weights[bit] += count if hashed >> bit & 1 else -count
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def hamming_distance(left: int, right: int) -> int:
+    return bin(left ^ right).count("1")
+
+
+class ResultDeduplicator:
+    """
+    Drops duplicate search results as they stream in.
+
+    A result is a duplicate when its canonical URL was already seen, or its
+    snippet's SimHash is within ``max_distance`` bits of a kept snippet.
+    Duplicates are folded into the first copy by merging engine lists.
+    """
+
+    def __init__(
+        self,
+        max_distance: int = DEDUP_SIMHASH_DISTANCE,
+        min_tokens: int = DEDUP_MIN_TOKENS,
+    ) -> None:
+        """
+        :param max_distance: Largest SimHash Hamming distance treated as a near duplicate.
+        :param min_tokens: Snippets shorter than this only match exactly, since
+                           SimHash is unreliable on a handful of words.
+        """
+        self._max_distance = max_distance
+        self._min_tokens = min_tokens
+        self._by_url: Dict[str, SearchResult] = {}
+        self._by_text: Dict[str, SearchResult] = {}
+        self._fingerprints: List[Tuple[int, SearchResult]] = []
+        self.duplicates = 0
+
+    def _find(
+        self, url: str, tokens: List[str], fingerprint: int
+    ) -> Optional[SearchResult]:
+        if url and url in self._by_url:
+            return self._by_url[url]
+        text = " ".join(tokens)
+        if text and text in self._by_text:
+            return self._by_text[text]
+        if len(tokens) >= self._min_tokens:
+            for kept_fingerprint, kept in self._fingerprints:
+                distance = hamming_distance(fingerprint, kept_fingerprint)
+                if distance <= self._max_distance:
+                    return kept
+        return None
+
+    def add(self, result: SearchResult) -> Optional[SearchResult]:
+        """
+        Returns a copy of result if it is new, or None after merging it into an earlier copy.
+
+        Kept results are copied first, so merging engines never touches
+        results shared with the cache or other single-flight callers.
+        """
+        url = canonicalize_url(result.get("link", ""))
+        tokens = tokenize(result.get("snippet", ""))
+        fingerprint = simhash(tokens) if len(tokens) >= self._min_tokens else 0
+        kept = self._find(url, tokens, fingerprint)
+        if kept is not None:
+            self.duplicates += 1
+            engines = kept.setdefault("engines", [])
+            for engine in result.get("engines", []):
+                if engine not in engines:
+                    engines.append(engine)
+            return None
+
+        result = {**result, "engines": list(result.get("engines", []))}
+        if url:
+            self._by_url[url] = result
+        if tokens:
+            self._by_text[" ".join(tokens)] = result
+        if len(tokens) >= self._min_tokens:
+            self._fingerprints.append((fingerprint, result))
+        return result
+
+
+def dedupe_results(results: List[SearchResult]) -> List[SearchResult]:
+    """Removes URL and near-duplicate snippet copies, keeping the first of each."""
+    deduplicator = ResultDeduplicator()
+    kept = (deduplicator.add(result) for result in results)
+    return [result for result in kept if result is not None]
@@ -0,0 +1,249 @@
+# src/shared/services/search_cache.py
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TypedDict
+
+import orjson
+
+from src.shared.config.constants import SEARCH_CACHE_DISK_TTL
+from src.shared.config.constants import SEARCH_CACHE_MAX_DISK_ENTRIES
+from src.shared.config.constants import SEARCH_CACHE_MAX_MEMORY_ENTRIES
+from src.shared.config.constants import SEARCH_CACHE_MEMORY_TTL
+
+# Trim the disk tier every N writes instead of on every write.
+_DISK_TRIM_INTERVAL = 64
+
+# Set while warming caches: reads miss so fresh values are computed and stored.
+_refreshing: ContextVar[bool] = ContextVar("search_cache_refreshing", default=False)
+
+
+@contextmanager
+def refreshing() -> Iterator[None]:
+    """Makes every SearchCache read in this context miss, so values are recomputed."""
+    token = _refreshing.set(True)
+    try:
+        yield
+    finally:
+        _refreshing.reset(token)
+
+
+def is_refreshing() -> bool:
+    """Whether this context runs under refreshing()."""
+    return _refreshing.get()
+
+
+class CacheStats(TypedDict):
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    stores: int
+    evictions: int
+
+
+class SearchCache:
+    """
+    Two-tier TTL + LRU cache for search results.
+
+    The memory tier is a per-process LRU. The optional disk tier is a SQLite
+    database in WAL mode, so several worker processes can share entries.
+    Values must be JSON serializable. Both tiers hold serialized values, so
+    every get returns a fresh copy that callers may mutate freely.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        memory_ttl: float = SEARCH_CACHE_MEMORY_TTL,
+        disk_ttl: float = SEARCH_CACHE_DISK_TTL,
+        max_memory_entries: int = SEARCH_CACHE_MAX_MEMORY_ENTRIES,
+        max_disk_entries: int = SEARCH_CACHE_MAX_DISK_ENTRIES,
+        table: str = "search_results",
+    ) -> None:
+        """
+        :param path: SQLite file for the shared disk tier; None keeps the cache in memory only.
+        :param memory_ttl: Seconds an entry stays valid in the memory tier.
+        :param disk_ttl: Seconds an entry stays valid in the disk tier.
+        :param max_memory_entries: LRU bound for the memory tier.
+        :param max_disk_entries: LRU bound for the disk tier.
+        :param table: Table name, so several caches can share one database file.
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table}")
+        self._path = path
+        self._memory_ttl = memory_ttl
+        self._disk_ttl = disk_ttl
+        self._max_memory_entries = max_memory_entries
+        self._max_disk_entries = max_disk_entries
+        self._table = table
+
+        self._memory: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes_since_trim = 0
+        self._stats: CacheStats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+
+        if self._path is not None:
+            directory = os.path.dirname(os.path.abspath(self._path))
+            os.makedirs(directory, exist_ok=True)
+            self._init_disk()
+
+    @staticmethod
+    def make_key(
+        search_term: str, engines: List[str], num_results: int, pageno: int = 1
+    ) -> str:
+        """Builds a cache key from the sanitized term, engine list, result count and page."""
+        parts = [search_term, ",".join(sorted(engines)), str(num_results)]
+        # First-page keys keep their original form so existing entries stay valid
+        if pageno > 1:
+            parts.append(str(pageno))
+        raw = "\x1f".join(parts)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared across threads (or forks).
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            assert self._path is not None
+            conn = sqlite3.connect(self._path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_disk(self) -> None:
+        self._connection().execute(
+            f"CREATE TABLE IF NOT EXISTS {self._table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._connection().execute(
+            f"CREATE INDEX IF NOT EXISTS {self._table}_accessed "
+            f"ON {self._table} (accessed_at)"
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached value for key, or None on a miss or expiry."""
+        if _refreshing.get():
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, data = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return orjson.loads(data)
+                del self._memory[key]
+
+        disk_data = self._disk_get(key, now) if self._path is not None else None
+        with self._lock:
+            if disk_data is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+            self._memory_set(key, disk_data, now)
+        return orjson.loads(disk_data)
+
+    def set(self, key: str, value: Any) -> None:
+        """Stores value in both tiers."""
+        now = time.time()
+        data = orjson.dumps(value)
+        with self._lock:
+            self._memory_set(key, data, now)
+            self._stats["stores"] += 1
+        if self._path is not None:
+            self._disk_set(key, data, now)
+
+    def _memory_set(self, key: str, data: bytes, now: float) -> None:
+        self._memory[key] = (now + self._memory_ttl, data)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_memory_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _disk_get(self, key: str, now: float) -> Optional[bytes]:
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                f"SELECT value, expires_at FROM {self._table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                conn.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+                return None
+            conn.execute(
+                f"UPDATE {self._table} SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            return bytes(row[0])
+        except sqlite3.Error as e:
+            logging.warning(f"Search cache read failed: {e}")
+            return None
+
+    def _disk_set(self, key: str, data: bytes, now: float) -> None:
+        try:
+            conn = self._connection()
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self._table} "
+                "(key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, data, now + self._disk_ttl, now),
+            )
+            with self._lock:
+                self._writes_since_trim += 1
+                should_trim = self._writes_since_trim >= _DISK_TRIM_INTERVAL
+                if should_trim:
+                    self._writes_since_trim = 0
+            if should_trim:
+                self.trim()
+        except sqlite3.Error as e:
+            logging.warning(f"Search cache write failed: {e}")
+
+    def trim(self) -> None:
+        """Drops expired disk entries, then the least recently used ones above the size bound."""
+        if self._path is None:
+            return
+        conn = self._connection()
+        conn.execute(f"DELETE FROM {self._table} WHERE expires_at <= ?", (time.time(),))
+        cursor = conn.execute(
+            f"DELETE FROM {self._table} WHERE key IN ("
+            f"SELECT key FROM {self._table} ORDER BY accessed_at ASC "
+            f"LIMIT MAX(0, (SELECT COUNT(*) FROM {self._table}) - ?))",
+            (self._max_disk_entries,),
+        )
+        with self._lock:
+            self._stats["evictions"] += max(cursor.rowcount, 0)
+
+    def clear(self) -> None:
+        """Removes every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        if self._path is not None:
+            self._connection().execute(f"DELETE FROM {self._table}")
+
+    def stats(self) -> CacheStats:
+        """Returns a snapshot of the hit/miss counters for this process."""
+        with self._lock:
+            return CacheStats(**self._stats)
@@ -1,29 +1,350 @@
+import asyncio
+import logging
+from typing import AsyncGenerator
+from typing import AsyncIterator
+from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
 
+import httpx
+
+from src.shared.config.constants import SEARCH_ENGINE_DEADLINE
+from src.shared.config.constants import SEARCH_MERGE_GRACE
 from src.shared.config.constants import WEB_SEARCH_URL
-from langchain_community.utilities import SearxSearchWrapper
+from src.shared.services.engine_stats import EngineStats
+from src.shared.services.result_dedup import canonicalize_url
+from src.shared.services.searx_client import SearxClient
 
 from src.shared.config.types import SearchResult
 
 
+# run_coroutine_threadsafe needs real coroutines, not async generator awaitables.
+async def _anext(stream: AsyncGenerator[SearchResult, None]) -> SearchResult:
+    return await stream.__anext__()
+
+
+async def _aclose(stream: AsyncGenerator[SearchResult, None]) -> None:
+    await stream.aclose()
+
+
+class ResultMerger:
+    """Merges per-engine result lists as they arrive, de-duplicating by canonical link."""
+
+    def __init__(self) -> None:
+        self._results: Dict[str, SearchResult] = {}
+        self._scores: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @staticmethod
+    def _key(result: SearchResult) -> str:
+        return canonicalize_url(result.get("link", "")) or result.get("title", "")
+
+    def add(self, results: List[SearchResult]) -> List[SearchResult]:
+        """
+        Adds one engine's results and returns the ones not seen before.
+
+        A result scores 1/position for every engine that returned it, so
+        links several engines agree on rank above single-engine hits.
+        """
+        new_results: List[SearchResult] = []
+        for position, result in enumerate(results, start=1):
+            key = self._key(result)
+            existing = self._results.get(key)
+            if existing is None:
+                merged: SearchResult = {**result, "engines": list(result["engines"])}
+                self._results[key] = merged
+                self._scores[key] = 0.0
+                new_results.append(merged)
+            else:
+                for engine in result["engines"]:
+                    if engine not in existing["engines"]:
+                        existing["engines"].append(engine)
+            self._scores[key] += 1.0 / position
+        return new_results
+
+    def ranked(self) -> List[SearchResult]:
+        """Returns merged results, best score first (ties keep arrival order)."""
+        keys = sorted(self._results, key=lambda key: -self._scores[key])
+        return [self._results[key] for key in keys]
+
+    def score(self, result: SearchResult) -> float:
+        """Returns the merged score of result, or 0.0 for a result never added."""
+        return self._scores.get(self._key(result), 0.0)
+
+    def rank(self, results: List[SearchResult]) -> List[SearchResult]:
+        """Orders results (such as copies of streamed ones) like ranked() would."""
+        return sorted(results, key=lambda result: -self.score(result))
+
+
 class SearchEngineService:
     def __init__(
-        self, host: str = WEB_SEARCH_URL, num_results: int = 3, engines: List[str] = []
+        self,
+        host: str = WEB_SEARCH_URL,
+        num_results: int = 3,
+        engines: List[str] = [],
+        client: Optional[SearxClient] = None,
+        engine_deadline: float = SEARCH_ENGINE_DEADLINE,
+        stats: Optional[EngineStats] = None,
+        merge_grace: float = SEARCH_MERGE_GRACE,
     ):
         """
         Initializes the SearxNG search engine with a specified host and default number of results.
         :param host: The Searx host URL.
         :param num_results: Default number of results to fetch per query.
+        :param engines: SearxNG engines to query in parallel; an empty list sends one
+                        request using the instance defaults.
+        :param client: Optional pre-built SearxNG client (shares its connection pool).
+        :param engine_deadline: Seconds each engine gets before it is dropped.
+        :param stats: Per-engine latency statistics used to decide when to hedge.
+        :param merge_grace: Seconds engines still running get, once num_results merged
+                            results are in, before they are dropped.
         """
         self._host = host  # Store host as a private attribute
         self._num_results = num_results  # Store num_results as a private attribute
-        self._search_wrapper = SearxSearchWrapper(searx_host=host, k=num_results)
+        self._client = client or SearxClient(host=host)
         self._engines = engines
+        self._engine_deadline = engine_deadline
+        self._stats = stats or EngineStats()
+        self._merge_grace = merge_grace
+
+    @property
+    def num_results(self) -> int:
+        return self._num_results
+
+    @property
+    def engines(self) -> List[str]:
+        return list(self._engines)
+
+    @property
+    def stats(self) -> EngineStats:
+        return self._stats
+
+    def _engine_groups(self, engines: Optional[List[str]]) -> List[List[str]]:
+        # One request per engine, so a slow engine only delays its own results.
+        engines = self._engines if engines is None else engines
+        return [[engine] for engine in engines] if engines else [[]]
+
+    async def _search_engine(
+        self, query: str, engines: List[str], pageno: int, num_results: int
+    ) -> List[SearchResult]:
+        """
+        Queries one engine under its deadline, hedging when it runs slow.
+
+        Once the primary request outlives the engine's hedge percentile a
+        duplicate is sent; whichever answers first wins and the other is
+        cancelled.
+        """
+        label = ",".join(engines) or "default"
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._engine_deadline
+        hedge_delay = self._stats.hedge_delay(label)
 
-    def run(self, query: str) -> List[SearchResult]:
-        """Perform a search and return collected results."""
-        results: List[SearchResult] = self._search_wrapper.results(
-            query=query, num_results=self._num_results, engines=self._engines
+        async def attempt() -> List[SearchResult]:
+            started = loop.time()
+            results = await self._client.asearch(
+                query=query,
+                num_results=num_results,
+                engines=engines,
+                pageno=pageno,
+                timeout=self._engine_deadline,
+            )
+            self._stats.record_latency(label, loop.time() - started)
+            return results
+
+        attempts = [asyncio.ensure_future(attempt())]
+        error: Optional[BaseException] = None
+        try:
+            if hedge_delay is not None and hedge_delay < self._engine_deadline:
+                done, _ = await asyncio.wait(attempts, timeout=hedge_delay)
+                if not done:
+                    logging.info(f"Hedging slow search request to engine: {label}")
+                    attempts.append(asyncio.ensure_future(attempt()))
+
+            while attempts:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, _ = await asyncio.wait(
+                    attempts, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    attempts.remove(task)
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+        except asyncio.CancelledError:
+            # Dropped by the fan-out before answering; count it at the deadline
+            # so engines that never make the cut stop looking fast.
+            self._stats.record_latency(label, self._engine_deadline)
+            raise
+        finally:
+            for task in attempts:
+                task.cancel()
+
+        if error is not None:
+            self._stats.record_error(label)
+            raise error
+        self._stats.record_timeout(label, self._engine_deadline)
+        raise httpx.TimeoutException(
+            f"Engine {label} missed its {self._engine_deadline}s deadline"
+        )
+
+    async def _stream(
+        self,
+        query: str,
+        merger: ResultMerger,
+        engines: Optional[List[str]] = None,
+        pageno: int = 1,
+        num_results: Optional[int] = None,
+    ) -> AsyncGenerator[SearchResult, None]:
+        """
+        Queries every engine at once and yields new results as each engine answers.
+
+        At most num_results results are yielded. Once the merger holds that
+        many, engines still running get merge_grace more seconds to answer
+        (and feed the merger's ranking) before they are cancelled, so a slow
+        engine only delays a search that is still short of results.
+        """
+        num_results = self._num_results if num_results is None else num_results
+        loop = asyncio.get_running_loop()
+        grace_deadline: Optional[float] = None
+        pending = {
+            asyncio.ensure_future(
+                self._search_engine(query, group, pageno, num_results)
+            )
+            for group in self._engine_groups(engines)
+        }
+        errors: List[BaseException] = []
+        yielded = 0
+        try:
+            while pending:
+                timeout = (
+                    None if grace_deadline is None else max(0.0, grace_deadline - loop.time())
+                )
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    try:
+                        new_results = merger.add(task.result())
+                    except Exception as e:
+                        logging.warning(f"Search engine request failed: {e}")
+                        errors.append(e)
+                        continue
+                    for result in new_results[: num_results - yielded]:
+                        yielded += 1
+                        yield result
+                if grace_deadline is None and len(merger) >= num_results:
+                    grace_deadline = loop.time() + self._merge_grace
+        finally:
+            # Stragglers are no longer needed once the grace period is over.
+            for task in pending:
+                task.cancel()
+
+        if not yielded and errors:
+            raise errors[0]
+
+    async def _fan_out(
+        self,
+        query: str,
+        engines: Optional[List[str]] = None,
+        pageno: int = 1,
+        num_results: Optional[int] = None,
+    ) -> List[SearchResult]:
+        num_results = self._num_results if num_results is None else num_results
+        merger = ResultMerger()
+        async for _ in self._stream(query, merger, engines, pageno, num_results):
+            pass
+        return merger.ranked()[:num_results]
+
+    def run(
+        self,
+        query: str,
+        engines: Optional[List[str]] = None,
+        pageno: int = 1,
+        num_results: Optional[int] = None,
+    ) -> List[SearchResult]:
+        """
+        Perform a search and return collected results.
+        :param engines: Engines to query for this search instead of the configured ones.
+        :param pageno: SearxNG result page to fetch from every engine.
+        :param num_results: Results to collect instead of the configured default.
+        """
+        results: List[SearchResult] = self._client.loop.run(
+            self._fan_out(query, engines, pageno, num_results)
+        )
+
+        return results
+
+    async def arun(
+        self,
+        query: str,
+        engines: Optional[List[str]] = None,
+        pageno: int = 1,
+        num_results: Optional[int] = None,
+    ) -> List[SearchResult]:
+        """Async variant of run."""
+        results: List[SearchResult] = await self._client.loop.run_async(
+            self._fan_out(query, engines, pageno, num_results)
         )
 
         return results
+
+    def iter_results(
+        self,
+        query: str,
+        engines: Optional[List[str]] = None,
+        pageno: int = 1,
+        num_results: Optional[int] = None,
+        merger: Optional[ResultMerger] = None,
+    ) -> Iterator[SearchResult]:
+        """
+        Yields results as engines answer instead of waiting for all of them.
+
+        Requests keep running on the client's loop while the caller works
+        on the results it already has. Results come in arrival order; pass
+        a merger and call merger.rank on them afterwards to get run()'s order.
+
+        :param merger: Collects every engine's results and their ranking.
+        """
+        merger = ResultMerger() if merger is None else merger
+        stream = self._stream(query, merger, engines, pageno, num_results)
+        try:
+            while True:
+                try:
+                    yield self._client.loop.run(_anext(stream))
+                except StopAsyncIteration:
+                    return
+        finally:
+            self._client.loop.run(_aclose(stream))
+
+    async def aiter_results(
+        self,
+        query: str,
+        engines: Optional[List[str]] = None,
+        pageno: int = 1,
+        num_results: Optional[int] = None,
+        merger: Optional[ResultMerger] = None,
+    ) -> AsyncIterator[SearchResult]:
+        """Async variant of iter_results."""
+        merger = ResultMerger() if merger is None else merger
+        stream = self._stream(query, merger, engines, pageno, num_results)
+        try:
+            while True:
+                try:
+                    yield await self._client.loop.run_async(_anext(stream))
+                except StopAsyncIteration:
+                    return
+        finally:
+            await self._client.loop.run_async(_aclose(stream))
+
+    def close(self) -> None:
+        """Releases pooled connections held by the SearxNG client."""
+        self._client.close()
@@ -1,29 +1,235 @@
 # src/shared/services/search_validation_service.py
 
+import argparse
+import hashlib
+import math
+import threading
+import time
+from collections import defaultdict
+from functools import cached_property
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from sentence_transformers import SentenceTransformer
 from sentence_transformers import util
 from keybert import KeyBERT
+from keybert.backend import BaseEmbedder
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
 from typing import TypedDict
 
+from src.shared.config.constants import KEYWORD_MODEL_NAME
+from src.shared.config.constants import MICRO_BATCH_ENABLED
+from src.shared.config.constants import SEMANTIC_MODEL_NAME
+from src.shared.config.constants import VALIDATION_CASCADE
+from src.shared.config.constants import VALIDATION_CASCADE_HIGH
+from src.shared.config.constants import VALIDATION_CASCADE_LOW
+from src.shared.config.constants import VALIDATION_CASCADE_TOLERANCE
+from src.shared.config.constants import VALIDATION_SCORERS
+from src.shared.config.constants import VALIDATION_SHARED_ENCODER
+from src.shared.services.embedding_cache import EmbeddingCache
+from src.shared.services.inference_autotune import encoder_batch_size
+from src.shared.services.micro_batcher import EncodeFn
+from src.shared.services.micro_batcher import EncoderBackend
+from src.shared.services.micro_batcher import MicroBatcher
+from src.shared.services.micro_batcher import MicroBatchedBackend
+from src.shared.services.micro_batcher import get_batcher
+from src.shared.services.search_cache import SearchCache
+from src.shared.services.text_encoder import encoder_id
+from src.shared.services.text_encoder import get_encoder
+from src.shared.services.text_encoder import load_pairs
+from src.shared.services.validation_scorers import COST_CLASSES
+from src.shared.services.validation_scorers import SCORERS
+from src.shared.services.validation_scorers import Scorer
+from src.shared.services.validation_scorers import ScorerStats
+from src.shared.services.validation_scorers import parse_scorer_weights
+
+
+# Scorers and weights results were computed with before scorers were configurable
+DEFAULT_SCORERS = "tfidf:0.3,semantic:0.5,keyword:0.2"
+
+# IDF that a TfidfVectorizer fit on a single (query, text) pair gives a term
+# found in only one of the two documents; shared terms get exactly 1.0.
+_PAIR_IDF = 1.0 + math.log(1.5)
+
 
 class ValidationResult(TypedDict):
     score: float
     is_valid: bool
-    cosine_score: float
-    semantic_score: float
-    keyword_score: float
+    cosine_score: Optional[float]
+    semantic_score: Optional[float]
+    keyword_score: Optional[float]
     reason: str
 
 
+# Result fields reporting each built-in scorer's raw score
+SCORE_FIELDS = {
+    "tfidf": "cosine_score",
+    "semantic": "semantic_score",
+    "keyword": "keyword_score",
+}
+
+
+def calibrate_cascade_band(
+    results: Iterable[ValidationResult],
+    tolerance: float = VALIDATION_CASCADE_TOLERANCE,
+    scorer: str = "tfidf",
+) -> Tuple[float, float]:
+    """
+    Fits cascade band edges to results of the full scorer.
+
+    Returns the widest exits, (low, high), for which deciding every result
+    with a score from scorer (the cascade's first tier) below low as invalid
+    and above high as valid would change at most a tolerance fraction of the
+    decisions, split evenly between the two edges.
+    """
+    field = SCORE_FIELDS[scorer]
+    scored = [
+        (result[field], result["is_valid"])  # type: ignore[literal-required]
+        for result in results
+    ]
+    if not scored:
+        return VALIDATION_CASCADE_LOW, VALIDATION_CASCADE_HIGH
+    cosine = np.array([score for score, _ in scored])
+    valid = np.array([is_valid for _, is_valid in scored])
+    budget = tolerance * len(scored) / 2
+    candidates = np.unique(cosine)
+
+    low = 0.0
+    for value in candidates:
+        if np.sum(valid & (cosine < value)) > budget:
+            break
+        low = float(value)
+    high = max(1.0, float(candidates[-1]))
+    for value in candidates[::-1]:
+        if np.sum(~valid & (cosine > value)) > budget:
+            break
+        high = float(value)
+    return min(low, high), high
+
+
+class CachedEncoderBackend(BaseEmbedder):
+    """KeyBERT backend that encodes with an existing model through an embedding cache."""
+
+    def __init__(
+        self,
+        model: SentenceTransformer,
+        cache: EmbeddingCache,
+        encode: Optional[EncodeFn] = None,
+    ) -> None:
+        """:param encode: Encodes cache misses; defaults to model.encode."""
+        super().__init__(embedding_model=model)
+        self.cache = cache
+        self.encode: EncodeFn = encode or model.encode
+
+    def embed(self, documents: List[str], verbose: bool = False) -> np.ndarray:
+        return self.cache.encode(list(documents), self.encode)
+
+
 class SearchValidationService:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        cache: Optional[SearchCache] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        shared_encoder: bool = VALIDATION_SHARED_ENCODER,
+        cascade: bool = VALIDATION_CASCADE,
+        cascade_band: Tuple[float, float] = (
+            VALIDATION_CASCADE_LOW,
+            VALIDATION_CASCADE_HIGH,
+        ),
+        scorers: str = VALIDATION_SCORERS,
+        micro_batching: bool = MICRO_BATCH_ENABLED,
+    ) -> None:
+        """
+        :param cache: Optional cache of validation results, keyed by query and text.
+        :param embedding_cache: Optional cache of semantic model embeddings, so
+                                repeated snippets and queries are not re-encoded.
+        :param shared_encoder: Run KeyBERT on the semantic model instead of
+                               loading a second transformer.
+        :param cascade: Score cheapest first and skip the models once the
+                        outcome is decided; see _cascade.
+        :param cascade_band: Scores of the cheapest scorer (low, high) outside
+                             which a result is decided by that score alone.
+                             That scorer must be one of SCORE_FIELDS, so the
+                             band can be calibrated on its reported scores.
+        :param scorers: Enabled scorers and weights, "name:weight,..." using
+                        names from the scorer registry; weights are normalized.
+        :param micro_batching: Encode through the model's shared MicroBatcher,
+                               so concurrent validations share forward passes.
+        """
+        self.cache = cache
+        self.cascade_band: Optional[Tuple[float, float]] = (
+            cascade_band if cascade else None
+        )
+        if shared_encoder and embedding_cache is None:
+            # Texts already encoded for semantic scoring are embedding cache
+            # hits when KeyBERT embeds them, and so are repeated candidate words.
+            embedding_cache = EmbeddingCache(encoder_id(SEMANTIC_MODEL_NAME))
+        self.embedding_cache = embedding_cache
         self.tfidf_vectorizer: TfidfVectorizer = TfidfVectorizer()
-        self.semantic_model: SentenceTransformer = SentenceTransformer(
-            "all-MiniLM-L6-v2"
+        self._shared_encoder = shared_encoder
+        self._micro_batching = micro_batching
+
+        weights = parse_scorer_weights(scorers)
+        unknown = sorted(set(weights) - set(SCORERS))
+        if unknown:
+            raise ValueError(f"Unknown validation scorers: {', '.join(unknown)}")
+        total = sum(weights.values())
+        self.weights: Dict[str, float] = {
+            name: weight / total for name, weight in weights.items()
+        }
+        self.scorers: List[Scorer] = [SCORERS[name](self) for name in self.weights]
+        if self.cascade_band is not None and self.cascade_scorers[0].name not in SCORE_FIELDS:
+            raise ValueError(
+                f"The validation cascade cannot start with {self.cascade_scorers[0].name}; "
+                f"its first tier must be one of {', '.join(SCORE_FIELDS)}"
+            )
+        self._scorer_stats: Dict[str, ScorerStats] = {
+            name: {"calls": 0, "texts": 0, "seconds": 0.0} for name in self.weights
+        }
+        self._tier_exits: Dict[str, int] = defaultdict(int)
+        self._stats_lock = threading.Lock()
+
+    # Models load on first use, so deployments that disable a scorer never load it.
+    @cached_property
+    def semantic_model(self) -> SentenceTransformer:
+        return get_encoder(SEMANTIC_MODEL_NAME)
+
+    @cached_property
+    def kw_model(self) -> KeyBERT:
+        if not self._shared_encoder:
+            model = get_encoder(KEYWORD_MODEL_NAME)
+            batch_size = encoder_batch_size(KEYWORD_MODEL_NAME)
+            if not self._micro_batching:
+                return KeyBERT(EncoderBackend(model, batch_size))
+            return KeyBERT(MicroBatchedBackend(model, get_batcher(model, batch_size)))
+        assert self.embedding_cache is not None
+        return KeyBERT(
+            CachedEncoderBackend(
+                self.semantic_model, self.embedding_cache, self._semantic_encode
+            )
         )
-        self.kw_model: KeyBERT = KeyBERT("distilbert-base-nli-mean-tokens")
+
+    @cached_property
+    def semantic_batch_size(self) -> int:
+        """This host's tuned batch size for the semantic model."""
+        return encoder_batch_size(SEMANTIC_MODEL_NAME)
+
+    @cached_property
+    def semantic_batcher(self) -> MicroBatcher:
+        """The semantic model's shared MicroBatcher, with this host's tuned batch size."""
+        return get_batcher(self.semantic_model, self.semantic_batch_size)
+
+    def _semantic_encode(self, texts: List[str]) -> Any:
+        if self._micro_batching:
+            return self.semantic_batcher.encode(texts)
+        return self.semantic_model.encode(texts, batch_size=self.semantic_batch_size)
 
     def cosine_similarity_score(self, query: str, result_text: str) -> float:
         tfidf_matrix = self.tfidf_vectorizer.fit_transform([query, result_text])
@@ -31,11 +237,18 @@ class SearchValidationService:
         cosine_similarity_score: float = similarity_matrix[0][0]
         return cosine_similarity_score
 
-    def semantic_similarity_score(self, query: str, result_text: str) -> float:
-        query_embedding = self.semantic_model.encode(query, convert_to_tensor=True)
-        result_embedding = self.semantic_model.encode(
-            result_text, convert_to_tensor=True
+    def embed(self, texts: List[str]) -> Any:
+        """Encodes texts with the semantic model, through the embedding cache if set."""
+        if self.embedding_cache is not None:
+            return self.embedding_cache.encode(texts, self._semantic_encode)
+        if self._micro_batching:
+            return self.semantic_batcher.encode(texts)
+        return self.semantic_model.encode(
+            texts, convert_to_tensor=True, batch_size=self.semantic_batch_size
         )
+
+    def semantic_similarity_score(self, query: str, result_text: str) -> float:
+        query_embedding, result_embedding = self.embed([query, result_text])
         similarity = util.cos_sim(query_embedding, result_embedding)
         similarity_score: float = similarity.item()
         return similarity_score
@@ -52,27 +265,310 @@ class SearchValidationService:
         overlap_count = sum(1 for kw in query_keywords if kw in result_keywords)
         return overlap_count / len(query_keywords) if query_keywords else 1.0
 
+    def cosine_similarity_scores(self, query: str, texts: List[str]) -> np.ndarray:
+        """
+        Batched cosine_similarity_score: the same per-pair TF-IDF similarity.
+
+        Tokens are counted in one pass over the query and every text. Refitting
+        TF-IDF on each pair only changes the IDF, which for two documents is 1
+        for shared terms and 1 + ln(1.5) otherwise, so it is applied directly.
+        """
+        try:
+            counts = CountVectorizer().fit_transform([query] + texts).tocsr()
+        except ValueError:
+            # No text has a single token.
+            return np.zeros(len(texts))
+        query_counts = counts[0]
+        text_counts = counts[1:]
+        query_terms = query_counts.data.astype(float)
+        # Counts of the query's terms in every text, one row per text
+        overlap = text_counts[:, query_counts.indices].toarray().astype(float)
+        shared = overlap > 0
+
+        dot = overlap @ query_terms
+        text_norm = _PAIR_IDF**2 * np.asarray(
+            text_counts.multiply(text_counts).sum(axis=1), dtype=float
+        ).ravel() - (_PAIR_IDF**2 - 1.0) * (overlap**2).sum(axis=1)
+        query_norm = _PAIR_IDF**2 * (query_terms**2).sum() - (_PAIR_IDF**2 - 1.0) * (
+            shared * query_terms**2
+        ).sum(axis=1)
+        norm = np.sqrt(query_norm * text_norm)
+        return np.divide(dot, norm, out=np.zeros(len(texts)), where=norm > 0)
+
+    def semantic_similarity_scores(self, query: str, texts: List[str]) -> np.ndarray:
+        """Batched semantic_similarity_score: the query and texts go through one encoder call."""
+        embeddings = self.embed([query] + texts)
+        similarity = util.cos_sim(embeddings[:1], embeddings[1:])[0]
+        return similarity.cpu().numpy().astype(float)
+
+    def keyword_coverage_scores(
+        self, query: str, texts: List[str], top_n: int = 5
+    ) -> np.ndarray:
+        """Batched keyword_coverage_score: the query's keywords are extracted once."""
+        query_keywords = [
+            word for word, _ in self.kw_model.extract_keywords(query, top_n=top_n)
+        ]
+        if not query_keywords:
+            return np.ones(len(texts))
+        extracted = self.kw_model.extract_keywords(texts, top_n=top_n)
+        if len(texts) == 1:
+            # KeyBERT unwraps the keywords of a single-document batch.
+            extracted = [extracted]
+        elif not extracted:
+            # Returned when no text has a single candidate keyword
+            extracted = [[] for _ in texts]
+        overlap = [
+            sum(1 for kw in query_keywords if kw in {word for word, _ in keywords})
+            for keywords in extracted
+        ]
+        return np.asarray(overlap, dtype=float) / len(query_keywords)
+
+    @staticmethod
+    def cache_key(
+        query: str, result_text: str, threshold: float, variant: str = ""
+    ) -> str:
+        """
+        Builds the validation cache key for a query, result text and threshold.
+
+        variant tells scoring modes apart whose results differ, e.g. the cascade.
+        """
+        parts = [query, result_text, repr(threshold)]
+        if variant:
+            parts.append(variant)
+        raw = "\x1f".join(parts)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _cache_key(self, query: str, result_text: str, threshold: float) -> str:
+        variants = []
+        # Results cached under the default scorers keep their original keys
+        if self.weights != parse_scorer_weights(DEFAULT_SCORERS):
+            variants.append(
+                "scorers:" + ",".join(f"{name}:{w!r}" for name, w in self.weights.items())
+            )
+        if self.cascade_band is not None:
+            variants.append("cascade:{}:{}".format(*self.cascade_band))
+        return self.cache_key(query, result_text, threshold, ";".join(variants))
+
+    @property
+    def cascade_scorers(self) -> List[Scorer]:
+        """The enabled scorers in the order the cascade runs them, cheapest first."""
+        return sorted(self.scorers, key=lambda scorer: COST_CLASSES.index(scorer.cost))
+
+    def cascade_stats(self) -> Dict[str, int]:
+        """Returns how many results the cascade decided at each scorer, in this process."""
+        with self._stats_lock:
+            return {scorer.name: self._tier_exits[scorer.name] for scorer in self.scorers}
+
+    def scorer_stats(self) -> Dict[str, ScorerStats]:
+        """Returns call counts, texts scored and wall time per scorer, in this process."""
+        with self._stats_lock:
+            return {name: ScorerStats(**stats) for name, stats in self._scorer_stats.items()}
+
+    def _run_scorer(self, scorer: Scorer, query: str, texts: List[str]) -> np.ndarray:
+        started = time.perf_counter()
+        scores = np.asarray(scorer.score(query, texts), dtype=float)
+        elapsed = time.perf_counter() - started
+        with self._stats_lock:
+            stats = self._scorer_stats[scorer.name]
+            stats["calls"] += 1
+            stats["texts"] += len(texts)
+            stats["seconds"] += elapsed
+        return scores
+
     def validate(
         self, query: str, result_text: str, threshold: float = 0.6
     ) -> ValidationResult:
-        cosine_score: float = self.cosine_similarity_score(query, result_text)
-        semantic_score: float = self.semantic_similarity_score(query, result_text)
-        keyword_score: float = self.keyword_coverage_score(query, result_text)
+        if self.cache is None:
+            return self._score(query, result_text, threshold)
+        key = self._cache_key(query, result_text, threshold)
+        cached: Optional[ValidationResult] = self.cache.get(key)
+        if cached is not None:
+            return cached
+        validation = self._score(query, result_text, threshold)
+        self.cache.set(key, validation)
+        return validation
 
-        # Weighted average score
-        score: float = (
-            (cosine_score * 0.3) + (semantic_score * 0.5) + (keyword_score * 0.2)
-        )
+    def validate_batch(
+        self, query: str, texts: List[str], threshold: float = 0.6
+    ) -> List[ValidationResult]:
+        """
+        Validates many result texts against one query.
+
+        Returns the same results as calling validate on every text, but the
+        vocabulary is counted, the encoder run and the query's keywords
+        extracted once for the whole batch. Cached texts are not rescored.
+        """
+        results: List[Optional[ValidationResult]] = [None] * len(texts)
+        keys: List[str] = []
+        if self.cache is not None:
+            keys = [self._cache_key(query, text, threshold) for text in texts]
+            results = [self.cache.get(key) for key in keys]
+
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            scored = self._score_batch(query, [texts[index] for index in missing], threshold)
+            for index, validation in zip(missing, scored):
+                results[index] = validation
+                if self.cache is not None:
+                    self.cache.set(keys[index], validation)
+        return [result for result in results if result is not None]
+
+    def _score_batch(
+        self, query: str, texts: List[str], threshold: float
+    ) -> List[ValidationResult]:
+        if self.cascade_band is not None:
+            return self._cascade(query, texts, threshold, self.cascade_band)
+        scores = np.zeros(len(texts))
+        raw: Dict[str, np.ndarray] = {}
+        for scorer in self.scorers:
+            raw[scorer.name] = self._run_scorer(scorer, query, texts)
+            scores = scores + raw[scorer.name] * self.weights[scorer.name]
+        valid = scores >= threshold
+        last = self.scorers[-1].name
+        return self._results(scores, valid, raw, [last] * len(texts))
+
+    def _cascade(
+        self,
+        query: str,
+        texts: List[str],
+        threshold: float,
+        band: Tuple[float, float],
+    ) -> List[ValidationResult]:
+        """
+        Runs the scorers cheapest first, stopping once each outcome is decided.
 
-        return {
-            "score": score,
-            "is_valid": score >= threshold,
-            "cosine_score": cosine_score,
-            "semantic_score": semantic_score,
-            "keyword_score": keyword_score,
-            "reason": (
+        1. The cheapest scorer decides results scoring below band[0] (invalid)
+           or above band[1] (valid). This is the only step that can disagree
+           with the full scorer; calibrate_cascade_band fits the band.
+        2. Each further scorer runs only for undecided results. Since the
+           remaining scorers' bounds are known, a result is decided once it
+           reaches the threshold with their lowest possible scores, or
+           misses it with their highest.
+
+        Scores of scorers that were skipped are reported as None.
+        """
+        scorers = self.cascade_scorers
+        low, high = band
+        raw = {scorer.name: np.full(len(texts), np.nan) for scorer in scorers}
+        tiers = np.full(len(texts), scorers[0].name, dtype=object)
+
+        first = scorers[0]
+        raw[first.name] = self._run_scorer(first, query, texts)
+        partial = raw[first.name] * self.weights[first.name]
+        valid = raw[first.name] > high
+        undecided = ~valid & (raw[first.name] >= low)
+
+        for position, scorer in enumerate(scorers[1:], start=2):
+            pending = np.flatnonzero(undecided)
+            if not pending.size:
+                break
+            raw[scorer.name][pending] = self._run_scorer(
+                scorer, query, [texts[index] for index in pending]
+            )
+            partial[pending] += raw[scorer.name][pending] * self.weights[scorer.name]
+            tiers[pending] = scorer.name
+            rest = scorers[position:]
+            lowest = partial + sum(self.weights[other.name] * other.bounds[0] for other in rest)
+            highest = partial + sum(
+                self.weights[other.name] * other.bounds[1] for other in rest
+            )
+            sure_valid = undecided & (lowest >= threshold)
+            sure_invalid = undecided & (highest < threshold)
+            valid |= sure_valid
+            undecided &= ~(sure_valid | sure_invalid)
+        # Only reached when a single scorer is enabled
+        valid[undecided] = partial[undecided] >= threshold
+
+        with self._stats_lock:
+            for tier in tiers:
+                self._tier_exits[tier] += 1
+        return self._results(partial, valid, raw, list(tiers), scorers[-1].name)
+
+    def _results(
+        self,
+        scores: np.ndarray,
+        valid: np.ndarray,
+        raw: Dict[str, np.ndarray],
+        tiers: List[str],
+        last: Optional[str] = None,
+    ) -> List[ValidationResult]:
+        last = last or self.scorers[-1].name
+        results: List[ValidationResult] = []
+        for index, tier in enumerate(tiers):
+            reason = (
                 "Meets relevance threshold"
-                if score >= threshold
+                if valid[index]
                 else "Below relevance threshold"
-            ),
-        }
+            )
+            if tier != last:
+                reason += f" (decided by the {tier} score)"
+            # Plain floats keep results JSON serializable for the cache.
+            results.append(
+                {
+                    "score": float(scores[index]),
+                    "is_valid": bool(valid[index]),
+                    "cosine_score": self._raw_score(raw, "tfidf", index),
+                    "semantic_score": self._raw_score(raw, "semantic", index),
+                    "keyword_score": self._raw_score(raw, "keyword", index),
+                    "reason": reason,
+                }
+            )
+        return results
+
+    @staticmethod
+    def _raw_score(raw: Dict[str, np.ndarray], name: str, index: int) -> Optional[float]:
+        """A scorer's score for one text: 0.0 if it is disabled, None if the cascade skipped it."""
+        if name not in raw:
+            return 0.0
+        score = float(raw[name][index])
+        return None if math.isnan(score) else score
+
+    def _score(
+        self, query: str, result_text: str, threshold: float
+    ) -> ValidationResult:
+        return self._score_batch(query, [result_text], threshold)[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Fit validation cascade band edges to full-scorer decisions"
+    )
+    parser.add_argument(
+        "--calibrate",
+        required=True,
+        metavar="PAIRS",
+        help='JSONL file of {"query": ..., "text": ...} pairs, e.g. sampled from traffic',
+    )
+    parser.add_argument("--tolerance", type=float, default=VALIDATION_CASCADE_TOLERANCE)
+    args = parser.parse_args()
+
+    by_query: Dict[str, List[str]] = defaultdict(list)
+    for query, text in load_pairs(args.calibrate):
+        by_query[query].append(text)
+    service = SearchValidationService(cascade=False)
+    first = service.cascade_scorers[0].name
+    if first not in SCORE_FIELDS:
+        parser.error(f"The cascade cannot start with {first}; see VALIDATION_SCORERS")
+    results = [
+        result
+        for query, texts in by_query.items()
+        for result in service.validate_batch(query, texts)
+    ]
+
+    low, high = calibrate_cascade_band(results, args.tolerance, first)
+    field = SCORE_FIELDS[first]
+    first_scores = np.array(
+        [result[field] for result in results]  # type: ignore[literal-required]
+    )
+    exits = float(np.mean((first_scores < low) | (first_scores > high))) if results else 0.0
+    print(
+        f"Calibrated {first} band edges on {len(results)} results "
+        f"at {args.tolerance:.1%} tolerance"
+    )
+    print(f"VALIDATION_CASCADE_LOW={low:.4f}")
+    print(f"VALIDATION_CASCADE_HIGH={high:.4f}")
+    print(f"{exits:.1%} of these results would skip the transformers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# src/shared/services/searx_client.py
+
+import logging
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import httpx
+import orjson
+
+from src.shared.config.constants import SEARCH_KEEPALIVE_EXPIRY
+from src.shared.config.constants import SEARCH_LANGUAGE
+from src.shared.config.constants import SEARCH_MAX_CONNECTIONS
+from src.shared.config.constants import SEARCH_TIMEOUT
+from src.shared.config.constants import WEB_SEARCH_URL
+from src.shared.config.types import SearchResult
+from src.shared.services.background_loop import BackgroundLoop
+from src.shared.services.searx_transport import build_transport
+
+
+def project_result(raw: Dict[str, Any]) -> SearchResult:
+    """Keeps only the SearxNG result fields the pipeline uses."""
+    return {
+        "snippet": raw.get("content") or "",
+        "title": raw.get("title") or "",
+        "link": raw.get("url") or "",
+        "engines": list(raw.get("engines") or []),
+        "category": raw.get("category") or "",
+    }
+
+
+class SearxClient:
+    """
+    Native SearxNG JSON API client.
+
+    Requests go through one pooled ``httpx.AsyncClient`` that keeps
+    connections alive between queries. The client lives on a private
+    background loop so blocking and async callers share the same pool.
+    """
+
+    def __init__(
+        self,
+        host: str = WEB_SEARCH_URL,
+        timeout: float = SEARCH_TIMEOUT,
+        max_connections: int = SEARCH_MAX_CONNECTIONS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        loop: Optional[BackgroundLoop] = None,
+    ) -> None:
+        """
+        :param host: The SearxNG search endpoint, e.g. http://localhost:8080/search.
+        :param timeout: Default per-request timeout in seconds.
+        :param max_connections: Size of the keep-alive connection pool.
+        :param transport: Optional httpx transport; defaults to the one selected by
+                          SEARX_TRANSPORT_MODE (live, record or replay).
+        :param loop: Background loop to run requests on; one is created if omitted.
+        """
+        self._host = host
+        self._timeout = timeout
+        self._max_connections = max_connections
+        self._transport = transport if transport is not None else build_transport()
+        self._loop = loop or BackgroundLoop(name="searx-client")
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def host(self) -> str:
+        return self._host
+
+    @property
+    def loop(self) -> BackgroundLoop:
+        return self._loop
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Only ever called on the background loop, so no locking is needed.
+        if self._client is None or self._client.is_closed:
+            limits = httpx.Limits(
+                max_connections=self._max_connections,
+                max_keepalive_connections=self._max_connections,
+                keepalive_expiry=SEARCH_KEEPALIVE_EXPIRY,
+            )
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout, limits=limits, transport=self._transport
+            )
+        return self._client
+
+    def build_params(
+        self, query: str, engines: Optional[List[str]] = None, pageno: int = 1
+    ) -> Dict[str, str]:
+        """Builds the query string for a SearxNG JSON request."""
+        params = {"q": query, "format": "json", "language": SEARCH_LANGUAGE}
+        if engines:
+            params["engines"] = ",".join(engines)
+        if pageno > 1:
+            params["pageno"] = str(pageno)
+        return params
+
+    async def _request(
+        self,
+        query: str,
+        engines: Optional[List[str]],
+        num_results: int,
+        pageno: int,
+        timeout: Optional[float],
+    ) -> List[SearchResult]:
+        client = self._get_client()
+        response = await client.get(
+            self._host,
+            params=self.build_params(query, engines, pageno),
+            timeout=timeout if timeout is not None else self._timeout,
+        )
+        response.raise_for_status()
+        payload = orjson.loads(response.content)
+        raw_results: List[Dict[str, Any]] = payload.get("results") or []
+        if not raw_results:
+            logging.info(f"No search results returned for query: {query}")
+        return [project_result(raw) for raw in raw_results[:num_results]]
+
+    def search(
+        self,
+        query: str,
+        engines: Optional[List[str]] = None,
+        num_results: int = 3,
+        pageno: int = 1,
+        timeout: Optional[float] = None,
+    ) -> List[SearchResult]:
+        """Runs a blocking search and returns at most ``num_results`` results."""
+        return self._loop.run(
+            self._request(query, engines, num_results, pageno, timeout)
+        )
+
+    async def asearch(
+        self,
+        query: str,
+        engines: Optional[List[str]] = None,
+        num_results: int = 3,
+        pageno: int = 1,
+        timeout: Optional[float] = None,
+    ) -> List[SearchResult]:
+        """Async variant of ``search`` that can be awaited from any event loop."""
+        return await self._loop.run_async(
+            self._request(query, engines, num_results, pageno, timeout)
+        )
+
+    async def _aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def close(self) -> None:
+        """Closes pooled connections and stops the background loop."""
+        if self._client is not None:
+            self._loop.run(self._aclose())
+        self._loop.stop()
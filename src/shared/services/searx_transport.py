@@ -0,0 +1,253 @@
+# src/shared/services/searx_transport.py
+
+import argparse
+import asyncio
+import gzip
+import logging
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TypedDict
+from urllib.parse import parse_qsl
+from urllib.parse import urlsplit
+
+import httpx
+import orjson
+
+from src.shared.config.constants import SEARX_CORPUS_PATH
+from src.shared.config.constants import SEARX_REPLAY_LATENCY
+from src.shared.config.constants import SEARX_TRANSPORT_MODE
+
+LATENCY_MODES = ("none", "recorded", "sampled")
+
+
+class RecordedResponse(TypedDict):
+    key: str
+    status: int
+    content_type: str
+    body: str
+    latency: float
+
+
+def request_key(path: str, params: Iterable[Tuple[str, str]]) -> str:
+    """Identifies a SearxNG request by its path and sorted query parameters."""
+    query = "&".join(f"{name}={value}" for name, value in sorted(params))
+    return f"{path}?{query}"
+
+
+class SearxCorpus:
+    """
+    Recorded SearxNG responses stored as gzipped JSON lines.
+
+    Several recordings of the same request are replayed round-robin, and
+    all recorded latencies form the distribution for sampled replay.
+    """
+
+    def __init__(self, path: str = SEARX_CORPUS_PATH) -> None:
+        self._path = path
+        self._entries: Dict[str, List[RecordedResponse]] = defaultdict(list)
+        self._cursor: Dict[str, int] = defaultdict(int)
+        self._latencies: List[float] = []
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            self._load()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def _load(self) -> None:
+        with gzip.open(self._path, "rb") as corpus_file:
+            for line in corpus_file:
+                if line.strip():
+                    self._index(orjson.loads(line))
+
+    def _index(self, entry: RecordedResponse) -> None:
+        self._entries[entry["key"]].append(entry)
+        self._latencies.append(entry["latency"])
+
+    def add(self, entry: RecordedResponse) -> None:
+        """Appends a recording to memory and to the corpus file."""
+        with self._lock:
+            self._index(entry)
+            directory = os.path.dirname(os.path.abspath(self._path))
+            os.makedirs(directory, exist_ok=True)
+            # Appending gzip members keeps the file a valid gzip stream.
+            with gzip.open(self._path, "ab") as corpus_file:
+                corpus_file.write(orjson.dumps(entry) + b"\n")
+
+    def lookup(self, key: str) -> Optional[RecordedResponse]:
+        """Returns the next recording for key, cycling through repeats."""
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            index = self._cursor[key] % len(entries)
+            self._cursor[key] += 1
+            return entries[index]
+
+    def sample_latency(self) -> float:
+        """Draws a latency from everything recorded in the corpus."""
+        with self._lock:
+            return random.choice(self._latencies) if self._latencies else 0.0
+
+    def replay_delay(self, entry: RecordedResponse, latency: str) -> float:
+        """Returns how long to wait before serving entry under the given latency mode."""
+        if latency == "recorded":
+            return entry["latency"]
+        if latency == "sampled":
+            return self.sample_latency()
+        return 0.0
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Forwards requests to a live SearxNG instance and records every response."""
+
+    def __init__(
+        self, corpus: SearxCorpus, inner: Optional[httpx.AsyncBaseTransport] = None
+    ) -> None:
+        self._corpus = corpus
+        self._inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self._inner.handle_async_request(request)
+        body = await response.aread()
+        await response.aclose()
+        latency = time.perf_counter() - started
+
+        content_type = response.headers.get("content-type", "application/json")
+        self._corpus.add(
+            {
+                "key": request_key(request.url.path, request.url.params.multi_items()),
+                "status": response.status_code,
+                "content_type": content_type,
+                "body": body.decode("utf-8", errors="replace"),
+                "latency": latency,
+            }
+        )
+        return httpx.Response(
+            response.status_code,
+            headers={"content-type": content_type},
+            content=body,
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Serves recorded responses in-process; unknown requests get a 404."""
+
+    def __init__(self, corpus: SearxCorpus, latency: str = "none") -> None:
+        if latency not in LATENCY_MODES:
+            raise ValueError(f"Unsupported replay latency mode: {latency}")
+        self._corpus = corpus
+        self._latency = latency
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request.url.path, request.url.params.multi_items())
+        entry = self._corpus.lookup(key)
+        if entry is None:
+            logging.warning(f"No recorded SearxNG response for request: {key}")
+            return httpx.Response(404, request=request)
+        delay = self._corpus.replay_delay(entry, self._latency)
+        if delay:
+            await asyncio.sleep(delay)
+        return httpx.Response(
+            entry["status"],
+            headers={"content-type": entry["content_type"]},
+            content=entry["body"].encode("utf-8"),
+            request=request,
+        )
+
+
+def build_transport(
+    mode: str = SEARX_TRANSPORT_MODE,
+    corpus_path: str = SEARX_CORPUS_PATH,
+    latency: str = SEARX_REPLAY_LATENCY,
+) -> Optional[httpx.AsyncBaseTransport]:
+    """
+    Builds the SearxNG transport for the configured mode.
+
+    "live" returns None (plain httpx networking), "record" captures live
+    responses into the corpus and "replay" serves them back.
+    """
+    if mode == "live":
+        return None
+    if mode == "record":
+        return RecordingTransport(SearxCorpus(corpus_path))
+    if mode == "replay":
+        return ReplayTransport(SearxCorpus(corpus_path), latency=latency)
+    raise ValueError(f"Unsupported SearxNG transport mode: {mode}")
+
+
+def create_stub_server(
+    corpus: SearxCorpus, host: str = "127.0.0.1", port: int = 8080, latency: str = "none"
+) -> ThreadingHTTPServer:
+    """
+    Creates a local HTTP server that answers /search?format=json from the corpus.
+
+    Call serve_forever() on the result (or run it on a thread) and point
+    WEB_SEARCH_URL at it.
+    """
+    if latency not in LATENCY_MODES:
+        raise ValueError(f"Unsupported replay latency mode: {latency}")
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            parts = urlsplit(self.path)
+            entry = corpus.lookup(request_key(parts.path, parse_qsl(parts.query)))
+            if entry is None:
+                self.send_error(404, "No recorded response")
+                return
+            delay = corpus.replay_delay(entry, latency)
+            if delay:
+                time.sleep(delay)
+            body = entry["body"].encode("utf-8")
+            self.send_response(entry["status"])
+            self.send_header("Content-Type", entry["content_type"])
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            logging.debug(format % args)
+
+    return ThreadingHTTPServer((host, port), StubHandler)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a recorded SearxNG corpus")
+    parser.add_argument("--corpus", default=SEARX_CORPUS_PATH)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", choices=LATENCY_MODES, default="none")
+    args = parser.parse_args()
+
+    corpus = SearxCorpus(args.corpus)
+    server = create_stub_server(corpus, args.host, args.port, args.latency)
+    print(f"Serving {len(corpus)} recorded responses on http://{args.host}:{args.port}/search")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
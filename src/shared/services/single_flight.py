@@ -0,0 +1,112 @@
+# src/shared/services/single_flight.py
+
+import asyncio
+import copy
+import threading
+from concurrent.futures import Future
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Generic
+from typing import Hashable
+from typing import Tuple
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Collapses concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight block and receive a deep copy of its result, or the same
+    exception, so no caller can mutate what another one holds. Nothing is
+    cached: once the call finishes the next caller runs it again.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, "Future[T]"] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Runs fn, or joins the in-flight call already running for key."""
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if call is None:
+                call = Future()
+                self._calls[key] = call
+
+        if not is_leader:
+            return copy.deepcopy(call.result())
+
+        try:
+            result = fn()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        """Returns the number of keys currently being computed."""
+        with self._lock:
+            return len(self._calls)
+
+
+class _AsyncFlight(Generic[T]):
+    def __init__(self, task: "asyncio.Task[T]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncSingleFlight(Generic[T]):
+    """
+    Async variant of SingleFlight.
+
+    The shared computation runs as its own task, and every waiter gets its
+    own deep copy of the result. A cancelled waiter only stops waiting; the
+    task itself is cancelled once every waiter is gone.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Tuple[int, Hashable], _AsyncFlight[T]] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Awaits fn(), or joins the in-flight call already running for key."""
+        # Tasks belong to one loop, so flights are never shared across loops.
+        flight_key = (id(asyncio.get_running_loop()), key)
+        flight = self._flights.get(flight_key)
+        if flight is None:
+
+            async def run() -> T:
+                return await fn()
+
+            flight = _AsyncFlight(asyncio.ensure_future(run()))
+            self._flights[flight_key] = flight
+
+            def forget(task: "asyncio.Task[T]") -> None:
+                current = self._flights.get(flight_key)
+                if current is not None and current.task is task:
+                    del self._flights[flight_key]
+
+            flight.task.add_done_callback(forget)
+
+        flight.waiters += 1
+        try:
+            return copy.deepcopy(await asyncio.shield(flight.task))
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def in_flight(self) -> int:
+        """Returns the number of keys currently being computed."""
+        return len(self._flights)
@@ -0,0 +1,13 @@
+# src/shared/services/synthetic_text.py
+
+import random
+from typing import List
+
+from src.shared.services.text_encoder import PARITY_FIXTURES
+
+
+def synthetic_snippets(count: int = 256, seed: int = 0) -> List[str]:
+    """Generates search-snippet-like texts of 5 to 60 words, the same on every run."""
+    words = sorted({word for pair in PARITY_FIXTURES for text in pair for word in text.split()})
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(words, k=rng.randint(5, 60))) for _ in range(count)]
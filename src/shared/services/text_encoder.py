@@ -0,0 +1,201 @@
+# src/shared/services/text_encoder.py
+
+import argparse
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import TypedDict
+
+import numpy as np
+import orjson
+import torch
+from sentence_transformers import SentenceTransformer
+
+from src.shared.config.constants import ENCODER_BACKEND
+from src.shared.config.constants import ENCODER_EXPORT_PATH
+from src.shared.config.constants import ENCODER_QUANTIZATION
+from src.shared.config.constants import KEYWORD_MODEL_NAME
+from src.shared.config.constants import SEMANTIC_MODEL_NAME
+
+# "torch" is the reference; the others trade a little accuracy for CPU speed.
+ENCODER_BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9._-]+")
+
+# (query, snippet) pairs spanning clearly relevant to clearly unrelated
+PARITY_FIXTURES: List[Tuple[str, str]] = [
+    ("giants schedule germany", "The Giants face the Panthers in Munich, Germany on November 10."),
+    ("giants schedule germany", "Full 2024 New York Giants schedule with dates, times and TV channels."),
+    ("giants schedule germany", "Germany's rail network publishes its winter timetable in December."),
+    ("best restaurants in tokyo", "Top-rated sushi, ramen and izakaya spots across Tokyo neighbourhoods."),
+    ("best restaurants in tokyo", "Tokyo Tower is 333 metres tall and was completed in 1958."),
+    ("best restaurants in tokyo", "How to repot a houseplant without damaging its roots."),
+    ("python asyncio timeout", "asyncio.wait_for cancels the awaitable if the timeout expires."),
+    ("python asyncio timeout", "Pythons are non-venomous snakes found in Africa, Asia and Australia."),
+    ("eiffel tower height", "The Eiffel Tower is 330 metres tall and stands on the Champ de Mars."),
+    ("eiffel tower height", "Paris hosts the Summer Olympics for the third time in 2024."),
+    ("symptoms of vitamin d deficiency", "Fatigue, bone pain and muscle weakness can signal low vitamin D."),
+    ("symptoms of vitamin d deficiency", "Quarterly earnings beat analyst expectations on strong cloud sales."),
+]
+
+
+class ParityReport(TypedDict):
+    model: str
+    backend: str
+    pairs: int
+    max_drift: float
+    mean_drift: float
+    baseline_texts_per_sec: float
+    texts_per_sec: float
+
+
+def _export_dir(model_name: str) -> str:
+    return os.path.join(ENCODER_EXPORT_PATH, _UNSAFE_NAME.sub("_", model_name))
+
+
+def _load_onnx_int8(model_name: str) -> SentenceTransformer:
+    # Needs sentence-transformers[onnx] 3.2 or later, so only the ONNX backends import it.
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    # Quantized weights are exported once per model and CPU instruction set.
+    path = _export_dir(model_name)
+    file_name = f"onnx/model_qint8_{ENCODER_QUANTIZATION}.onnx"
+    if not os.path.exists(os.path.join(path, file_name)):
+        logging.info(f"Exporting int8 ONNX model for {model_name} to {path}")
+        model = SentenceTransformer(model_name, device="cpu", backend="onnx")
+        model.save_pretrained(path)
+        export_dynamic_quantized_onnx_model(model, ENCODER_QUANTIZATION, path)
+    return SentenceTransformer(
+        path, device="cpu", backend="onnx", model_kwargs={"file_name": file_name}
+    )
+
+
+def load_encoder(model_name: str, backend: str = ENCODER_BACKEND) -> SentenceTransformer:
+    """
+    Loads a sentence-transformer model on the given inference backend.
+
+    :param model_name: Hugging Face model name, e.g. all-MiniLM-L6-v2.
+    :param backend: "torch", "torch-int8" (dynamically quantized Linear layers),
+                    "onnx" or "onnx-int8" (ONNX Runtime; needs
+                    sentence-transformers[onnx]).
+    """
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+    if backend == "torch-int8":
+        model = SentenceTransformer(model_name, device="cpu")
+        quantized: SentenceTransformer = torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        return quantized
+    if backend == "onnx":
+        return SentenceTransformer(model_name, device="cpu", backend="onnx")
+    if backend == "onnx-int8":
+        return _load_onnx_int8(model_name)
+    raise ValueError(
+        f"Unknown encoder backend: {backend}; expected one of {', '.join(ENCODER_BACKENDS)}"
+    )
+
+
+def encoder_id(model_name: str, backend: str = ENCODER_BACKEND) -> str:
+    """Names a model on a backend, e.g. for embedding cache keys; torch keeps the plain name."""
+    return model_name if backend == "torch" else f"{model_name}@{backend}"
+
+
+_encoders: Dict[Tuple[str, str], SentenceTransformer] = {}
+_encoders_lock = threading.Lock()
+
+
+def get_encoder(model_name: str, backend: str = ENCODER_BACKEND) -> SentenceTransformer:
+    """Returns the process-wide encoder for model_name, loading it on first use."""
+    with _encoders_lock:
+        key = (model_name, backend)
+        if key not in _encoders:
+            _encoders[key] = load_encoder(model_name, backend)
+        return _encoders[key]
+
+
+def pair_similarities(
+    model: SentenceTransformer, pairs: List[Tuple[str, str]]
+) -> np.ndarray:
+    """Cosine similarity of every (query, text) pair under model."""
+    queries = model.encode([query for query, _ in pairs], normalize_embeddings=True)
+    texts = model.encode([text for _, text in pairs], normalize_embeddings=True)
+    return np.sum(np.asarray(queries) * np.asarray(texts), axis=1).astype(float)
+
+
+def _throughput(model: SentenceTransformer, texts: List[str], rounds: int = 3) -> float:
+    model.encode(texts)  # warm up
+    started = time.perf_counter()
+    for _ in range(rounds):
+        model.encode(texts)
+    return rounds * len(texts) / (time.perf_counter() - started)
+
+
+def parity_report(
+    model_name: str,
+    backend: str,
+    pairs: List[Tuple[str, str]] = PARITY_FIXTURES,
+    baseline: str = "torch",
+) -> ParityReport:
+    """
+    Compares a backend against the baseline on (query, text) pairs.
+
+    Drift is the absolute difference in pair similarity, the quantity the
+    validation scores are built on.
+    """
+    reference = load_encoder(model_name, baseline)
+    candidate = load_encoder(model_name, backend)
+    drift = np.abs(
+        pair_similarities(candidate, pairs) - pair_similarities(reference, pairs)
+    )
+    texts = [text for pair in pairs for text in pair]
+    return {
+        "model": model_name,
+        "backend": backend,
+        "pairs": len(pairs),
+        "max_drift": float(drift.max()),
+        "mean_drift": float(drift.mean()),
+        "baseline_texts_per_sec": _throughput(reference, texts),
+        "texts_per_sec": _throughput(candidate, texts),
+    }
+
+
+def load_pairs(path: str) -> List[Tuple[str, str]]:
+    """Reads (query, text) pairs from a JSONL file of {"query": ..., "text": ...} lines."""
+    with open(path, "rb") as pairs_file:
+        entries = [orjson.loads(line) for line in pairs_file if line.strip()]
+    return [(entry["query"], entry["text"]) for entry in entries]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Report score drift and throughput of encoder backends against PyTorch"
+    )
+    parser.add_argument(
+        "--backend", choices=ENCODER_BACKENDS[1:], action="append", dest="backends"
+    )
+    parser.add_argument("--model", action="append", dest="models")
+    parser.add_argument(
+        "--pairs", help='JSONL file of {"query": ..., "text": ...} pairs to compare on'
+    )
+    args = parser.parse_args()
+
+    pairs = load_pairs(args.pairs) if args.pairs else PARITY_FIXTURES
+    for model_name in args.models or [SEMANTIC_MODEL_NAME, KEYWORD_MODEL_NAME]:
+        for backend in args.backends or ENCODER_BACKENDS[1:]:
+            report = parity_report(model_name, backend, pairs)
+            speedup = report["texts_per_sec"] / report["baseline_texts_per_sec"]
+            print(
+                f"{model_name} [{backend}]: max drift {report['max_drift']:.4f}, "
+                f"mean drift {report['mean_drift']:.4f} over {report['pairs']} pairs; "
+                f"{report['texts_per_sec']:.0f} texts/s ({speedup:.1f}x torch)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# src/shared/services/text_relevance.py
+
+import argparse
+import random
+import time
+from difflib import SequenceMatcher
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Sequence
+from typing import Tuple
+from typing import TypedDict
+
+import numpy as np
+import orjson
+from scipy.stats import spearmanr
+
+from src.shared.config.constants import SUMMARY_RELEVANCE_METRIC
+from src.shared.config.constants import SUMMARY_RELEVANCE_SHINGLE_SIZE
+from src.shared.services.result_dedup import shingles
+from src.shared.services.result_dedup import tokenize
+from src.shared.services.synthetic_text import synthetic_snippets
+
+
+class RelevanceTiming(TypedDict):
+    chars: int
+    sequence_seconds: float
+    shingle_seconds: float
+
+
+class RelevanceCorrelation(TypedDict):
+    pairs: int
+    pearson: float
+    spearman: float
+    sequence_mean: float
+    shingle_mean: float
+
+
+def sequence_relevance(summary: str, original_text: str) -> float:
+    """difflib's ratio over the raw strings; quadratic in the worst case."""
+    return SequenceMatcher(None, summary, original_text).ratio()
+
+
+def shingle_relevance(
+    summary: str, original_text: str, size: int = SUMMARY_RELEVANCE_SHINGLE_SIZE
+) -> float:
+    """
+    Dice coefficient of the two texts' hashed word shingles.
+
+    Like SequenceMatcher's ratio (2 * matches / total length) it rewards
+    shared runs of words relative to both lengths, but costs one pass over
+    each text.
+    """
+    summary_shingles = shingles(tokenize(summary), size)
+    original_shingles = shingles(tokenize(original_text), size)
+    total = len(summary_shingles) + len(original_shingles)
+    if not total:
+        return 1.0
+    return 2 * len(summary_shingles & original_shingles) / total
+
+
+RELEVANCE_METRICS: Dict[str, Callable[[str, str], float]] = {
+    "shingle": shingle_relevance,
+    "sequence": sequence_relevance,
+}
+
+
+def relevance_metric(name: str = SUMMARY_RELEVANCE_METRIC) -> Callable[[str, str], float]:
+    """Looks up a summary relevance metric by name."""
+    try:
+        return RELEVANCE_METRICS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown relevance metric: {name}; expected one of {', '.join(RELEVANCE_METRICS)}"
+        ) from None
+
+
+def synthetic_pairs(
+    count: int = 200, seed: int = 0, snippets_per_text: Tuple[int, int] = (2, 12)
+) -> List[Tuple[str, str]]:
+    """
+    Builds (summary, original text) pairs from synthetic snippets.
+
+    Each summary copies runs of words from its original text and mixes in
+    unrelated runs and substituted words at random rates, so pairs span
+    close extracts to unrelated text.
+    """
+    rng = random.Random(seed)
+    snippets = synthetic_snippets(count=400, seed=seed)
+    pairs = []
+    for _ in range(count):
+        words = " ".join(rng.sample(snippets, rng.randint(*snippets_per_text))).split()
+        copied, noise = rng.random(), rng.random() * 0.3
+        summary: List[str] = []
+        while len(summary) < max(20, len(words) // 7):
+            if rng.random() < copied:
+                start = rng.randrange(len(words))
+                summary += words[start : start + rng.randint(3, 12)]
+            else:
+                summary += rng.choice(snippets).split()[: rng.randint(3, 12)]
+        summary = [
+            rng.choice(words) if rng.random() < noise else word for word in summary
+        ]
+        pairs.append((" ".join(summary), " ".join(words)))
+    return pairs
+
+
+def correlation_report(pairs: List[Tuple[str, str]]) -> RelevanceCorrelation:
+    """How closely shingle_relevance tracks sequence_relevance on the pairs."""
+    sequence = np.array([sequence_relevance(summary, text) for summary, text in pairs])
+    shingle = np.array([shingle_relevance(summary, text) for summary, text in pairs])
+    return {
+        "pairs": len(pairs),
+        "pearson": float(np.corrcoef(sequence, shingle)[0, 1]),
+        "spearman": float(spearmanr(sequence, shingle)[0]),
+        "sequence_mean": float(sequence.mean()),
+        "shingle_mean": float(shingle.mean()),
+    }
+
+
+def benchmark_lengths(
+    lengths: Sequence[int] = (2_000, 8_000, 32_000), seed: int = 0
+) -> List[RelevanceTiming]:
+    """Times both metrics on original texts of about each length, with 15% summaries."""
+    rng = random.Random(seed)
+    snippets = synthetic_snippets(count=400, seed=seed)
+    timings: List[RelevanceTiming] = []
+    for length in lengths:
+        original = ""
+        while len(original) < length:
+            original += rng.choice(snippets) + " "
+        words = original.split()
+        start = rng.randrange(len(words) // 2)
+        summary = " ".join(words[start : start + len(words) * 15 // 100])
+
+        started = time.perf_counter()
+        sequence_relevance(summary, original)
+        sequence_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        shingle_relevance(summary, original)
+        timings.append(
+            {
+                "chars": len(original),
+                "sequence_seconds": sequence_seconds,
+                "shingle_seconds": time.perf_counter() - started,
+            }
+        )
+    return timings
+
+
+def load_summary_pairs(path: str) -> List[Tuple[str, str]]:
+    """Reads pairs from a JSONL file of {"summary": ..., "original_text": ...} lines."""
+    with open(path, "rb") as pairs_file:
+        entries = [orjson.loads(line) for line in pairs_file if line.strip()]
+    return [(entry["summary"], entry["original_text"]) for entry in entries]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare the shingle relevance metric with SequenceMatcher"
+    )
+    parser.add_argument(
+        "--pairs",
+        help='JSONL file of {"summary": ..., "original_text": ...} pairs to correlate on',
+    )
+    parser.add_argument(
+        "--length", type=int, action="append", dest="lengths", help="Original text chars"
+    )
+    args = parser.parse_args()
+
+    for timing in benchmark_lengths(args.lengths or (2_000, 8_000, 32_000)):
+        speedup = timing["sequence_seconds"] / max(timing["shingle_seconds"], 1e-9)
+        print(
+            f"{timing['chars']} chars: sequence {timing['sequence_seconds'] * 1000:.1f} ms, "
+            f"shingle {timing['shingle_seconds'] * 1000:.1f} ms ({speedup:.0f}x)"
+        )
+    report = correlation_report(
+        load_summary_pairs(args.pairs) if args.pairs else synthetic_pairs()
+    )
+    print(
+        f"Correlation over {report['pairs']} pairs: Pearson {report['pearson']:.3f}, "
+        f"Spearman {report['spearman']:.3f}; mean score sequence "
+        f"{report['sequence_mean']:.3f}, shingle {report['shingle_mean']:.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
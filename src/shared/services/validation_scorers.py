@@ -0,0 +1,145 @@
+# src/shared/services/validation_scorers.py
+
+from abc import ABC
+from abc import abstractmethod
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import TypedDict
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+if TYPE_CHECKING:
+    from src.shared.services.search_validation_service import SearchValidationService
+
+# Cost classes, cheapest first; the validation cascade runs scorers in this order.
+COST_CLASSES = ("cheap", "moderate", "expensive")
+
+
+class ScorerStats(TypedDict):
+    calls: int
+    texts: int
+    seconds: float
+
+
+class Scorer(ABC):
+    """
+    A validation signal: scores a batch of result texts against one query.
+
+    Subclasses set a name, a cost class and the range their scores fall in
+    (the cascade relies on those bounds to stop early), and implement score.
+    """
+
+    name: str = ""
+    cost: str = "cheap"
+    bounds: Tuple[float, float] = (0.0, 1.0)
+
+    @abstractmethod
+    def score(self, query: str, texts: List[str]) -> np.ndarray:
+        """Returns one score per text."""
+
+
+class MethodScorer(Scorer):
+    """Scorer backed by a batched scoring function, e.g. a service method."""
+
+    def __init__(
+        self,
+        name: str,
+        cost: str,
+        bounds: Tuple[float, float],
+        score: Callable[[str, List[str]], np.ndarray],
+    ) -> None:
+        self.name = name
+        self.cost = cost
+        self.bounds = bounds
+        self._score = score
+
+    def score(self, query: str, texts: List[str]) -> np.ndarray:
+        return self._score(query, texts)
+
+
+class QueryCoverageScorer(Scorer):
+    """Fraction of the query's words that appear in each text; no model needed."""
+
+    name = "query_coverage"
+    cost = "cheap"
+
+    def __init__(self) -> None:
+        self._analyzer = CountVectorizer().build_analyzer()
+
+    def score(self, query: str, texts: List[str]) -> np.ndarray:
+        query_words = set(self._analyzer(query))
+        if not query_words:
+            return np.ones(len(texts))
+        return np.array(
+            [len(query_words & set(self._analyzer(text))) / len(query_words) for text in texts],
+            dtype=float,
+        )
+
+
+ScorerFactory = Callable[["SearchValidationService"], Scorer]
+
+# Scorer factories by name; each gets the service it scores for, so model
+# based scorers can share its models and caches.
+SCORERS: Dict[str, ScorerFactory] = {}
+
+
+def register_scorer(name: str) -> Callable[[ScorerFactory], ScorerFactory]:
+    """Registers a scorer factory under name, for use in VALIDATION_SCORERS."""
+
+    def decorator(factory: ScorerFactory) -> ScorerFactory:
+        SCORERS[name] = factory
+        return factory
+
+    return decorator
+
+
+# The built-in scorers. Those backed by service methods look the method up
+# on each call, so overrides on a service instance apply.
+register_scorer("tfidf")(
+    lambda service: MethodScorer(
+        "tfidf",
+        "cheap",
+        (0.0, 1.0),
+        lambda query, texts: service.cosine_similarity_scores(query, texts),
+    )
+)
+register_scorer("semantic")(
+    lambda service: MethodScorer(
+        "semantic",
+        "moderate",
+        (-1.0, 1.0),
+        lambda query, texts: service.semantic_similarity_scores(query, texts),
+    )
+)
+register_scorer("keyword")(
+    lambda service: MethodScorer(
+        "keyword",
+        "expensive",
+        (0.0, 1.0),
+        lambda query, texts: service.keyword_coverage_scores(query, texts),
+    )
+)
+register_scorer("query_coverage")(lambda service: QueryCoverageScorer())
+
+
+def parse_scorer_weights(spec: str) -> Dict[str, float]:
+    """
+    Parses "name:weight,name:weight" into weights by scorer name, in order.
+
+    Raises ValueError for malformed entries and negative or all-zero weights.
+    """
+    weights: Dict[str, float] = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        name, separator, weight = entry.partition(":")
+        if not separator:
+            raise ValueError(f"Expected name:weight in scorer spec, got {entry!r}")
+        weights[name.strip()] = float(weight)
+    if any(weight < 0 for weight in weights.values()) or sum(weights.values()) <= 0:
+        raise ValueError(f"Scorer weights must be non-negative and not all zero: {spec!r}")
+    return weights
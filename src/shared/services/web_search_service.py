@@ -1,18 +1,48 @@
 # services/web_search_service.py
 
 import logging
+from typing import Any
+from typing import AsyncIterator
+from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
+from typing import Set
 
+from src.shared.config.constants import SEARCH_ENGINES
 from src.shared.config.constants import WEB_SEARCH_URL
+from src.shared.services.engine_stats import EngineSelector
+from src.shared.services.engine_stats import EngineStats
+from src.shared.services.query_fingerprint import query_fingerprint
+from src.shared.services.query_log import QUERY_LOG_MARKER
+from src.shared.services.query_log import REFRESH_LOG_MARKER
+from src.shared.services.search_cache import SearchCache
+from src.shared.services.search_cache import is_refreshing
+from src.shared.services.search_engine_service import ResultMerger
 from src.shared.services.search_engine_service import SearchEngineService
+from src.shared.services.single_flight import AsyncSingleFlight
 
 from src.shared.config.types import SearchResult
 
 
 class WebSearchService:
-    def __init__(self, web_search_url: str = WEB_SEARCH_URL) -> None:
+    def __init__(
+        self,
+        web_search_url: str = WEB_SEARCH_URL,
+        cache: Optional[SearchCache] = None,
+        engine_stats: Optional[EngineStats] = None,
+    ) -> None:
         self.web_search_url = web_search_url
-        self.se_service = SearchEngineService(host=web_search_url, engines=["brave"])
+        self.engine_stats = engine_stats or EngineStats()
+        self.se_service = SearchEngineService(
+            host=web_search_url, engines=SEARCH_ENGINES, stats=self.engine_stats
+        )
+        # Engines are picked per query from the SEARCH_ENGINES pool
+        self.engine_selector = EngineSelector(SEARCH_ENGINES, self.engine_stats)
+        self.cache = cache
+        self._search_flight: AsyncSingleFlight[List[SearchResult]] = (
+            AsyncSingleFlight()
+        )
 
     def sanitize_input(self, user_input: str) -> str:
         """Sanitizes user input by stripping whitespace and converting to lowercase."""
@@ -23,9 +53,191 @@ class WebSearchService:
         sanitized_input = self.sanitize_input(user_input)
         return sanitized_input
 
-    def fetch_results(self, search_term: str) -> List[SearchResult]:
-        """Fetches search results for a given search term using the search engine service."""
-        logging.info(f"Executing search query: {search_term}")
+    def cache_key(
+        self, search_term: str, page: int = 1, num_results: Optional[int] = None
+    ) -> str:
+        """
+        Builds the result cache key for a sanitized search term.
+
+        The term is fingerprinted so equivalent phrasings share an entry, and
+        the key uses the whole engine pool rather than the per-query
+        selection, so adaptive selection does not fragment the cache.
+        """
+        return SearchCache.make_key(
+            query_fingerprint(search_term),
+            self.se_service.engines,
+            num_results or self.se_service.num_results,
+            page,
+        )
+
+    @staticmethod
+    def _log_query(search_term: str) -> None:
+        marker = REFRESH_LOG_MARKER if is_refreshing() else QUERY_LOG_MARKER
+        logging.info(f"{marker}{search_term}")
+
+    def _cached_results(
+        self, search_term: str, page: int, num_results: Optional[int]
+    ) -> Optional[List[SearchResult]]:
+        if self.cache is None:
+            return None
+        cached: Optional[List[SearchResult]] = self.cache.get(
+            self.cache_key(search_term, page, num_results)
+        )
+        if cached is not None:
+            logging.info(f"Search cache hit: {search_term}")
+        return cached
+
+    def _store_results(
+        self,
+        search_term: str,
+        page: int,
+        num_results: Optional[int],
+        results: List[SearchResult],
+    ) -> None:
+        # Empty responses are usually transient upstream failures; don't pin them.
+        if self.cache is not None and results:
+            self.cache.set(self.cache_key(search_term, page, num_results), results)
+
+    def fetch_results(
+        self, search_term: str, page: int = 1, num_results: Optional[int] = None
+    ) -> List[SearchResult]:
+        """
+        Fetches search results for a given search term using the search engine service.
+        :param page: SearxNG result page to fetch.
+        :param num_results: Results to return instead of the service default.
+        """
+        self._log_query(search_term)
+        cached = self._cached_results(search_term, page, num_results)
+        if cached is not None:
+            return cached
         # Use the search service to run the search query
-        results: List[SearchResult] = self.se_service.run(search_term)
+        results: List[SearchResult] = self.se_service.run(
+            search_term,
+            engines=self.engine_selector.select(),
+            pageno=page,
+            num_results=num_results,
+        )
+        self._store_results(search_term, page, num_results, results)
         return results
+
+    async def afetch_results(
+        self, search_term: str, page: int = 1, num_results: Optional[int] = None
+    ) -> List[SearchResult]:
+        """Async variant of fetch_results."""
+        self._log_query(search_term)
+        cached = self._cached_results(search_term, page, num_results)
+        if cached is not None:
+            return cached
+
+        async def fetch() -> List[SearchResult]:
+            results: List[SearchResult] = await self.se_service.arun(
+                search_term,
+                engines=self.engine_selector.select(),
+                pageno=page,
+                num_results=num_results,
+            )
+            self._store_results(search_term, page, num_results, results)
+            return results
+
+        # Identical concurrent searches share one upstream request
+        return await self._search_flight.do(
+            self.cache_key(search_term, page, num_results), fetch
+        )
+
+    def ranked_results(
+        self, merger: ResultMerger, num_results: Optional[int] = None
+    ) -> List[SearchResult]:
+        """Returns the merged results fetch_results would return: the best num_results."""
+        return merger.ranked()[: num_results or self.se_service.num_results]
+
+    def stream_results(
+        self,
+        search_term: str,
+        page: int = 1,
+        num_results: Optional[int] = None,
+        merger: Optional[ResultMerger] = None,
+    ) -> Iterator[SearchResult]:
+        """
+        Yields search results as engines answer; cache hits are yielded at once.
+
+        Results arrive unranked. Once every engine is done, results that
+        made ranked_results but arrived after num_results were streamed
+        follow, and ranked_results is cached, as fetch_results caches it.
+        Streamed results missing from ranked_results were outranked.
+
+        :param merger: Collects the ranking of the results streamed from the engines;
+                       it stays empty for cache hits, which are stored ranked.
+        """
+        self._log_query(search_term)
+        cached = self._cached_results(search_term, page, num_results)
+        if cached is not None:
+            yield from cached
+            return
+        merger = ResultMerger() if merger is None else merger
+        streamed: Set[int] = set()
+        for result in self.se_service.iter_results(
+            search_term,
+            engines=self.engine_selector.select(),
+            pageno=page,
+            num_results=num_results,
+            merger=merger,
+        ):
+            streamed.add(id(result))
+            yield result
+        ranked = self.ranked_results(merger, num_results)
+        for result in ranked:
+            if id(result) not in streamed:
+                yield result
+        # Only complete result sets are cached.
+        self._store_results(search_term, page, num_results, ranked)
+
+    async def astream_results(
+        self,
+        search_term: str,
+        page: int = 1,
+        num_results: Optional[int] = None,
+        merger: Optional[ResultMerger] = None,
+    ) -> AsyncIterator[SearchResult]:
+        """Async variant of stream_results."""
+        self._log_query(search_term)
+        cached = self._cached_results(search_term, page, num_results)
+        if cached is not None:
+            for result in cached:
+                yield result
+            return
+        merger = ResultMerger() if merger is None else merger
+        streamed: Set[int] = set()
+        async for result in self.se_service.aiter_results(
+            search_term,
+            engines=self.engine_selector.select(),
+            pageno=page,
+            num_results=num_results,
+            merger=merger,
+        ):
+            streamed.add(id(result))
+            yield result
+        ranked = self.ranked_results(merger, num_results)
+        for result in ranked:
+            if id(result) not in streamed:
+                yield result
+        self._store_results(search_term, page, num_results, ranked)
+
+    def record_validation(
+        self, search_results: List[SearchResult], validation_results: List[Any]
+    ) -> None:
+        """Feeds validation outcomes back into each contributing engine's pass rate."""
+        for result, validation in zip(search_results, validation_results):
+            is_valid = bool(validation.get("is_valid", False))
+            for engine in result.get("engines", []):
+                self.engine_stats.record_validation(engine, is_valid)
+        self.engine_stats.maybe_save()
+
+    def engine_report(self) -> Dict[str, Dict[str, object]]:
+        """Returns per-engine latency, error rate, pass rate and selection score."""
+        return self.engine_selector.report()
+
+    def close(self) -> None:
+        """Saves engine statistics and releases pooled SearxNG connections."""
+        # maybe_save is throttled, so samples since the last snapshot would be lost
+        self.engine_stats.save()
+        self.se_service.close()
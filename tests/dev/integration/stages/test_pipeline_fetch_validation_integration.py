@@ -39,3 +39,97 @@ def test_fetch_failure(mocker, user_service, caplog):
         user_service, "Test Search Term"
     )  # Ensure it's called with correct arguments
     assert mock_fetch.call_count == 3  # Expecting 3 calls for the retries
+
+
+def page_data(page, valid_flags):
+    return {
+        "search_term": "test search term",
+        "web_results": [f"page {page} snippet {i}" for i in range(len(valid_flags))],
+        "validation_results": [{"is_valid": flag} for flag in valid_flags],
+        "all_results": [
+            {"title": f"{page}-{i}", "link": f"http://example.com/{page}/{i}"}
+            for i in range(len(valid_flags))
+        ],
+    }
+
+
+def paged_fetch(mocker, pages):
+    """Returns the first num_results of a page, minus results the deduplicator saw."""
+    served = []
+
+    def fetch(service, term, page=1, num_results=3, deduplicator=None):
+        data = page_data(page, pages[page][:num_results])
+        if deduplicator is not None:
+            keep = [
+                index
+                for index, result in enumerate(data["all_results"])
+                if deduplicator.add(result) is not None
+            ]
+            for key in ("web_results", "validation_results", "all_results"):
+                data[key] = [data[key][index] for index in keep]
+        served.append(data)
+        return data
+
+    return mocker.Mock(side_effect=fetch), served
+
+
+@pytest.mark.integration
+def test_retry_widens_the_first_page_before_paging(mocker, user_service):
+    mock_fetch, served = paged_fetch(mocker, {1: [False] * 4 + [True] + [False] * 5})
+
+    raw_search_data = retry_with_validation(mock_fetch, user_service, "Test Search Term")
+
+    assert mock_fetch.call_count == 2
+    follow_up = mock_fetch.call_args_list[1]
+    assert follow_up.args == (user_service, "Test Search Term")
+    assert follow_up.kwargs["page"] == 1
+    # Pass rate 1/5 after three misses asks for five more results on page 1
+    assert follow_up.kwargs["num_results"] == 8
+    assert [r["link"] for r in raw_search_data["all_results"]] == [
+        f"http://example.com/1/{i}" for i in range(8)
+    ]
+    assert [v["is_valid"] for v in raw_search_data["validation_results"]] == (
+        [False] * 4 + [True] + [False] * 3
+    )
+    # The first response may be shared with other callers; it stays as served
+    assert len(served[0]["web_results"]) == 3
+
+
+@pytest.mark.integration
+def test_retry_moves_to_the_next_page_once_a_page_is_used_up(mocker, user_service):
+    mock_fetch, _ = paged_fetch(mocker, {1: [False] * 4, 2: [False, True]})
+
+    raw_search_data = retry_with_validation(
+        mock_fetch, user_service, "Test Search Term", max_results=4
+    )
+
+    requests = [
+        (call.kwargs.get("page"), call.kwargs.get("num_results"))
+        for call in mock_fetch.call_args_list
+    ]
+    assert requests == [(None, None), (1, 4), (2, 4)]
+    assert len(raw_search_data["all_results"]) == 6
+    assert raw_search_data["all_results"][-1]["link"] == "http://example.com/2/1"
+
+
+@pytest.mark.integration
+def test_retry_stops_when_target_reached(mocker, user_service):
+    mock_fetch = mocker.Mock(return_value=page_data(1, [True, True]))
+
+    raw_search_data = retry_with_validation(
+        mock_fetch, user_service, "Test Search Term", target_valid=2
+    )
+
+    mock_fetch.assert_called_once_with(user_service, "Test Search Term")
+    assert len(raw_search_data["all_results"]) == 2
+
+
+@pytest.mark.integration
+def test_retry_returns_collected_results_when_pages_run_out(mocker, user_service):
+    mock_fetch, _ = paged_fetch(mocker, {1: [False], 2: []})
+
+    raw_search_data = retry_with_validation(mock_fetch, user_service, "Test Search Term")
+
+    # Page 1 has nothing left to widen into, then page 2 comes back empty
+    assert [c.kwargs.get("page") for c in mock_fetch.call_args_list] == [None, 1, 2]
+    assert raw_search_data["web_results"] == ["page 1 snippet 0"]
@@ -116,3 +116,19 @@ def test_extract_works_cited_invalid_data(caplog):
 
     # Check logs for skipped invalid entry
     assert "Skipping invalid result entry: invalid entry" in caplog.text
+
+
+@pytest.mark.integration
+def test_summarization_reuses_cached_summary(mock_llm_provider):
+    """
+    Test that a summary cache serves repeated text without another LLM call.
+    """
+    from src.shared.services.search_cache import SearchCache
+
+    calls = []
+    mock_llm_provider.summarize_text = lambda text: calls.append(text) or "Cached"
+    cache = SearchCache()
+
+    assert summarize_results(mock_llm_provider, "Repeated text.", cache) == "Cached"
+    assert summarize_results(mock_llm_provider, "Repeated text.", cache) == "Cached"
+    assert calls == ["Repeated text."]
@@ -22,8 +22,18 @@ def user_service(monkeypatch):
 
     # Mock the fetch_results method in WebSearchService to return a fixed response
     monkeypatch.setattr(service.web_search_service, "fetch_results", mock_web_search)
+    monkeypatch.setattr(
+        service.web_search_service,
+        "stream_results",
+        lambda query, **options: iter(mock_web_search(query)),
+    )
     # Mock the validate method in SearchValidationService to always return valid results
     monkeypatch.setattr(service.validation_service, "validate", mock_validate)
+    monkeypatch.setattr(
+        service.validation_service,
+        "validate_batch",
+        lambda search_term, results: [mock_validate(search_term, r) for r in results],
+    )
 
     return service
 
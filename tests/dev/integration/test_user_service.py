@@ -1,5 +1,16 @@
+import asyncio
+import threading
+import time
+
+import httpx
 import pytest
+from unittest.mock import Mock
 from src.features.users.models.user import User
+from src.shared.services.inference_executor import InferenceExecutor
+from src.shared.services.search_cache import SearchCache
+from src.shared.services.search_cache import refreshing
+from src.shared.services.search_validation_service import SearchValidationService
+from src.shared.services.web_search_service import WebSearchService
 
 
 @pytest.fixture
@@ -16,10 +27,19 @@ def mock_user_service(monkeypatch):
         def fetch_results(self, search_term):
             return [{"snippet": "Result 1 snippet"}, {"snippet": "Result 2 snippet"}]
 
+        def stream_results(self, search_term, page=1, num_results=None, merger=None):
+            yield from self.fetch_results(search_term)
+
+        def record_validation(self, search_results, validation_results):
+            pass
+
     class MockSearchValidationService:
         def validate(self, search_term, snippet):
             return snippet == "Result 1 snippet"  # Validate only the first snippet
 
+        def validate_batch(self, search_term, snippets):
+            return [self.validate(search_term, snippet) for snippet in snippets]
+
     # Replace the real services with mocks
     monkeypatch.setattr(
         "src.shared.services.web_search_service.WebSearchService", MockWebSearchService
@@ -73,10 +93,19 @@ def test_user_search_empty_results(monkeypatch):
         def fetch_results(self, search_term):
             return []  # Return no results
 
+        def stream_results(self, search_term, page=1, num_results=None, merger=None):
+            yield from self.fetch_results(search_term)
+
+        def record_validation(self, search_results, validation_results):
+            pass
+
     class MockSearchValidationService:
         def validate(self, search_term, snippet):
             return False
 
+        def validate_batch(self, search_term, snippets):
+            return [self.validate(search_term, snippet) for snippet in snippets]
+
     # Replace the real services with mocks
     monkeypatch.setattr(
         "src.shared.services.web_search_service.WebSearchService", MockWebSearchService
@@ -101,3 +130,244 @@ def test_user_search_empty_results(monkeypatch):
     assert result["search_term"] == "test query", "Search term mismatch."
     assert result["web_results"] == [], "Expected no web results."
     assert result["validation_results"] == [], "Expected no validation results."
+
+
+class SlowWebSearchService:
+    """Mock web search service whose requests take a fixed time."""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+
+    def create_search_term(self, user_input):
+        return user_input.strip().lower()
+
+    def fetch_results(self, search_term):
+        time.sleep(self.delay)
+        return [{"snippet": f"{search_term} snippet"}]
+
+    async def afetch_results(self, search_term):
+        await asyncio.sleep(self.delay)
+        return [{"snippet": f"{search_term} snippet"}]
+
+    def record_validation(self, search_results, validation_results):
+        pass
+
+
+class EchoValidationService:
+    def validate(self, search_term, snippet):
+        return snippet.startswith(search_term)
+
+    def validate_batch(self, search_term, snippets):
+        return [self.validate(search_term, snippet) for snippet in snippets]
+
+
+@pytest.fixture
+def batch_user_service():
+    return User(
+        web_search_service=SlowWebSearchService(),
+        validation_service=EchoValidationService(),
+    )
+
+
+def test_user_search_many_runs_concurrently(batch_user_service):
+    terms = [f"Term {i}" for i in range(8)]
+
+    started = time.monotonic()
+    results = batch_user_service.search_many(terms, max_concurrency=8)
+
+    assert time.monotonic() - started < 0.5, "Searches should overlap."
+    assert [result["search_term"] for result in results] == [t.lower() for t in terms]
+    assert all(result["validation_results"] == [True] for result in results)
+
+
+def test_user_iter_search_many_yields_every_index(batch_user_service):
+    terms = ["a", "b", "c"]
+
+    indexed = dict(batch_user_service.iter_search_many(terms, max_concurrency=2))
+
+    assert sorted(indexed) == [0, 1, 2]
+    assert indexed[1]["web_results"] == ["b snippet"]
+
+
+def test_user_asearch_many_preserves_order(batch_user_service):
+    terms = [f"Term {i}" for i in range(6)]
+
+    results = asyncio.run(batch_user_service.asearch_many(terms, max_concurrency=3))
+
+    assert [result["search_term"] for result in results] == [t.lower() for t in terms]
+
+
+def test_user_search_many_reports_a_failed_term_without_failing_the_batch():
+    class FlakyWebSearchService(SlowWebSearchService):
+        def fetch_results(self, search_term):
+            if search_term == "broken":
+                raise httpx.ConnectError("SearxNG unreachable")
+            return super().fetch_results(search_term)
+
+        async def afetch_results(self, search_term):
+            if search_term == "broken":
+                raise httpx.ConnectError("SearxNG unreachable")
+            return await super().afetch_results(search_term)
+
+    user = User(
+        web_search_service=FlakyWebSearchService(delay=0.01),
+        validation_service=EchoValidationService(),
+    )
+    terms = ["a", "broken", "c"]
+
+    for results in (
+        user.search_many(terms),
+        [response for _, response in sorted(user.iter_search_many(terms))],
+        asyncio.run(user.asearch_many(terms)),
+    ):
+        assert [result["web_results"] for result in results] == [
+            ["a snippet"],
+            [],
+            ["c snippet"],
+        ]
+        assert results[1]["error"] == "SearxNG unreachable"
+        assert "error" not in results[0]
+
+
+def test_user_search_ranks_streamed_results_like_fetch_results():
+    def result(link):
+        return {
+            "title": link,
+            "link": f"http://{link}.com",
+            "snippet": f"{link} snippet",
+            "engines": [],
+            "category": "general",
+        }
+
+    class AgreeingWebSearchService:
+        def create_search_term(self, user_input):
+            return user_input
+
+        def stream_results(self, search_term, page=1, num_results=None, merger=None):
+            # Two engines answer in turn; both return b
+            for engine_results in (
+                [result("a"), result("b")],
+                [result("b"), result("c")],
+            ):
+                yield from merger.add(engine_results)
+
+        def ranked_results(self, merger, num_results=None):
+            return merger.ranked()[: num_results or 3]
+
+        def record_validation(self, search_results, validation_results):
+            pass
+
+    class LabelValidationService:
+        def validate_batch(self, search_term, snippets):
+            return [f"checked {snippet}" for snippet in snippets]
+
+    response = User(AgreeingWebSearchService(), LabelValidationService()).search("q")
+
+    assert [r["title"] for r in response["all_results"]] == ["b", "a", "c"]
+    assert response["web_results"] == ["b snippet", "a snippet", "c snippet"]
+    assert response["validation_results"] == [
+        "checked b snippet",
+        "checked a snippet",
+        "checked c snippet",
+    ]
+
+
+def test_user_search_returns_the_ranked_set_fetch_results_caches(monkeypatch):
+    def result(link):
+        return {
+            "title": link,
+            "link": f"http://{link}.com",
+            "snippet": f"{link} snippet",
+            "engines": [],
+            "category": "general",
+        }
+
+    def iter_results(term, merger, num_results=None, **options):
+        # The first engine fills the two streamed slots; the second outranks b.
+        streamed = merger.add([result("a"), result("b")])
+        merger.add([result("c"), result("a")])
+        return iter(streamed[:num_results])
+
+    class LabelValidationService:
+        def validate_batch(self, search_term, snippets):
+            return [{"is_valid": True, "reason": snippet} for snippet in snippets]
+
+    web_search_service = WebSearchService(cache=SearchCache())
+    monkeypatch.setattr(web_search_service.se_service, "iter_results", iter_results)
+    run = Mock()
+    monkeypatch.setattr(web_search_service.se_service, "run", run)
+    user = User(web_search_service, LabelValidationService())
+
+    response = user.search("q", num_results=2)
+
+    assert [r["title"] for r in response["all_results"]] == ["a", "c"]
+    assert [v["reason"] for v in response["validation_results"]] == ["a snippet", "c snippet"]
+    fetched = web_search_service.fetch_results("q", num_results=2)
+    assert [r["title"] for r in fetched] == ["a", "c"]
+    run.assert_not_called()
+
+
+def test_user_search_validates_while_results_stream(monkeypatch):
+    monkeypatch.setattr("src.features.users.models.user.VALIDATION_STREAM_CHUNK", 2)
+    first_chunk_validated = threading.Event()
+
+    class StreamingWebSearchService:
+        def create_search_term(self, user_input):
+            return user_input
+
+        def stream_results(self, search_term, page=1, num_results=None, merger=None):
+            for index in range(5):
+                if index == 4:
+                    # A slow engine; the first results are validated meanwhile.
+                    assert first_chunk_validated.wait(1)
+                yield {"snippet": f"{search_term} {index}", "link": f"https://{index}"}
+
+        def record_validation(self, search_results, validation_results):
+            pass
+
+    class ChunkRecordingValidationService:
+        def __init__(self):
+            self.batches = []
+
+        def validate_batch(self, search_term, snippets):
+            self.batches.append(list(snippets))
+            first_chunk_validated.set()
+            return [snippet.endswith(("0", "4")) for snippet in snippets]
+
+    validation_service = ChunkRecordingValidationService()
+    user = User(StreamingWebSearchService(), validation_service)
+
+    result = user.search("term")
+
+    assert result["validation_results"] == [True, False, False, False, True]
+    assert [len(batch) for batch in validation_service.batches] == [2, 2, 1]
+
+
+def test_warm_refresh_rewrites_validation_entries(mocker):
+    class OneResultWebSearchService:
+        def create_search_term(self, user_input):
+            return user_input
+
+        def stream_results(self, search_term, page=1, num_results=None, merger=None):
+            yield {"snippet": "giants schedule in germany", "link": "https://giants"}
+
+        def record_validation(self, search_results, validation_results):
+            pass
+
+    validation_service = SearchValidationService(
+        cache=SearchCache(), scorers="tfidf:1,query_coverage:1"
+    )
+    scores = mocker.spy(validation_service, "cosine_similarity_scores")
+    executor = InferenceExecutor(workers=1, torch_threads=1)
+    user = User(OneResultWebSearchService(), validation_service, executor)
+
+    try:
+        user.search("giants schedule")
+        user.search("giants schedule")
+        assert scores.call_count == 1
+        # Validation runs on the executor's thread, but still sees the refresh.
+        with refreshing():
+            user.search("giants schedule")
+    finally:
+        executor.shutdown()
+    assert scores.call_count == 2
@@ -0,0 +1,143 @@
+# tests/unit/test_cache_warmer.py
+
+import threading
+
+import pytest
+
+from src.shared.services.cache_warmer import CacheWarmer
+from src.shared.services.cache_warmer import TokenBucket
+from src.shared.services.cache_warmer import load_query_log
+from src.shared.services.search_cache import SearchCache
+from src.shared.services.search_cache import refreshing
+from src.shared.services.web_search_service import WebSearchService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.mark.unit
+def test_load_query_log_counts_logged_terms(tmp_path):
+    log = tmp_path / "query.log"
+    log.write_text(
+        "INFO:root:Executing search query: weather berlin\n"
+        "2024-01-01 10:00:00 - INFO - Executing search query: weather berlin\n"
+        "INFO:root:Executing search query: stock prices\n"
+        "INFO:root:Search cache hit: weather berlin\n"
+        "INFO:root:Executing search query: weather berlin\n"
+    )
+
+    assert load_query_log(str(log), min_count=2) == [("weather berlin", 3)]
+    assert load_query_log(str(log), min_count=1, limit=1) == [("weather berlin", 3)]
+    assert load_query_log(str(tmp_path / "missing.log")) == []
+
+
+@pytest.mark.unit
+def test_warm_runs_do_not_count_towards_the_query_log(tmp_path, caplog, mocker):
+    service = WebSearchService(web_search_url="http://mockdomain.com")
+    mocker.patch.object(service.se_service, "run", return_value=[])
+    caplog.set_level("INFO")
+
+    service.fetch_results("weather berlin")
+    with refreshing():
+        service.fetch_results("weather berlin")
+        service.fetch_results("weather berlin")
+    log = tmp_path / "query.log"
+    log.write_text("".join(f"{record.getMessage()}\n" for record in caplog.records))
+
+    assert load_query_log(str(log), min_count=1) == [("weather berlin", 1)]
+
+
+@pytest.mark.unit
+def test_token_bucket_limits_rate(clock):
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=clock)
+
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert bucket.wait_time() == pytest.approx(0.5)
+    clock.now += 0.5
+    assert bucket.try_acquire()
+
+
+@pytest.mark.unit
+def test_due_terms_run_by_priority_within_rate_limit(clock):
+    warmed = []
+    warmer = CacheWarmer(warmed.append, interval=60, jitter=0.0, rate=1.0, burst=2, clock=clock)
+    warmer.add("low", priority=1)
+    warmer.add("high", priority=5)
+    warmer.add("mid", priority=3)
+
+    assert warmer.run_pending() == 2
+    assert warmed == ["high", "mid"]
+
+    clock.now += 1.0
+    assert warmer.run_pending() == 1
+    assert warmed == ["high", "mid", "low"]
+
+
+@pytest.mark.unit
+def test_terms_are_rescheduled_with_jitter(clock):
+    warmed = []
+    warmer = CacheWarmer(warmed.append, interval=100, jitter=0.2, rate=100.0, burst=10, clock=clock)
+    warmer.add("weather")
+    clock.now += 20.0
+    warmer.run_pending()
+
+    clock.now += 79.0
+    assert warmer.run_pending() == 0
+    clock.now += 42.0
+    assert warmer.run_pending() == 1
+    assert warmer.queries()[0]["runs"] == 2
+
+
+@pytest.mark.unit
+def test_failures_are_counted_and_removed_terms_stop(clock):
+    def warm(term):
+        raise RuntimeError("searx down")
+
+    warmer = CacheWarmer(warm, interval=10, jitter=0.0, rate=100.0, burst=10, clock=clock)
+    warmer.add("flaky")
+    warmer.add("gone")
+    warmer.remove("gone")
+
+    assert warmer.run_pending() == 1
+    assert [(q["term"], q["failures"]) for q in warmer.queries()] == [("flaky", 1)]
+
+
+@pytest.mark.unit
+def test_warming_bypasses_cache_reads_and_refreshes_entries(clock):
+    cache = SearchCache()
+    cache.set("weather", "stale")
+
+    def warm(term):
+        assert cache.get(term) is None
+        cache.set(term, "fresh")
+
+    warmer = CacheWarmer(warm, interval=10, jitter=0.0, clock=clock)
+    warmer.add("weather")
+    warmer.run_pending()
+
+    assert cache.get("weather") == "fresh"
+    with refreshing():
+        assert cache.get("weather") is None
+
+
+@pytest.mark.unit
+def test_background_thread_warms_and_stops():
+    done = threading.Event()
+    warmer = CacheWarmer(lambda term: done.set(), interval=60, jitter=0.0)
+    warmer.add("weather")
+    warmer.start()
+    try:
+        assert done.wait(2.0)
+    finally:
+        warmer.stop(timeout=2.0)
@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from src.shared.services.embedding_cache import EmbeddingCache
+
+
+class CountingEncoder:
+    def __init__(self, dim=4):
+        self.dim = dim
+        self.batches = []
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        return np.array(
+            [[len(text) + offset for offset in range(self.dim)] for text in texts],
+            dtype=np.float32,
+        )
+
+
+@pytest.mark.unit
+def test_encode_only_runs_the_encoder_for_missing_texts():
+    cache = EmbeddingCache("test-model")
+    encoder = CountingEncoder()
+
+    first = cache.encode(["alpha", "beta", "alpha"], encoder)
+    second = cache.encode(["beta", "gamma  ray", "gamma ray"], encoder)
+
+    # The encoder sees the original text, not its normalized key form.
+    assert encoder.batches == [["alpha", "beta"], ["gamma  ray"]]
+    assert first.shape == (3, 4)
+    np.testing.assert_array_equal(first[0], first[2])
+    np.testing.assert_array_equal(first[1], second[0])
+    np.testing.assert_array_equal(second[1], second[2])
+    # Counters are per distinct text in a call.
+    assert cache.stats() == {"memory_hits": 1, "disk_hits": 0, "misses": 3, "vectors": 3}
+
+
+@pytest.mark.unit
+def test_keys_depend_on_the_model():
+    assert EmbeddingCache("model-a").key("text") != EmbeddingCache("model-b").key("text")
+    assert EmbeddingCache("model-a").key(" text\n") == EmbeddingCache("model-a").key("text")
+
+
+@pytest.mark.unit
+def test_vectors_persist_on_disk(tmp_path):
+    encoder = CountingEncoder()
+    EmbeddingCache("test-model", path=str(tmp_path)).encode(["alpha", "beta"], encoder)
+
+    reopened = EmbeddingCache("test-model", path=str(tmp_path))
+    vectors = reopened.encode(["beta", "alpha"], encoder)
+
+    assert len(encoder.batches) == 1
+    np.testing.assert_array_equal(vectors, [[4, 5, 6, 7], [5, 6, 7, 8]])
+    assert reopened.stats()["disk_hits"] == 2
+    assert reopened.size() == 2
+
+
+@pytest.mark.unit
+def test_instances_sharing_a_directory_see_each_others_rows(tmp_path):
+    # Two instances stand in for two worker processes.
+    writer = EmbeddingCache("test-model", path=str(tmp_path))
+    reader = EmbeddingCache("test-model", path=str(tmp_path))
+    encoder = CountingEncoder()
+
+    writer.encode(["one"], encoder)
+    assert reader.get_many(["one"])[0] is not None
+    # The reader has mapped a one-row file; it must remap to see new rows.
+    writer.encode(["three", "fourteen"], encoder)
+    reader.encode(["fifteen"], encoder)
+    writer.encode(["fifteen"], encoder)
+
+    vectors = reader.get_many(["three", "fourteen", "fifteen"])
+    np.testing.assert_array_equal(np.stack(vectors)[:, 0], [5, 8, 7])
+    assert writer.size() == reader.size() == 4
+    assert len(encoder.batches) == 3
+
+
+@pytest.mark.unit
+def test_float16_storage_rounds_consistently(tmp_path):
+    cache = EmbeddingCache("test-model", path=str(tmp_path), dtype="float16")
+    value = np.array([[0.1, 0.2, 0.3]], dtype=np.float32)
+
+    stored = cache.encode(["text"], lambda texts: value)
+    from_disk = EmbeddingCache("test-model", path=str(tmp_path), dtype="float16")
+
+    np.testing.assert_array_equal(stored, from_disk.get_many(["text"])[0][None, :])
+    np.testing.assert_allclose(stored, value, atol=1e-3)
+    assert (tmp_path / "test-model" / "vectors.float16").stat().st_size == 6
+
+
+@pytest.mark.unit
+def test_memory_tier_is_bounded():
+    cache = EmbeddingCache("test-model", max_memory_entries=2)
+    encoder = CountingEncoder()
+
+    cache.encode(["a1", "a2", "a3"], encoder)
+    cache.encode(["a1"], encoder)
+
+    assert encoder.batches[-1] == ["a1"]
+    assert cache.size() == 2
+
+
+@pytest.mark.unit
+def test_disk_tier_compacts_to_the_newest_vectors(tmp_path):
+    # Another instance stands in for a worker that mapped the old matrix.
+    cache = EmbeddingCache("test-model", path=str(tmp_path), max_rows=4)
+    reader = EmbeddingCache("test-model", path=str(tmp_path), max_rows=4)
+    encoder = CountingEncoder()
+    texts = ["a", "bb", "ccc", "dddd"]
+
+    cache.encode(texts, encoder)
+    assert reader.get_many(["a"])[0] is not None
+    cache.encode(["eeeee"], encoder)
+
+    # Past max_rows, the newest three quarters are kept.
+    assert cache.size() == 3
+    assert sorted(path.name for path in (tmp_path / "test-model").glob("vectors.*")) == [
+        "vectors.float32.1"
+    ]
+    fresh = EmbeddingCache("test-model", path=str(tmp_path))
+    assert fresh.get_many(["a", "bb"]) == [None, None]
+    for cached in (fresh, reader):
+        vectors = cached.get_many(["ccc", "dddd", "eeeee"])
+        np.testing.assert_array_equal(np.stack(vectors)[:, 0], [3, 4, 5])
@@ -0,0 +1,123 @@
+# tests/unit/test_engine_stats.py
+
+import pytest
+
+from src.shared.services.engine_stats import EngineSelector
+from src.shared.services.engine_stats import EngineStats
+from src.shared.services.web_search_service import WebSearchService
+
+
+def measure(stats, engine, latency, passes, samples=20):
+    for index in range(samples):
+        stats.record_latency(engine, latency)
+        stats.record_validation(engine, index < passes)
+
+
+@pytest.mark.unit
+def test_snapshot_reports_error_rate_latency_and_pass_rate():
+    stats = EngineStats()
+    stats.record_latency("brave", 0.2)
+    stats.record_latency("brave", 0.4)
+    stats.record_error("brave")
+    stats.record_validation("brave", True)
+    stats.record_validation("brave", False)
+
+    snapshot = stats.snapshot("brave")
+    assert snapshot["requests"] == 3
+    assert snapshot["error_rate"] == pytest.approx(1 / 3)
+    assert snapshot["latency_p50"] == pytest.approx(0.3)
+    assert snapshot["pass_rate"] == pytest.approx(0.5)
+    assert stats.snapshot("unknown")["pass_rate"] is None
+
+
+@pytest.mark.unit
+def test_stats_survive_restart(tmp_path):
+    path = str(tmp_path / "engine_stats.json")
+    stats = EngineStats(path=path)
+    measure(stats, "google", 0.5, passes=15)
+    stats.record_error("google")
+    stats.save()
+
+    reloaded = EngineStats(path=path)
+    assert reloaded.snapshot("google") == stats.snapshot("google")
+
+
+@pytest.mark.unit
+def test_selector_prefers_fast_engines_with_passing_results():
+    stats = EngineStats()
+    measure(stats, "fast", 0.1, passes=18)
+    measure(stats, "slow", 2.0, passes=18)
+    measure(stats, "noisy", 0.1, passes=2)
+    selector = EngineSelector(
+        ["fast", "slow", "noisy"], stats, max_engines=1, exploration=0.0
+    )
+
+    assert selector.select() == ["fast"]
+    assert selector.report()["slow"]["score"] < selector.report()["fast"]["score"]
+
+
+@pytest.mark.unit
+def test_selector_measures_unknown_engines_first():
+    stats = EngineStats()
+    measure(stats, "known", 0.1, passes=20)
+    selector = EngineSelector(["known", "new"], stats, max_engines=1, exploration=0.0)
+
+    assert selector.select() == ["new"]
+
+
+@pytest.mark.unit
+def test_selector_drops_engines_that_miss_their_deadline():
+    stats = EngineStats()
+    measure(stats, "fast", 0.1, passes=10)
+    for _ in range(10):
+        stats.record_timeout("stalled", 3.0)
+        stats.record_latency("stalled", 3.0)  # cancelled by the fan-out
+    selector = EngineSelector(["fast", "stalled"], stats, max_engines=1, exploration=0.0)
+
+    # Never validated, but measured on requests: it no longer ranks first.
+    assert stats.snapshot("stalled")["validated"] == 0
+    assert selector.select() == ["fast"]
+
+
+@pytest.mark.unit
+def test_close_saves_stats_between_throttled_snapshots(tmp_path):
+    path = str(tmp_path / "engine_stats.json")
+    service = WebSearchService(
+        web_search_url="http://mockdomain.com", engine_stats=EngineStats(path=path)
+    )
+    results = [{"snippet": "a", "title": "", "link": "", "engines": ["brave"]}]
+    service.record_validation(results, [{"is_valid": True}])
+    service.record_validation(results, [{"is_valid": False}])
+
+    service.close()
+
+    assert EngineStats(path=path).snapshot("brave")["validated"] == 2
+
+
+@pytest.mark.unit
+def test_selector_exploration_swaps_in_an_unselected_engine():
+    stats = EngineStats()
+    for engine in ("a", "b", "c"):
+        measure(stats, engine, 0.1, passes=20)
+    measure(stats, "d", 3.0, passes=1)
+    selector = EngineSelector(
+        ["a", "b", "c", "d"], stats, max_engines=2, exploration=1.0
+    )
+
+    chosen = selector.select()
+    assert len(chosen) == 2
+    assert chosen[0] in ("a", "b", "c")
+    assert chosen[1] not in chosen[:1]
+
+
+@pytest.mark.unit
+def test_record_validation_credits_every_contributing_engine():
+    service = WebSearchService(web_search_url="http://mockdomain.com")
+    results = [
+        {"snippet": "a", "title": "", "link": "", "engines": ["brave", "google"]},
+        {"snippet": "b", "title": "", "link": "", "engines": ["brave"]},
+    ]
+    service.record_validation(results, [{"is_valid": True}, {"is_valid": False}])
+
+    assert service.engine_stats.snapshot("brave")["pass_rate"] == pytest.approx(0.5)
+    assert service.engine_stats.snapshot("google")["pass_rate"] == 1.0
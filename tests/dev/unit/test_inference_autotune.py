@@ -0,0 +1,118 @@
+import pytest
+import torch
+
+from src.shared.services import inference_autotune
+from src.shared.services.inference_autotune import autotune
+from src.shared.services.inference_autotune import benchmark
+from src.shared.services.inference_autotune import ensure_tuned
+from src.shared.services.inference_autotune import host_profile
+from src.shared.services.inference_autotune import save_tuning
+from src.shared.services.inference_autotune import thread_candidates
+from src.shared.services.inference_autotune import tuned_settings
+from src.shared.services.inference_executor import InferenceExecutor
+from src.shared.services.synthetic_text import synthetic_snippets
+
+RESULT = {"torch_threads": 2, "batch_size": 16, "texts_per_sec": 900.0}
+
+
+class BatchRecordingEncoder:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32):
+        self.calls.append((len(texts), batch_size))
+        return [[0.0]] * len(texts)
+
+
+@pytest.mark.unit
+def test_autotune_picks_the_fastest_configuration(mocker):
+    mocker.patch.object(inference_autotune, "get_encoder", return_value=BatchRecordingEncoder())
+    throughput = {(1, 8): 100.0, (1, 32): 150.0, (2, 8): 400.0, (2, 32): 300.0}
+    mocker.patch.object(
+        inference_autotune,
+        "benchmark",
+        side_effect=lambda model, threads, batch_size, texts, workers: throughput[
+            (threads, batch_size)
+        ],
+    )
+    threads = torch.get_num_threads()
+
+    result = autotune("test-model", thread_options=[1, 2], batch_sizes=[8, 32])
+
+    assert result == {"torch_threads": 2, "batch_size": 8, "texts_per_sec": 400.0}
+    assert torch.get_num_threads() == threads
+
+
+@pytest.mark.unit
+def test_benchmark_encodes_every_snippet_with_the_batch_size():
+    encoder = BatchRecordingEncoder()
+    texts = synthetic_snippets(count=10)
+    threads = torch.get_num_threads()
+
+    try:
+        assert benchmark(encoder, 1, 4, texts, workers=2) > 0
+    finally:
+        torch.set_num_threads(threads)
+
+    # One warm-up batch, then each worker's share
+    assert encoder.calls == [(4, 4), (5, 4), (5, 4)]
+
+
+@pytest.mark.unit
+def test_synthetic_snippets_are_deterministic():
+    snippets = synthetic_snippets(count=20)
+
+    assert snippets == synthetic_snippets(count=20)
+    assert all(5 <= len(snippet.split()) <= 60 for snippet in snippets)
+
+
+@pytest.mark.unit
+def test_thread_candidates_cover_the_worker_share(mocker):
+    mocker.patch.object(inference_autotune.os, "cpu_count", return_value=12)
+
+    assert thread_candidates(workers=2) == [1, 2, 4, 6]
+    assert thread_candidates(workers=16) == [1]
+
+
+@pytest.mark.unit
+def test_results_are_saved_per_host_profile(tmp_path):
+    path = str(tmp_path / "tuning.json")
+
+    save_tuning("test-model", RESULT, path)
+    save_tuning("other-model", dict(RESULT, batch_size=64), path)
+    save_tuning("test-model", dict(RESULT, batch_size=8), path, profile="other-host")
+
+    assert tuned_settings("test-model", path) == RESULT
+    assert tuned_settings("other-model", path)["batch_size"] == 64
+    assert tuned_settings("test-model", path, profile="other-host")["batch_size"] == 8
+    assert tuned_settings("missing-model", path) is None
+    assert tuned_settings("test-model", str(tmp_path / "missing.json")) is None
+
+
+@pytest.mark.unit
+def test_ensure_tuned_only_benchmarks_untuned_models(tmp_path, mocker):
+    path = str(tmp_path / "tuning.json")
+    save_tuning("tuned-model", RESULT, path)
+    tune = mocker.patch.object(inference_autotune, "autotune", return_value=RESULT)
+
+    results = ensure_tuned(["tuned-model", "new-model"], path)
+
+    tune.assert_called_once_with("new-model")
+    assert results == {"tuned-model": RESULT, "new-model": RESULT}
+    assert tuned_settings("new-model", path) == RESULT
+
+
+@pytest.mark.unit
+def test_executor_applies_tuned_threads(mocker):
+    mocker.patch(
+        "src.shared.services.inference_executor.tuned_torch_threads", return_value=3
+    )
+    set_num_threads = mocker.patch(
+        "src.shared.services.inference_executor.torch.set_num_threads"
+    )
+
+    executor = InferenceExecutor(workers=2, torch_threads=0)
+    executor.shutdown()
+
+    set_num_threads.assert_called_once_with(3)
+    assert "2workers" in host_profile(workers=2)
@@ -0,0 +1,126 @@
+import asyncio
+import contextvars
+import threading
+
+import pytest
+import torch
+
+from src.shared.services.inference_executor import InferenceExecutor
+
+
+@pytest.fixture
+def executor():
+    threads = torch.get_num_threads()
+    executor = InferenceExecutor(workers=1, queue_depth=1, torch_threads=2)
+    yield executor
+    executor.shutdown(wait=False)
+    torch.set_num_threads(threads)
+
+
+@pytest.mark.unit
+def test_runs_tasks_and_counts_them(executor):
+    assert executor.run(sum, [1, 2, 3]) == 6
+    assert executor.submit(max, 4, 5).result() == 5
+
+    assert torch.get_num_threads() == 2
+    assert executor.stats() == {
+        "workers": 1,
+        "torch_threads": 2,
+        "pending": 0,
+        "submitted": 2,
+        "completed": 2,
+        "throttled": 0,
+    }
+
+
+@pytest.mark.unit
+def test_tasks_see_the_callers_context_variables(executor):
+    flag = contextvars.ContextVar("flag", default="unset")
+    token = flag.set("caller")
+    try:
+        assert executor.run(flag.get) == "caller"
+        assert asyncio.run(executor.arun(flag.get)) == "caller"
+    finally:
+        flag.reset(token)
+    assert executor.run(flag.get) == "unset"
+
+
+@pytest.mark.unit
+def test_full_queue_applies_backpressure(executor):
+    release = threading.Event()
+    running = executor.submit(release.wait, 5)
+    queued = executor.submit(lambda: "queued")
+
+    # One task running plus one queued fills the executor.
+    with pytest.raises(TimeoutError):
+        executor.submit(lambda: "rejected", timeout=0.05)
+    assert executor.stats()["pending"] == 2
+
+    release.set()
+    assert running.result() and queued.result() == "queued"
+    assert executor.submit(lambda: "accepted", timeout=1).result() == "accepted"
+    assert executor.stats()["throttled"] == 1
+
+
+@pytest.mark.unit
+def test_errors_reach_the_caller_and_free_the_slot(executor):
+    def fail():
+        raise ValueError("model failed")
+
+    for _ in range(3):
+        with pytest.raises(ValueError, match="model failed"):
+            executor.run(fail)
+    assert executor.stats()["pending"] == 0
+
+
+@pytest.mark.unit
+def test_arun_waits_for_a_slot_without_blocking_the_loop(executor):
+    release = threading.Event()
+
+    async def main():
+        blocked = [executor.submit(release.wait, 5), executor.submit(release.wait, 5)]
+        waiting = asyncio.ensure_future(executor.arun(lambda: "done"))
+        await asyncio.sleep(0.05)
+        # The loop kept running while arun waited for a slot.
+        assert not waiting.done()
+        release.set()
+        assert await waiting == "done"
+        return [future.result() for future in blocked]
+
+    assert asyncio.run(main()) == [True, True]
+    assert executor.stats()["completed"] == 3
+
+
+@pytest.mark.unit
+def test_default_torch_threads_split_the_cores(mocker):
+    mocker.patch("src.shared.services.inference_executor.os.cpu_count", return_value=8)
+    mocker.patch(
+        "src.shared.services.inference_executor.tuned_torch_threads", return_value=None
+    )
+    set_num_threads = mocker.patch(
+        "src.shared.services.inference_executor.torch.set_num_threads"
+    )
+
+    executor = InferenceExecutor(workers=3, torch_threads=0, encoding_threads=3)
+    executor.shutdown()
+
+    assert executor.torch_threads == 2
+    set_num_threads.assert_called_once_with(2)
+    with pytest.raises(ValueError):
+        InferenceExecutor(workers=0)
+
+
+@pytest.mark.unit
+def test_micro_batching_gives_every_core_to_the_batcher_thread(mocker):
+    mocker.patch("src.shared.services.inference_executor.os.cpu_count", return_value=8)
+    tuned = mocker.patch(
+        "src.shared.services.inference_executor.tuned_torch_threads", return_value=None
+    )
+    mocker.patch("src.shared.services.inference_executor.torch.set_num_threads")
+
+    executor = InferenceExecutor(workers=3, torch_threads=0, encoding_threads=1)
+    executor.shutdown()
+
+    # Forward passes run one at a time on the batcher's thread
+    tuned.assert_called_once_with(1)
+    assert executor.torch_threads == 8
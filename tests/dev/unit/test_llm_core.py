@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+
+from src.features.llm_core.llm_core import LLMCore
+
+ORIGINAL = (
+    "The New York Giants play the Carolina Panthers in Munich, Germany on "
+    "November 10. Kickoff is at 3:30 pm local time at Allianz Arena."
+)
+KEY_TERMS = ["giants", "panthers", "munich germany", "kickoff", "a"]
+GOOD = "The Giants play the Carolina Panthers in Munich, Germany; kickoff at 3:30 pm."
+FAIR = "The Giants travel to Germany in November."
+BAD = "Repot the houseplant in spring and water it weekly."
+
+
+class CandidateLLM(LLMCore):
+    """Returns queued summaries; every call waits until all candidates are requested."""
+
+    def __init__(self, summaries, concurrent=1):
+        super().__init__(relevance="shingle")
+        self.summaries = list(summaries)
+        self.started = threading.Barrier(concurrent, timeout=2)
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def summarize_text(self, text):
+        self.started.wait()
+        with self.lock:
+            self.calls += 1
+            summary = self.summaries.pop(0)
+        if isinstance(summary, Exception):
+            raise summary
+        return summary
+
+    def extract_key_terms(self, text, top_n=5):
+        self.extractions = getattr(self, "extractions", 0) + 1
+        return KEY_TERMS[:top_n]
+
+
+@pytest.fixture(autouse=True)
+def no_encoder(mocker):
+    mocker.patch("src.features.llm_core.llm_core.get_encoder")
+    mocker.patch("src.features.llm_core.llm_core.KeyBERT")
+
+
+@pytest.mark.unit
+def test_synonym_match_scores_match_per_summary_scores():
+    core = LLMCore()
+    summaries = [GOOD, FAIR, BAD, "Giants giants GIANTS"]
+
+    scores = core.synonym_match_scores(summaries, KEY_TERMS)
+
+    for score, summary in zip(scores, summaries):
+        assert score == pytest.approx(core.synonym_match_score(summary, KEY_TERMS))
+    assert list(core.synonym_match_scores(summaries, [])) == [1.0] * 4
+    assert list(core.synonym_match_scores(["!"], ["?"])) == [0.0]
+
+
+@pytest.mark.unit
+def test_key_terms_are_extracted_once_per_text(mocker):
+    mocker.patch("src.features.llm_core.llm_core.SUMMARY_KEY_TERMS_CACHE_SIZE", 1)
+    core = CandidateLLM([])
+
+    assert core.cached_key_terms(ORIGINAL) == KEY_TERMS
+    assert core.cached_key_terms(ORIGINAL) == KEY_TERMS
+    assert core.extractions == 1
+    core.cached_key_terms("another text")
+    core.cached_key_terms(ORIGINAL)
+    assert core.extractions == 3
+
+
+def expectations(threshold):
+    return {"min_word_count": 3, "threshold": threshold, "key_terms": KEY_TERMS}
+
+
+@pytest.mark.unit
+def test_candidates_are_generated_concurrently_and_the_best_is_returned():
+    core = CandidateLLM([FAIR, "Too short", GOOD], concurrent=3)
+    threshold = float(core._score_summaries([GOOD], ORIGINAL, KEY_TERMS)[0])
+
+    result = core.validate_and_score_summary(
+        BAD, ORIGINAL, expectations(threshold), candidates=3
+    )
+
+    assert result["is_valid"]
+    assert result["summary"] == GOOD
+    assert result["score"] == pytest.approx(threshold)
+    assert core.calls == 3
+
+
+@pytest.mark.unit
+def test_a_passing_summary_needs_no_candidates():
+    core = CandidateLLM([])
+
+    result = core.validate_and_score_summary(GOOD, ORIGINAL, expectations(0.1), candidates=3)
+
+    assert result == {
+        "score": pytest.approx(result["score"]),
+        "is_valid": True,
+        "reason": "Summary meets expectations",
+        "summary": GOOD,
+    }
+    assert core.calls == 0
+
+
+@pytest.mark.unit
+def test_failing_candidates_return_the_best_score():
+    core = CandidateLLM([FAIR, RuntimeError("quota exceeded")], concurrent=2)
+
+    result = core.validate_and_score_summary(BAD, ORIGINAL, expectations(0.99), candidates=2)
+
+    assert not result["is_valid"]
+    assert result["summary"] == FAIR
+    assert result["score"] == pytest.approx(
+        float(core._score_summaries([FAIR], ORIGINAL, KEY_TERMS)[0])
+    )
@@ -0,0 +1,82 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.shared.services.micro_batcher import MicroBatcher
+from src.shared.services.micro_batcher import get_batcher
+
+
+class RecordingEncoder:
+    """Embeds text as [length, first letter code], recording each forward pass."""
+
+    def __init__(self):
+        self.passes = []
+
+    def encode(self, texts):
+        self.passes.append(list(texts))
+        return np.array([[len(text), ord(text[0])] for text in texts], dtype=np.float32)
+
+
+@pytest.mark.unit
+def test_results_match_direct_encoding():
+    encoder = RecordingEncoder()
+    batcher = MicroBatcher(encoder.encode, window=0.0)
+    texts = ["giants", "schedule", "giants", "in germany"]
+
+    np.testing.assert_array_equal(batcher.encode(texts), RecordingEncoder().encode(texts))
+    # The repeated text was encoded once.
+    assert encoder.passes == [["giants", "schedule", "in germany"]]
+
+
+@pytest.mark.unit
+def test_concurrent_requests_share_forward_passes():
+    encoder = RecordingEncoder()
+    batcher = MicroBatcher(encoder.encode, window=0.2, max_texts=8)
+    requests = [[f"query {i}", f"snippet {i} text"] for i in range(4)]
+    start = threading.Barrier(len(requests))
+
+    def encode(texts):
+        start.wait()
+        return batcher.encode(texts)
+
+    with ThreadPoolExecutor(max_workers=len(requests)) as pool:
+        results = list(pool.map(encode, requests))
+
+    # Eight queued texts closed the window before it expired.
+    assert len(encoder.passes) == 1
+    for texts, rows in zip(requests, results):
+        np.testing.assert_array_equal(rows, RecordingEncoder().encode(texts))
+    assert batcher.stats() == {"requests": 4, "texts": 8, "batches": 1, "forward_passes": 1}
+
+
+@pytest.mark.unit
+def test_buckets_group_texts_of_similar_length():
+    encoder = RecordingEncoder()
+    batcher = MicroBatcher(encoder.encode, window=0.0, bucket_size=2)
+
+    rows = batcher.encode(["a much longer text", "bb", "a", "medium"])
+
+    assert encoder.passes == [["a", "bb"], ["medium", "a much longer text"]]
+    np.testing.assert_array_equal(rows[:, 0], [18, 2, 1, 6])
+
+
+@pytest.mark.unit
+def test_errors_reach_every_request_in_the_batch():
+    def fail(texts):
+        raise RuntimeError("out of memory")
+
+    batcher = MicroBatcher(fail, window=0.0)
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="out of memory"):
+            batcher.encode(["text"])
+
+
+@pytest.mark.unit
+def test_get_batcher_is_shared_per_model():
+    first, second = RecordingEncoder(), RecordingEncoder()
+
+    assert get_batcher(first) is get_batcher(first)
+    assert get_batcher(first) is not get_batcher(second)
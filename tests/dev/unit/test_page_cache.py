@@ -0,0 +1,97 @@
+# tests/unit/test_page_cache.py
+
+import os
+
+import pytest
+
+from src.shared.services.page_cache import PageCache
+
+
+def make_page(url, text, title="Title"):
+    return {
+        "url": url,
+        "status": 200,
+        "content_type": "text/html",
+        "title": title,
+        "text": text,
+        "bytes_read": len(text),
+        "truncated": False,
+        "error": "",
+    }
+
+
+def blob_files(path):
+    return [
+        name
+        for _, _, names in os.walk(os.path.join(path, "blobs"))
+        for name in names
+    ]
+
+
+@pytest.mark.unit
+def test_store_and_lookup_round_trip(tmp_path):
+    cache = PageCache(path=str(tmp_path))
+    page = make_page("https://news.example.com/a", "Full article text")
+    cache.store(page["url"], page, etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+
+    cached = PageCache(path=str(tmp_path)).lookup(page["url"])
+    assert cached["page"] == page
+    assert cached["fresh"]
+    assert PageCache.conditional_headers(cached) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert cache.lookup("https://news.example.com/missing") is None
+
+
+@pytest.mark.unit
+def test_identical_pages_share_one_blob(tmp_path):
+    cache = PageCache(path=str(tmp_path))
+    for url in ("https://example.com/a", "https://amp.example.com/a"):
+        cache.store(url, make_page(url, "Same story"))
+
+    assert len(blob_files(str(tmp_path))) == 1
+    assert cache.lookup("https://amp.example.com/a")["page"]["url"] == (
+        "https://amp.example.com/a"
+    )
+
+
+@pytest.mark.unit
+def test_stale_entries_need_revalidation(tmp_path):
+    cache = PageCache(path=str(tmp_path), ttl=0.0)
+    page = make_page("https://example.com/a", "text")
+    cache.store(page["url"], page, etag='"v1"')
+
+    assert not cache.lookup(page["url"])["fresh"]
+    cache._ttl = 60.0
+    cache.revalidated(page["url"])
+    assert cache.lookup(page["url"])["fresh"]
+
+
+@pytest.mark.unit
+def test_trim_evicts_least_recently_used_pages(tmp_path):
+    cache = PageCache(path=str(tmp_path), max_bytes=10_000)
+    texts = {index: os.urandom(3000).hex() for index in range(4)}
+    for index, text in texts.items():
+        cache.store(f"https://example.com/{index}", make_page("", text))
+    cache.lookup("https://example.com/0")  # most recently used now
+
+    cache.trim()
+
+    assert cache.size() <= 10_000
+    assert cache.lookup("https://example.com/0") is not None
+    assert cache.lookup("https://example.com/1") is None
+    assert len(blob_files(str(tmp_path))) < len(texts)
+
+
+@pytest.mark.unit
+def test_host_stats_report_hit_rates(tmp_path):
+    cache = PageCache(path=str(tmp_path))
+    cache.record("https://news.example.com/a", "hits")
+    cache.record("https://news.example.com/b", "revalidated")
+    cache.record("https://news.example.com/c", "misses")
+    cache.record("https://other.example.org/", "misses")
+
+    stats = cache.host_stats()
+    assert stats["news.example.com"]["hit_rate"] == pytest.approx(2 / 3)
+    assert stats["other.example.org"]["hit_rate"] == 0.0
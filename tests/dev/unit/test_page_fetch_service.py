@@ -0,0 +1,211 @@
+# tests/unit/test_page_fetch_service.py
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from src.features.core_pipeline.stages.page_fetch import fetch_page_contents
+from src.shared.services.page_cache import PageCache
+from src.shared.services.page_fetch_service import HTMLTextExtractor
+from src.shared.services.page_fetch_service import PageFetchService
+
+ARTICLE = b"""<!doctype html>
+<html><head><title>Eiffel Tower</title>
+<style>body { color: red; }</style>
+<script>var tracking = "do not index";</script></head>
+<body><nav>Home</nav>
+<article><h1>The Eiffel Tower</h1>
+<p>The tower is 330 metres tall &amp; stands in Paris.</p>
+<p>It was   completed
+in 1889.</p></article></body></html>"""
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    not_modified = 0
+    # /slow holds its response until the server fixture tears down.
+    release = threading.Event()
+
+    def do_GET(self):
+        if self.path == "/versioned":
+            if self.headers.get("If-None-Match") == '"v1"':
+                FixtureHandler.not_modified += 1
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(ARTICLE)))
+            self.end_headers()
+            self.wfile.write(ARTICLE)
+        elif self.path == "/article":
+            self.reply(ARTICLE, "text/html; charset=utf-8")
+        elif self.path == "/plain":
+            self.reply("Plain text café".encode("latin-1"), "text/plain; charset=latin-1")
+        elif self.path == "/image":
+            self.reply(b"\x89PNG", "image/png")
+        elif self.path == "/huge":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.end_headers()
+            try:
+                for _ in range(2000):
+                    self.wfile.write(b"<p>" + b"filler text " * 80 + b"</p>")
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+        elif self.path == "/slow":
+            FixtureHandler.release.wait()
+            self.reply(ARTICLE, "text/html")
+        elif self.path.startswith("/busy"):
+            with FixtureHandler.lock:
+                FixtureHandler.active += 1
+                FixtureHandler.peak = max(FixtureHandler.peak, FixtureHandler.active)
+            time.sleep(0.1)
+            with FixtureHandler.lock:
+                FixtureHandler.active -= 1
+            self.reply(ARTICLE, "text/html")
+        else:
+            self.send_error(404)
+
+    def reply(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    FixtureHandler.release.clear()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    FixtureHandler.release.set()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def fetcher():
+    service = PageFetchService(timeout=0.5, max_bytes=50_000, max_chars=2_000, per_host=2)
+    yield service
+    service.close()
+
+
+@pytest.mark.unit
+def test_extractor_handles_chunks_split_mid_tag():
+    extractor = HTMLTextExtractor()
+    for index in range(0, len(ARTICLE), 7):
+        extractor.feed(ARTICLE[index : index + 7].decode("utf-8"))
+    extractor.close()
+
+    assert extractor.title == "Eiffel Tower"
+    assert extractor.text() == (
+        "Home\nThe Eiffel Tower\n"
+        "The tower is 330 metres tall & stands in Paris.\nIt was completed in 1889."
+    )
+
+
+@pytest.mark.unit
+def test_fetch_extracts_html_and_plain_text(server, fetcher):
+    article, plain = fetcher.fetch_many([f"{server}/article", f"{server}/plain"])
+
+    assert article["status"] == 200
+    assert article["title"] == "Eiffel Tower"
+    assert "do not index" not in article["text"]
+    assert "330 metres tall & stands in Paris" in article["text"]
+    assert plain["text"] == "Plain text café"
+
+
+@pytest.mark.unit
+def test_fetch_reports_failures_without_raising(server, fetcher):
+    missing, image, slow = fetcher.fetch_many(
+        [f"{server}/missing", f"{server}/image", f"{server}/slow"]
+    )
+
+    assert missing["error"] == "HTTP 404"
+    assert image["error"] == "Unsupported content type: image/png"
+    assert slow["error"] == "Timed out"
+    assert not (missing["text"] or image["text"] or slow["text"])
+
+
+@pytest.mark.unit
+def test_fetch_stops_reading_huge_pages(server, fetcher):
+    page = fetcher.fetch(f"{server}/huge")
+
+    assert page["truncated"]
+    assert page["bytes_read"] <= 50_000
+    assert len(page["text"]) <= 2_000
+
+
+@pytest.mark.unit
+def test_fetch_caps_concurrency_per_host(server, fetcher):
+    FixtureHandler.peak = 0
+    pages = fetcher.fetch_many([f"{server}/busy/{index}" for index in range(6)])
+
+    assert all(page["text"] for page in pages)
+    assert FixtureHandler.peak == 2
+
+
+@pytest.mark.unit
+def test_fetch_page_contents_replaces_valid_snippets(server, fetcher):
+    search_data = {
+        "search_term": "eiffel tower",
+        "web_results": ["snippet 1", "snippet 2", "snippet 3"],
+        "validation_results": [{"is_valid": False}, {"is_valid": True}, {"is_valid": True}],
+        "all_results": [
+            {"title": "1", "link": f"{server}/article", "snippet": "snippet 1"},
+            {"title": "2", "link": f"{server}/article", "snippet": "snippet 2"},
+            {"title": "3", "link": f"{server}/missing", "snippet": "snippet 3"},
+        ],
+    }
+
+    enriched = fetch_page_contents(search_data, fetcher, top_n=2)
+
+    assert enriched["web_results"][0] == "snippet 1"
+    assert "completed in 1889" in enriched["web_results"][1]
+    assert enriched["web_results"][2] == "snippet 3"
+    assert search_data["web_results"][1] == "snippet 2"
+
+
+@pytest.mark.unit
+def test_cached_pages_are_revalidated_with_conditional_get(server, tmp_path):
+    cache = PageCache(path=str(tmp_path), ttl=0.0)
+    service = PageFetchService(timeout=0.5, cache=cache)
+    FixtureHandler.not_modified = 0
+    try:
+        first = service.fetch(f"{server}/versioned")
+        second = service.fetch(f"{server}/versioned")
+    finally:
+        service.close()
+
+    assert first["text"] and second == first
+    assert FixtureHandler.not_modified == 1
+    stats = cache.host_stats()["127.0.0.1"]
+    assert (stats["misses"], stats["revalidated"]) == (1, 1)
+
+
+@pytest.mark.unit
+def test_fresh_cached_pages_skip_the_network(server, tmp_path):
+    cache = PageCache(path=str(tmp_path))
+    service = PageFetchService(timeout=0.5, cache=cache)
+    try:
+        service.fetch(f"{server}/article")
+        FixtureHandler.peak = 0
+        page = service.fetch(f"{server}/article")
+    finally:
+        service.close()
+
+    assert "completed in 1889" in page["text"]
+    assert cache.host_stats()["127.0.0.1"]["hits"] == 1
@@ -0,0 +1,90 @@
+import pytest
+
+from src.shared.services.query_fingerprint import QueryFingerprinter
+from src.shared.services.query_fingerprint import light_stem
+from src.shared.services.query_fingerprint import normalize_query
+from src.shared.services.query_fingerprint import replay_hit_rate
+from src.shared.services.search_cache import SearchCache
+from src.shared.services.web_search_service import WebSearchService
+
+
+@pytest.mark.unit
+def test_equivalent_phrasings_share_a_fingerprint():
+    fingerprinter = QueryFingerprinter(stem=False)
+
+    assert fingerprinter.canonical("Giants schedule Germany") == "germany giants schedule"
+    assert fingerprinter.fingerprint("Giants schedule Germany") == (
+        fingerprinter.fingerprint("germany giants  schedule?")
+    )
+    assert fingerprinter.fingerprint("giants schedule") != (
+        fingerprinter.fingerprint("giants schedule germany")
+    )
+
+
+@pytest.mark.unit
+def test_directional_words_keep_the_terms_around_them_apart():
+    fingerprinter = QueryFingerprinter(stem=False)
+
+    assert fingerprinter.fingerprint("flights from paris to london") != (
+        fingerprinter.fingerprint("flights from london to paris")
+    )
+    assert fingerprinter.canonical("Paris flights to London") == "flights paris to london"
+    assert fingerprinter.fingerprint("cheap flights from Paris") == (
+        fingerprinter.fingerprint("flights cheap from paris")
+    )
+
+
+@pytest.mark.unit
+def test_normalize_query_folds_unicode_and_punctuation():
+    assert normalize_query("ＧＩＡＮＴＳ—Straße_Schedule!!") == "giants strasse schedule"
+
+
+@pytest.mark.unit
+def test_stopwords_are_dropped_but_negations_kept():
+    fingerprinter = QueryFingerprinter(stem=False)
+
+    assert fingerprinter.canonical("What is the schedule of the Giants") == "giants schedule"
+    assert fingerprinter.canonical("recipes without nuts") == "nuts recipes without"
+    # A query of nothing but stopwords keeps all of them.
+    assert fingerprinter.canonical("The Who") == "the who"
+
+
+@pytest.mark.unit
+def test_light_stem_merges_simple_inflections():
+    assert {light_stem(word) for word in ("schedule", "schedules", "scheduled")} == {
+        "schedul"
+    }
+    assert light_stem("cities") == "city"
+    assert light_stem("queries") == "query"
+    # Singular words ending in "ies" are left alone.
+    assert light_stem("series") == "series"
+    assert light_stem("species") == "species"
+    assert light_stem("matches") == "match"
+    assert light_stem("news") == "news"
+    assert light_stem("class") == "class"
+
+    fingerprinter = QueryFingerprinter(stem=True)
+    assert fingerprinter.fingerprint("giants games") == (
+        fingerprinter.fingerprint("giant game")
+    )
+
+
+@pytest.mark.unit
+def test_replay_hit_rate():
+    queries = ["Giants schedule", "giants schedule", "schedule, Giants", "weather"]
+
+    assert replay_hit_rate(queries, str.lower) == pytest.approx(0.25)
+    assert replay_hit_rate(queries, QueryFingerprinter().fingerprint) == pytest.approx(0.5)
+    assert replay_hit_rate([], str.lower) == 0.0
+
+
+@pytest.mark.unit
+def test_fetch_results_serves_reworded_queries_from_cache(mocker):
+    service = WebSearchService(web_search_url="http://mockdomain.com", cache=SearchCache())
+    results = [{"title": "Schedule", "link": "http://example.com", "snippet": "s"}]
+    run = mocker.patch.object(service.se_service, "run", return_value=results)
+
+    assert service.fetch_results("Giants schedule Germany") == results
+    assert service.fetch_results("germany giants  schedule?") == results
+    run.assert_called_once()
+    assert run.call_args.args[0] == "Giants schedule Germany"
@@ -0,0 +1,74 @@
+import pytest
+
+from src.shared.services.result_dedup import canonicalize_url
+from src.shared.services.result_dedup import dedupe_results
+from src.shared.services.result_dedup import hamming_distance
+from src.shared.services.result_dedup import simhash
+from src.shared.services.result_dedup import tokenize
+
+
+SNIPPET = (
+    "The New York Giants will face the Carolina Panthers in Munich, Germany "
+    "on November 10 as part of the NFL international series."
+)
+
+
+def make_result(link, snippet, engines):
+    return {
+        "title": "Title",
+        "link": link,
+        "snippet": snippet,
+        "engines": engines,
+        "category": "general",
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://www.example.com/news/story/?utm_source=twitter&utm_medium=social",
+        "http://example.com/news/story?fbclid=abc123",
+        "https://m.example.com/news/story#comments",
+        "HTTPS://EXAMPLE.COM:443/news//story/",
+    ],
+)
+def test_canonicalize_url_strips_tracking_variants(url):
+    assert canonicalize_url(url) == "https://example.com/news/story"
+
+
+@pytest.mark.unit
+def test_canonicalize_url_keeps_meaningful_params_sorted():
+    assert canonicalize_url("https://example.com/search?q=b&page=2&utm_id=1") == (
+        "https://example.com/search?page=2&q=b"
+    )
+
+
+@pytest.mark.unit
+def test_simhash_is_close_for_near_duplicates():
+    syndicated = SNIPPET.replace("as part of", "in") + " Read more."
+    unrelated = "Paris is home to the Eiffel Tower, the Louvre and many famous cafes."
+
+    near = hamming_distance(simhash(tokenize(SNIPPET)), simhash(tokenize(syndicated)))
+    far = hamming_distance(simhash(tokenize(SNIPPET)), simhash(tokenize(unrelated)))
+    assert near < far
+
+
+@pytest.mark.unit
+def test_dedupe_results_merges_engines():
+    results = [
+        make_result("https://www.nfl.com/games/giants?utm_source=x", SNIPPET, ["brave"]),
+        make_result("https://nfl.com/games/giants", "Different text.", ["google"]),
+        make_result("https://syndicator.com/giants", SNIPPET, ["duckduckgo"]),
+        make_result("https://other.com/paris", "Landmarks in Paris.", ["brave"]),
+    ]
+
+    deduped = dedupe_results(results)
+
+    assert [result["link"] for result in deduped] == [
+        "https://www.nfl.com/games/giants?utm_source=x",
+        "https://other.com/paris",
+    ]
+    assert deduped[0]["engines"] == ["brave", "google", "duckduckgo"]
+    # The inputs may be shared with the cache; only the copies are merged
+    assert results[0]["engines"] == ["brave"]
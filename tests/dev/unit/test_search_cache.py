@@ -0,0 +1,121 @@
+import time
+
+import pytest
+
+from src.shared.services.search_cache import SearchCache
+from src.shared.services.web_search_service import WebSearchService
+
+
+RESULTS = [
+    {
+        "snippet": "Snippet 1",
+        "title": "Title 1",
+        "link": "http://example.com/1",
+        "engines": ["brave"],
+        "category": "general",
+    }
+]
+
+
+@pytest.mark.unit
+def test_make_key_ignores_engine_order():
+    assert SearchCache.make_key("paris", ["brave", "google"], 3) == (
+        SearchCache.make_key("paris", ["google", "brave"], 3)
+    )
+    assert SearchCache.make_key("paris", ["brave"], 3) != (
+        SearchCache.make_key("paris", ["brave"], 5)
+    )
+
+
+@pytest.mark.unit
+def test_memory_tier_lru_eviction():
+    cache = SearchCache(max_memory_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" becomes most recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["memory_hits"] == 3
+    assert stats["misses"] == 1
+
+
+@pytest.mark.unit
+def test_memory_tier_ttl():
+    cache = SearchCache(memory_ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+
+@pytest.mark.unit
+def test_memory_tier_returns_copies():
+    cache = SearchCache()
+    cache.set("a", RESULTS)
+    cached = cache.get("a")
+    cached[0]["engines"].append("google")
+
+    assert cache.get("a") == RESULTS
+    assert RESULTS[0]["engines"] == ["brave"]
+
+
+@pytest.mark.unit
+def test_disk_tier_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = SearchCache(path=path)
+    writer.set("key", RESULTS)
+
+    # A second instance stands in for another worker process.
+    reader = SearchCache(path=path)
+    assert reader.get("key") == RESULTS
+    assert reader.stats()["disk_hits"] == 1
+    assert reader.get("key") == RESULTS
+    assert reader.stats()["memory_hits"] == 1
+
+
+@pytest.mark.unit
+def test_disk_tier_ttl_and_size_bound(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SearchCache(path=path, disk_ttl=0.01, max_memory_entries=1)
+    cache.set("old", 1)
+    time.sleep(0.02)
+    assert SearchCache(path=path).get("old") is None
+
+    bounded = SearchCache(path=path, max_disk_entries=2, table="bounded")
+    for key in ["a", "b", "c"]:
+        bounded.set(key, key)
+    bounded.trim()
+    fresh = SearchCache(path=path, table="bounded")
+    assert fresh.get("a") is None
+    assert fresh.get("c") == "c"
+
+
+@pytest.mark.unit
+def test_fetch_results_uses_cache(mocker):
+    service = WebSearchService(web_search_url="http://mockdomain.com", cache=SearchCache())
+    run = mocker.patch.object(service.se_service, "run", return_value=RESULTS)
+
+    assert service.fetch_results("paris") == RESULTS
+    assert service.fetch_results("paris") == RESULTS
+    run.assert_called_once()
+    assert run.call_args.args == ("paris",)
+    assert service.cache.stats()["memory_hits"] == 1
+
+
+@pytest.mark.unit
+def test_stream_results_caches_complete_streams(mocker):
+    service = WebSearchService(web_search_url="http://mockdomain.com", cache=SearchCache())
+    iter_results = mocker.patch.object(
+        service.se_service,
+        "iter_results",
+        side_effect=lambda term, merger, **options: iter(merger.add(RESULTS)),
+    )
+
+    assert list(service.stream_results("paris")) == RESULTS
+    assert list(service.stream_results("paris")) == RESULTS
+    iter_results.assert_called_once()
+    assert iter_results.call_args.args == ("paris",)
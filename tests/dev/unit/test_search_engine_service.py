@@ -1,16 +1,77 @@
 # tests/unit/test_search_engine_service.py
 
+import asyncio
+import time
+
+import httpx
 import pytest
 from unittest.mock import patch
+from src.shared.services.background_loop import BackgroundLoop
+from src.shared.services.engine_stats import EngineStats
+from src.shared.services.search_engine_service import ResultMerger
 from src.shared.services.search_engine_service import SearchEngineService
 
 
+def make_result(link, engine):
+    return {
+        "title": f"Title {link}",
+        "link": link,
+        "snippet": f"Snippet {link}",
+        "engines": [engine],
+        "category": "general",
+    }
+
+
+class FakeSearxClient:
+    """Stands in for SearxClient; each engine answers after a configured delay."""
+
+    def __init__(self, delays, results, failures=()):
+        self.loop = BackgroundLoop(name="fake-searx")
+        self.delays = delays
+        self.results = results
+        self.failures = set(failures)
+        self.calls = []
+        self.pages = []
+        self.cancelled = []
+
+    async def asearch(self, query, engines=None, num_results=3, pageno=1, timeout=None):
+        engine = engines[0] if engines else "default"
+        self.calls.append(engine)
+        self.pages.append(pageno)
+        delay = self.delays.get(engine, 0)
+        if isinstance(delay, list):
+            delay = delay.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(engine)
+            raise
+        if engine in self.failures:
+            raise httpx.ConnectError("engine down")
+        return self.results[engine][:num_results]
+
+
+@pytest.fixture
+def make_client():
+    """Builds FakeSearxClients and stops their loops after the test."""
+    clients = []
+
+    def make(*args, **kwargs):
+        client = FakeSearxClient(*args, **kwargs)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.loop.stop()
+
+
 class TestSearchEngineService:
 
-    @patch("src.shared.services.search_engine_service.SearxSearchWrapper")
-    def test_initialization(self, MockSearxSearchWrapper):
+    @patch("src.shared.services.search_engine_service.SearxClient")
+    def test_initialization(self, MockSearxClient):
         # Arrange
-        mock_instance = MockSearxSearchWrapper.return_value
+        mock_instance = MockSearxClient.return_value
 
         # Act
         service = SearchEngineService(
@@ -20,40 +81,230 @@ class TestSearchEngineService:
         # Assert
         assert service._host == "http://localhost:8080"
         assert service._num_results == 5
-        assert service._search_wrapper == mock_instance
+        assert service._client == mock_instance
+        MockSearxClient.assert_called_once_with(host="http://localhost:8080")
 
-    @patch("src.shared.services.search_engine_service.SearxSearchWrapper")
-    def test_run_method(self, MockSearxSearchWrapper):
+    def test_run_method(self, make_client):
         # Arrange
-        mock_instance = MockSearxSearchWrapper.return_value
-        mock_instance.results.return_value = [
-            {
-                "title": "Title 1",
-                "link": "http://example.com/1",
-                "snippet": "Snippet 1",
-            },
-            {
-                "title": "Title 2",
-                "link": "http://example.com/2",
-                "snippet": "Snippet 2",
+        client = make_client(
+            delays={},
+            results={
+                "brave": [
+                    make_result("http://example.com/1", "brave"),
+                    make_result("http://example.com/2", "brave"),
+                ]
             },
-        ]
-
-        service = SearchEngineService(engines=["brave"])
+        )
+        service = SearchEngineService(engines=["brave"], client=client)
 
         # Act
         results = service.run("landmarks in Paris")
 
         # Assert
         assert len(results) == 2
-        assert results[0]["title"] == "Title 1"
+        assert results[0]["title"] == "Title http://example.com/1"
         assert results[1]["link"] == "http://example.com/2"
-        assert results[0]["snippet"] == "Snippet 1"
-        assert results[1]["snippet"] == "Snippet 2"
-        mock_instance.results.assert_called_once_with(
-            query="landmarks in Paris", num_results=3, engines=["brave"]
+        assert client.calls == ["brave"]
+
+    def test_run_requests_page_and_result_count(self, make_client):
+        client = make_client(
+            delays={},
+            results={
+                "brave": [
+                    make_result(f"http://example.com/{index}", "brave")
+                    for index in range(8)
+                ]
+            },
+        )
+        service = SearchEngineService(engines=["brave"], client=client)
+
+        results = service.run("landmarks in Paris", pageno=2, num_results=6)
+
+        assert len(results) == 6
+        assert client.pages == [2]
+
+    def test_fan_out_does_not_wait_for_a_slow_engine(self, make_client):
+        client = make_client(
+            delays={"fast": 0, "slow": 2.5},
+            results={
+                "fast": [make_result(f"http://fast/{i}", "fast") for i in range(3)],
+                "slow": [make_result("http://slow/0", "slow")],
+            },
+        )
+        stats = EngineStats()
+        # Default deadline and grace period
+        service = SearchEngineService(engines=["fast", "slow"], client=client, stats=stats)
+
+        started = time.monotonic()
+        results = service.run("query")
+
+        assert time.monotonic() - started < 1.0
+        assert [r["link"] for r in results] == [f"http://fast/{i}" for i in range(3)]
+        time.sleep(0.05)
+        assert client.cancelled == ["slow"]
+        # The cancelled engine counts as a request that took the whole deadline.
+        assert stats.snapshot("slow")["requests"] == 1
+        assert stats.latency_percentile("slow", 50) == service._engine_deadline
+
+    def test_fan_out_merges_engines_answering_within_the_grace_period(self, make_client):
+        client = make_client(
+            delays={"fast": 0, "slow": 0.2},
+            results={
+                "fast": [make_result(f"http://fast/{i}", "fast") for i in range(3)],
+                "slow": [
+                    make_result("http://slow/0", "slow"),
+                    make_result("http://fast/2", "slow"),
+                ],
+            },
+        )
+        service = SearchEngineService(engines=["fast", "slow"], client=client)
+
+        results = service.run("query")
+
+        # The slow engine's results and its agreement on fast/2 outrank fast/1.
+        assert [r["link"] for r in results] == [
+            "http://fast/0",
+            "http://slow/0",
+            "http://fast/2",
+        ]
+        assert client.cancelled == []
+
+    def test_fan_out_waits_past_the_grace_period_while_short_of_results(self, make_client):
+        client = make_client(
+            delays={"fast": 0, "slow": 0.3},
+            results={
+                "fast": [make_result("http://fast/0", "fast")],
+                "slow": [make_result(f"http://slow/{i}", "slow") for i in range(3)],
+            },
+        )
+        service = SearchEngineService(
+            engines=["fast", "slow"], client=client, merge_grace=0.05
         )
 
+        results = service.run("query")
+
+        assert len(results) == 3
+        assert client.cancelled == []
+
+    def test_fan_out_survives_failed_engine(self, make_client):
+        client = make_client(
+            delays={},
+            results={"good": [make_result("http://good/0", "good")]},
+            failures=["bad"],
+        )
+        service = SearchEngineService(engines=["bad", "good"], client=client)
+
+        assert [r["link"] for r in service.run("query")] == ["http://good/0"]
+        assert service.stats._errors["bad"] == 1
+
+    def test_engine_deadline(self, make_client):
+        client = make_client(delays={"slow": 1.0}, results={"slow": []})
+        service = SearchEngineService(
+            engines=["slow"], client=client, engine_deadline=0.05
+        )
+
+        with pytest.raises(httpx.TimeoutException):
+            service.run("query")
+        snapshot = service.stats.snapshot("slow")
+        assert snapshot["error_rate"] == 1.0
+        assert snapshot["latency_p50"] == 0.05
+
+    def test_hedged_request_wins(self, make_client):
+        stats = EngineStats()
+        for _ in range(20):
+            stats.record_latency("brave", 0.01)
+        client = make_client(
+            delays={"brave": [1.0, 0.0]},
+            results={"brave": [make_result("http://example.com/1", "brave")]},
+        )
+        service = SearchEngineService(engines=["brave"], client=client, stats=stats)
+
+        started = time.monotonic()
+        results = service.run("query")
+
+        assert time.monotonic() - started < 0.5
+        assert results[0]["link"] == "http://example.com/1"
+        assert client.calls == ["brave", "brave"]
+
+    def test_iter_results_yields_before_slow_engines_finish(self, make_client):
+        client = make_client(
+            delays={"fast": 0, "slow": 0.3},
+            results={
+                "fast": [make_result("http://fast/0", "fast")],
+                "slow": [
+                    make_result("http://slow/0", "slow"),
+                    make_result("http://fast/0", "slow"),
+                ],
+            },
+        )
+        service = SearchEngineService(engines=["fast", "slow"], client=client)
+
+        started = time.monotonic()
+        stream = service.iter_results("query")
+        first = next(stream)
+        first_latency = time.monotonic() - started
+        rest = list(stream)
+
+        assert first_latency < 0.2
+        assert first["link"] == "http://fast/0"
+        assert [r["link"] for r in rest] == ["http://slow/0"]
+        assert first["engines"] == ["fast", "slow"]
+
+    def test_iter_results_can_be_ranked_like_run(self, make_client):
+        client = make_client(
+            delays={"fast": 0, "slow": 0.1},
+            results={
+                "fast": [make_result("http://a", "fast"), make_result("http://b", "fast")],
+                "slow": [make_result("http://b", "slow"), make_result("http://c", "slow")],
+            },
+        )
+        service = SearchEngineService(engines=["fast", "slow"], client=client)
+
+        merger = ResultMerger()
+        streamed = list(service.iter_results("query", merger=merger))
+
+        assert [r["link"] for r in streamed] == ["http://a", "http://b", "http://c"]
+        ranked = [r["link"] for r in merger.rank(streamed)]
+        assert ranked == [r["link"] for r in service.run("query")]
+        assert ranked == ["http://b", "http://a", "http://c"]
+
+    def test_iter_results_cancels_engines_when_closed_early(self, make_client):
+        client = make_client(
+            delays={"fast": 0, "slow": 1.0},
+            results={"fast": [make_result("http://fast/0", "fast")], "slow": []},
+        )
+        service = SearchEngineService(engines=["fast", "slow"], client=client)
+
+        stream = service.iter_results("query")
+        assert next(stream)["link"] == "http://fast/0"
+        stream.close()
+        time.sleep(0.05)
+
+        assert client.cancelled == ["slow"]
+
+    def test_aiter_results(self, make_client):
+        client = make_client(
+            delays={},
+            results={"brave": [make_result(f"http://b/{i}", "brave") for i in range(5)]},
+        )
+        service = SearchEngineService(engines=["brave"], client=client)
+
+        async def collect():
+            return [r["link"] async for r in service.aiter_results("query")]
+
+        assert asyncio.run(collect()) == ["http://b/0", "http://b/1", "http://b/2"]
+
+
+def test_result_merger_ranks_agreement_first():
+    merger = ResultMerger()
+    merger.add([make_result("a", "brave"), make_result("b", "brave")])
+    new = merger.add([make_result("b", "google"), make_result("c", "google")])
+
+    assert [r["link"] for r in new] == ["c"]
+    ranked = merger.ranked()
+    assert [r["link"] for r in ranked] == ["b", "a", "c"]
+    assert ranked[0]["engines"] == ["brave", "google"]
+
 
 # This allows running the test directly from the script
 if __name__ == "__main__":
@@ -0,0 +1,27 @@
+import pytest
+
+from src.features.core_pipeline.stages.search_execution import merge_search_data
+from src.features.core_pipeline.stages.search_execution import next_page_size
+
+
+@pytest.mark.unit
+def test_next_page_size_adapts_to_pass_rate():
+    assert next_page_size(valid=0, validated=0, target_valid=1) == 2
+    assert next_page_size(valid=3, validated=8, target_valid=5) == 5
+    assert next_page_size(valid=0, validated=50, target_valid=3) == 10
+
+
+@pytest.mark.unit
+def test_merge_search_data_leaves_its_inputs_alone():
+    first = {"search_term": "term", "web_results": ["a"], "validation_results": []}
+    follow_up = {"web_results": ["b"], "all_results": [{"link": "b"}]}
+
+    merged = merge_search_data(first, follow_up)
+
+    assert merged == {
+        "search_term": "term",
+        "web_results": ["a", "b"],
+        "validation_results": [],
+        "all_results": [{"link": "b"}],
+    }
+    assert first["web_results"] == ["a"] and "all_results" not in first
@@ -0,0 +1,357 @@
+import pytest
+import torch
+
+from src.shared.services.embedding_cache import EmbeddingCache
+from src.shared.services.search_cache import SearchCache
+from src.shared.services.search_validation_service import SearchValidationService
+from src.shared.services.search_validation_service import calibrate_cascade_band
+from src.shared.services.validation_scorers import SCORERS
+from src.shared.services.validation_scorers import Scorer
+from src.shared.services.validation_scorers import parse_scorer_weights
+from src.shared.services.validation_scorers import register_scorer
+
+QUERY = "giants game schedule in germany"
+TEXTS = [
+    "The New York Giants play the Panthers in Munich, Germany on November 10.",
+    "Giants schedule: every game of the season, home and away.",
+    "Best coffee shops in Tokyo",
+    "",
+    "the and of",
+]
+
+STOP_WORDS = {"the", "in", "of", "and", "on", "a"}
+
+
+class FakeEncoder:
+    """Embeds text as letter counts, so results are deterministic and offline."""
+
+    def __init__(self):
+        self.calls = 0
+        self.encoded = []
+        self.batch_sizes = []
+
+    def encode(self, sentences, convert_to_tensor=False, batch_size=32):
+        self.calls += 1
+        self.batch_sizes.append(batch_size)
+        self.encoded.extend([sentences] if isinstance(sentences, str) else sentences)
+        single = isinstance(sentences, str)
+        batch = [sentences] if single else sentences
+        rows = [
+            [float(text.lower().count(letter)) + 0.01 for letter in "abcdefghijklmnopqrstuvwxyz"]
+            for text in batch
+        ]
+        embeddings = torch.tensor(rows)
+        if not convert_to_tensor:
+            embeddings = embeddings.numpy()
+        return embeddings[0] if single else embeddings
+
+
+class FakeKeyBERT:
+    """Mimics KeyBERT's return shapes: a list per document, unwrapped for one document."""
+
+    def __init__(self):
+        self.queries = []
+
+    def _keywords(self, doc, top_n):
+        words = [word.strip(".,:").lower() for word in doc.split()]
+        words = [word for word in words if word and word not in STOP_WORDS]
+        return [(word, 1.0) for word in words[:top_n]]
+
+    def extract_keywords(self, docs, top_n=5):
+        if isinstance(docs, str):
+            self.queries.append(docs)
+            return self._keywords(docs, top_n)
+        keywords = [self._keywords(doc, top_n) for doc in docs]
+        return keywords[0] if len(keywords) == 1 else keywords
+
+
+@pytest.fixture
+def service(mocker):
+    mocker.patch(
+        "src.shared.services.search_validation_service.get_encoder",
+        return_value=FakeEncoder(),
+    )
+    mocker.patch(
+        "src.shared.services.search_validation_service.KeyBERT",
+        return_value=FakeKeyBERT(),
+    )
+    return SearchValidationService()
+
+
+def assert_same_results(batch, single):
+    assert len(batch) == len(single)
+    for batched, expected in zip(batch, single):
+        assert batched["is_valid"] == expected["is_valid"]
+        assert batched["reason"] == expected["reason"]
+        for field in ("score", "cosine_score", "semantic_score", "keyword_score"):
+            assert batched[field] == pytest.approx(expected[field], abs=1e-6)
+
+
+def pairwise_result(service, query, text, threshold=0.6):
+    """Scores one pair with the per-pair scorers and the default weights."""
+    cosine_score = float(service.cosine_similarity_score(query, text))
+    semantic_score = float(service.semantic_similarity_score(query, text))
+    keyword_score = float(service.keyword_coverage_score(query, text))
+    score = (cosine_score * 0.3) + (semantic_score * 0.5) + (keyword_score * 0.2)
+    return {
+        "score": score,
+        "is_valid": score >= threshold,
+        "cosine_score": cosine_score,
+        "semantic_score": semantic_score,
+        "keyword_score": keyword_score,
+        "reason": (
+            "Meets relevance threshold" if score >= threshold else "Below relevance threshold"
+        ),
+    }
+
+
+@pytest.mark.unit
+def test_validate_batch_matches_pairwise_scoring(service):
+    single = [pairwise_result(service, QUERY, text, threshold=0.4) for text in TEXTS]
+
+    assert_same_results(service.validate_batch(QUERY, TEXTS, threshold=0.4), single)
+    assert any(result["is_valid"] for result in single)
+    assert not all(result["is_valid"] for result in single)
+
+
+@pytest.mark.unit
+def test_validate_batch_handles_single_and_empty_batches(service):
+    assert service.validate_batch(QUERY, []) == []
+    assert_same_results(
+        service.validate_batch(QUERY, TEXTS[:1]), [pairwise_result(service, QUERY, TEXTS[0])]
+    )
+    assert_same_results(
+        [service.validate(QUERY, TEXTS[0])], [pairwise_result(service, QUERY, TEXTS[0])]
+    )
+
+
+@pytest.mark.unit
+def test_validate_batch_runs_models_once_per_batch(service):
+    service.validate_batch(QUERY, TEXTS)
+
+    assert service.semantic_model.calls == 1
+    assert service.kw_model.queries == [QUERY]
+
+
+@pytest.mark.unit
+def test_cosine_scores_match_pairwise_tfidf(service):
+    scores = service.cosine_similarity_scores(QUERY, TEXTS)
+
+    for score, text in zip(scores, TEXTS[:3]):
+        assert score == pytest.approx(service.cosine_similarity_score(QUERY, text))
+    assert scores[3] == 0.0
+
+
+@pytest.mark.unit
+def test_validate_batch_only_scores_uncached_texts(service, mocker):
+    service.cache = SearchCache()
+    service.validate_batch(QUERY, TEXTS[:2])
+    score_batch = mocker.spy(service, "_score_batch")
+
+    results = service.validate_batch(QUERY, TEXTS[:3])
+
+    assert score_batch.call_args.args[1] == TEXTS[2:3]
+    assert_same_results(results, [service.validate(QUERY, text) for text in TEXTS[:3]])
+
+
+@pytest.mark.unit
+def test_embedding_cache_skips_known_texts(service):
+    service.embedding_cache = EmbeddingCache("fake-encoder")
+    uncached = service.validate_batch(QUERY, TEXTS)
+
+    assert_same_results(service.validate_batch(QUERY, TEXTS[:2]), uncached[:2])
+    assert service.validate(QUERY, TEXTS[2]) == uncached[2]
+    assert service.semantic_model.calls == 1
+
+
+@pytest.mark.unit
+def test_shared_encoder_runs_keybert_on_the_semantic_model(mocker):
+    encoder = FakeEncoder()
+    mocker.patch(
+        "src.shared.services.search_validation_service.get_encoder",
+        return_value=encoder,
+    )
+    service = SearchValidationService(shared_encoder=True)
+
+    batch = service.validate_batch(QUERY, TEXTS)
+
+    assert_same_results(batch, [service.validate(QUERY, text) for text in TEXTS])
+    assert any(result["keyword_score"] for result in batch)
+    # Every text and candidate word went through the one model exactly once.
+    assert len(encoder.encoded) == len(set(encoder.encoded))
+    assert set(TEXTS) - {""} <= set(encoder.encoded)
+
+
+def make_result(cosine_score, is_valid):
+    return {
+        "score": 0.0,
+        "is_valid": is_valid,
+        "cosine_score": cosine_score,
+        "semantic_score": 0.0,
+        "keyword_score": 0.0,
+        "reason": "",
+    }
+
+
+@pytest.mark.unit
+def test_cascade_matches_full_scorer_decisions(service, mocker):
+    full = service.validate_batch(QUERY, TEXTS, threshold=0.4)
+    service.cascade_band = (0.0, 1.0)
+    keywords = mocker.spy(service, "keyword_coverage_scores")
+
+    cascaded = service.validate_batch(QUERY, TEXTS, threshold=0.4)
+
+    assert [r["is_valid"] for r in cascaded] == [r["is_valid"] for r in full]
+    stats = service.cascade_stats()
+    assert stats["tfidf"] == 0
+    assert stats["semantic"] + stats["keyword"] == len(TEXTS)
+    if stats["keyword"]:
+        assert len(keywords.call_args.args[1]) == stats["keyword"]
+    for result in cascaded:
+        if "decided by" not in result["reason"]:
+            assert result in full
+
+
+@pytest.mark.unit
+def test_cascade_lexical_tier_skips_the_models(service, mocker):
+    service.cascade_band = (0.05, 0.9)
+    semantic = mocker.spy(service, "semantic_similarity_scores")
+
+    results = service.validate_batch(QUERY, ["Best coffee shops near Kyoto station", ""])
+
+    assert not any(result["is_valid"] for result in results)
+    assert all("decided by the tfidf score" in result["reason"] for result in results)
+    # Skipped scorers report no score rather than a zero.
+    assert all(result["semantic_score"] is None for result in results)
+    assert all(result["keyword_score"] is None for result in results)
+    semantic.assert_not_called()
+    assert service.cascade_stats() == {"tfidf": 2, "semantic": 0, "keyword": 0}
+    assert service.validate(QUERY, "") == results[1]
+
+
+@pytest.mark.unit
+def test_calibrate_cascade_band_stays_within_tolerance():
+    results = (
+        [make_result(0.0, False)] * 40
+        + [make_result(0.0, True)] * 1
+        + [make_result(0.2, False)] * 20
+        + [make_result(0.2, True)] * 20
+        + [make_result(0.7, True)] * 18
+        + [make_result(0.7, False)] * 1
+    )
+
+    assert calibrate_cascade_band(results, tolerance=0.02) == (0.2, 0.2)
+    assert calibrate_cascade_band(results, tolerance=0.0) == (0.0, 0.7)
+    assert calibrate_cascade_band([]) == (0.0, 1.0)
+
+
+@pytest.mark.unit
+def test_cascade_band_is_keyed_to_the_first_tier(mocker):
+    mocker.patch("src.shared.services.search_validation_service.get_encoder")
+    results = [
+        dict(make_result(0.9, False), semantic_score=0.1),
+        dict(make_result(0.1, True), semantic_score=0.8),
+    ]
+
+    # The semantic scores separate the decisions; the cosine scores invert them.
+    assert calibrate_cascade_band(results, tolerance=0.0, scorer="semantic") == (0.1, 0.1)
+    assert calibrate_cascade_band(results, tolerance=0.0) == (0.1, 0.9)
+    service = SearchValidationService(scorers="semantic:1,keyword:1")
+    assert [scorer.name for scorer in service.cascade_scorers] == ["semantic", "keyword"]
+    # A first tier whose scores results do not report cannot be calibrated.
+    with pytest.raises(ValueError, match="cannot start with query_coverage"):
+        SearchValidationService(scorers="query_coverage:1,semantic:1", cascade=True)
+
+
+@pytest.mark.unit
+def test_scorer_weights_are_parsed_and_normalized(service):
+    assert parse_scorer_weights("tfidf:1, semantic:3") == {"tfidf": 1.0, "semantic": 3.0}
+    assert SearchValidationService(scorers="tfidf:1,semantic:3").weights == {
+        "tfidf": 0.25,
+        "semantic": 0.75,
+    }
+    for spec in ("tfidf", "tfidf:-1", "tfidf:0", "tfidf:high"):
+        with pytest.raises(ValueError):
+            parse_scorer_weights(spec)
+    with pytest.raises(ValueError, match="Unknown validation scorers: missing"):
+        SearchValidationService(scorers="tfidf:1,missing:1")
+
+
+@pytest.mark.unit
+def test_model_free_scorers_never_load_the_models(mocker):
+    get_encoder = mocker.patch("src.shared.services.search_validation_service.get_encoder")
+    keybert = mocker.patch("src.shared.services.search_validation_service.KeyBERT")
+    service = SearchValidationService(scorers="tfidf:1,query_coverage:1")
+
+    results = service.validate_batch(QUERY, TEXTS, threshold=0.3)
+
+    get_encoder.assert_not_called()
+    keybert.assert_not_called()
+    assert results[1]["is_valid"] and not results[2]["is_valid"]
+    # Coverage of the query words {giants, game, schedule, in, germany}
+    assert results[1]["score"] == pytest.approx(
+        (results[1]["cosine_score"] + 3 / 5) / 2
+    )
+    assert results[1]["semantic_score"] == results[1]["keyword_score"] == 0.0
+
+
+@pytest.mark.unit
+def test_scorer_stats_count_calls_and_texts(service):
+    service.validate_batch(QUERY, TEXTS)
+    service.validate_batch(QUERY, TEXTS[:2])
+
+    stats = service.scorer_stats()
+    assert set(stats) == {"tfidf", "semantic", "keyword"}
+    for scorer_stats in stats.values():
+        assert scorer_stats["calls"] == 2
+        assert scorer_stats["texts"] == len(TEXTS) + 2
+        assert scorer_stats["seconds"] >= 0.0
+
+
+@pytest.mark.unit
+def test_registered_scorers_join_the_weighted_score(mocker):
+    class LengthScorer(Scorer):
+        name = "length"
+
+        def score(self, query, texts):
+            return [min(len(text) / 100, 1.0) for text in texts]
+
+    mocker.patch.dict(SCORERS)
+    register_scorer("length")(lambda service: LengthScorer())
+    service = SearchValidationService(scorers="tfidf:1,length:3")
+
+    result = service.validate(QUERY, TEXTS[0], threshold=0.5)
+
+    length_score = len(TEXTS[0]) / 100
+    assert result["score"] == pytest.approx(
+        0.25 * result["cosine_score"] + 0.75 * length_score
+    )
+    assert result["is_valid"]
+
+
+@pytest.mark.unit
+def test_scorers_must_implement_score():
+    class Unfinished(Scorer):
+        name = "unfinished"
+
+    with pytest.raises(TypeError):
+        Unfinished()
+    assert {"tfidf", "semantic", "keyword", "query_coverage"} <= set(SCORERS)
+
+
+@pytest.mark.unit
+def test_direct_encoding_uses_the_tuned_batch_size(mocker):
+    encoder = FakeEncoder()
+    mocker.patch(
+        "src.shared.services.search_validation_service.get_encoder", return_value=encoder
+    )
+    mocker.patch(
+        "src.shared.services.search_validation_service.encoder_batch_size", return_value=7
+    )
+    service = SearchValidationService(micro_batching=False, shared_encoder=False)
+
+    service.validate_batch(QUERY, TEXTS)
+
+    # Semantic scoring and KeyBERT's document and candidate embeddings
+    assert len(encoder.batch_sizes) > 1
+    assert set(encoder.batch_sizes) == {7}
@@ -0,0 +1,106 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.shared.services.searx_client import SearxClient
+
+
+RAW_RESPONSE = {
+    "query": "landmarks in paris",
+    "results": [
+        {
+            "url": "https://example.com/eiffel",
+            "title": "Eiffel Tower",
+            "content": "The Eiffel Tower is a landmark in Paris.",
+            "engines": ["brave", "duckduckgo"],
+            "category": "general",
+            "score": 4.0,
+            "positions": [1, 2],
+        },
+        {
+            "url": "https://example.com/louvre",
+            "title": "Louvre",
+            "content": "The Louvre is a museum.",
+            "engines": ["brave"],
+            "category": "general",
+        },
+        {
+            "url": "https://example.com/arc",
+            "title": "Arc de Triomphe",
+            "content": "A monument.",
+            "engines": ["brave"],
+            "category": "general",
+        },
+    ],
+}
+
+
+@pytest.fixture
+def captured_requests():
+    return []
+
+
+@pytest.fixture
+def client(captured_requests):
+    def handler(request: httpx.Request) -> httpx.Response:
+        captured_requests.append(request)
+        return httpx.Response(200, json=RAW_RESPONSE)
+
+    searx_client = SearxClient(
+        host="http://searx.test/search", transport=httpx.MockTransport(handler)
+    )
+    yield searx_client
+    searx_client.close()
+
+
+@pytest.mark.unit
+def test_search_projects_fields(client, captured_requests):
+    results = client.search("landmarks in paris", engines=["brave"], num_results=2)
+
+    assert results == [
+        {
+            "snippet": "The Eiffel Tower is a landmark in Paris.",
+            "title": "Eiffel Tower",
+            "link": "https://example.com/eiffel",
+            "engines": ["brave", "duckduckgo"],
+            "category": "general",
+        },
+        {
+            "snippet": "The Louvre is a museum.",
+            "title": "Louvre",
+            "link": "https://example.com/louvre",
+            "engines": ["brave"],
+            "category": "general",
+        },
+    ]
+    params = captured_requests[0].url.params
+    assert params["q"] == "landmarks in paris"
+    assert params["format"] == "json"
+    assert params["engines"] == "brave"
+
+
+@pytest.mark.unit
+def test_asearch_from_another_loop(client):
+    async def run_twice():
+        return await asyncio.gather(
+            client.asearch("landmarks in paris", num_results=1),
+            client.asearch("landmarks in paris", num_results=3),
+        )
+
+    first, second = asyncio.run(run_twice())
+    assert len(first) == 1
+    assert len(second) == 3
+    # The pooled client survives across event loops.
+    assert len(asyncio.run(client.asearch("landmarks in paris"))) == 3
+
+
+@pytest.mark.unit
+def test_search_raises_on_http_error():
+    transport = httpx.MockTransport(lambda request: httpx.Response(503))
+    searx_client = SearxClient(host="http://searx.test/search", transport=transport)
+    try:
+        with pytest.raises(httpx.HTTPStatusError):
+            searx_client.search("anything")
+    finally:
+        searx_client.close()
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import httpx
+import pytest
+
+from src.shared.services.searx_client import SearxClient
+from src.shared.services.searx_transport import RecordingTransport
+from src.shared.services.searx_transport import ReplayTransport
+from src.shared.services.searx_transport import SearxCorpus
+from src.shared.services.searx_transport import build_transport
+from src.shared.services.searx_transport import create_stub_server
+
+
+RAW_RESPONSE = {
+    "results": [
+        {
+            "url": "https://example.com/eiffel",
+            "title": "Eiffel Tower",
+            "content": "The Eiffel Tower is a landmark in Paris.",
+            "engines": ["brave"],
+            "category": "general",
+        }
+    ]
+}
+
+
+@pytest.fixture
+def recorded_corpus(tmp_path):
+    """Records one live-looking response into a corpus file."""
+    path = str(tmp_path / "corpus.jsonl.gz")
+
+    def upstream(request):
+        time.sleep(0.02)
+        return httpx.Response(200, json=RAW_RESPONSE)
+
+    transport = RecordingTransport(
+        SearxCorpus(path), inner=httpx.MockTransport(upstream)
+    )
+    client = SearxClient(host="http://searx.test/search", transport=transport)
+    try:
+        live_results = client.search("landmarks in paris", engines=["brave"])
+    finally:
+        client.close()
+    return path, live_results
+
+
+@pytest.mark.unit
+def test_replay_in_process(recorded_corpus):
+    path, live_results = recorded_corpus
+    corpus = SearxCorpus(path)
+    assert len(corpus) == 1
+
+    client = SearxClient(
+        host="http://searx.test/search",
+        transport=ReplayTransport(corpus, latency="recorded"),
+    )
+    try:
+        started = time.monotonic()
+        assert client.search("landmarks in paris", engines=["brave"]) == live_results
+        assert time.monotonic() - started >= 0.02
+
+        with pytest.raises(httpx.HTTPStatusError):
+            client.search("unrecorded query", engines=["brave"])
+    finally:
+        client.close()
+
+
+@pytest.mark.unit
+def test_replay_over_http_stub(recorded_corpus):
+    path, live_results = recorded_corpus
+    server = create_stub_server(SearxCorpus(path), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    client = SearxClient(
+        host=f"http://{host}:{port}/search", transport=httpx.AsyncHTTPTransport()
+    )
+    try:
+        assert client.search("landmarks in paris", engines=["brave"]) == live_results
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.unit
+def test_build_transport_modes(tmp_path):
+    path = str(tmp_path / "corpus.jsonl.gz")
+    assert build_transport("live", path) is None
+    assert isinstance(build_transport("record", path), RecordingTransport)
+    assert isinstance(build_transport("replay", path), ReplayTransport)
+    with pytest.raises(ValueError):
+        build_transport("bogus", path)
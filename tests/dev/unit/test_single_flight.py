@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.shared.services.single_flight import AsyncSingleFlight
+from src.shared.services.single_flight import SingleFlight
+
+
+@pytest.mark.unit
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(1)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flight.do, "key", compute) for _ in range(4)]
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert results == ["result"] * 4
+    assert len(calls) == 1
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.unit
+def test_followers_get_their_own_copy():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def compute():
+        release.wait(1)
+        return {"all_results": [{"engines": ["brave"]}]}
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flight.do, "key", compute) for _ in range(3)]
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in futures]
+
+    results[0]["all_results"][0]["engines"].append("google")
+    assert results[1] == results[2] == {"all_results": [{"engines": ["brave"]}]}
+    assert results[1]["all_results"] is not results[2]["all_results"]
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return [{"engines": ["brave"]}]
+
+    async def main():
+        async_flight = AsyncSingleFlight()
+        return await asyncio.gather(*(async_flight.do("key", fetch) for _ in range(2)))
+
+    first, second = asyncio.run(main())
+    assert first == second and first is not second
+
+
+@pytest.mark.unit
+def test_errors_reach_every_waiter_and_are_not_cached():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(1)
+        raise ValueError("upstream failed")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flight.do, "key", fail) for _ in range(3)]
+        time.sleep(0.05)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError, match="upstream failed"):
+                future.result()
+
+    assert flight.do("key", lambda: "recovered") == "recovered"
+
+
+@pytest.mark.unit
+def test_async_calls_share_one_execution():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(*(flight.do("key", compute) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["result"] * 5
+    assert len(calls) == 1
+
+
+@pytest.mark.unit
+def test_async_cancelled_waiter_does_not_cancel_others():
+    flight = AsyncSingleFlight()
+    started = []
+
+    async def compute():
+        started.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def main():
+        first = asyncio.ensure_future(flight.do("key", compute))
+        second = asyncio.ensure_future(flight.do("key", compute))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        result = await second
+        return first.cancelled(), result
+
+    assert asyncio.run(main()) == (True, "result")
+    assert len(started) == 1
+
+
+@pytest.mark.unit
+def test_async_last_waiter_cancels_shared_task():
+    flight = AsyncSingleFlight()
+    cancelled = []
+
+    async def compute():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def main():
+        waiter = asyncio.ensure_future(flight.do("key", compute))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.sleep(0.01)
+        return flight.in_flight()
+
+    assert asyncio.run(main()) == 0
+    assert cancelled == [1]
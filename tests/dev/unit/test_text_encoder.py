@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from src.shared.services import text_encoder
+from src.shared.services.text_encoder import encoder_id
+from src.shared.services.text_encoder import get_encoder
+from src.shared.services.text_encoder import load_encoder
+from src.shared.services.text_encoder import parity_report
+
+
+class BagOfLettersModel:
+    """Offline stand-in for a SentenceTransformer; noise mimics a quantized backend."""
+
+    def __init__(self, noise=0.0):
+        self.noise = noise
+
+    def encode(self, texts, normalize_embeddings=False):
+        rows = np.array(
+            [[text.lower().count(letter) + 0.1 for letter in "aeiostnrl"] for text in texts],
+            dtype=np.float32,
+        )
+        rows += self.noise * np.sin(np.arange(rows.size, dtype=np.float32)).reshape(rows.shape)
+        if normalize_embeddings:
+            rows /= np.linalg.norm(rows, axis=1, keepdims=True)
+        return rows
+
+
+@pytest.mark.unit
+def test_load_encoder_rejects_unknown_backends():
+    with pytest.raises(ValueError, match="Unknown encoder backend: tpu"):
+        load_encoder("all-MiniLM-L6-v2", "tpu")
+
+
+@pytest.mark.unit
+def test_encoder_id_keeps_torch_names():
+    assert encoder_id("all-MiniLM-L6-v2", "torch") == "all-MiniLM-L6-v2"
+    assert encoder_id("all-MiniLM-L6-v2", "onnx-int8") == "all-MiniLM-L6-v2@onnx-int8"
+
+
+@pytest.mark.unit
+def test_get_encoder_loads_each_model_once(mocker):
+    load = mocker.patch.object(
+        text_encoder, "load_encoder", side_effect=lambda name, backend: object()
+    )
+    mocker.patch.dict(text_encoder._encoders, clear=True)
+
+    first = get_encoder("model-a", "torch")
+
+    assert get_encoder("model-a", "torch") is first
+    assert get_encoder("model-a", "onnx") is not first
+    assert load.call_count == 2
+
+
+@pytest.mark.unit
+def test_parity_report_measures_drift_against_the_baseline(mocker):
+    models = {"torch": BagOfLettersModel(), "onnx-int8": BagOfLettersModel(noise=0.05)}
+    mocker.patch.object(
+        text_encoder, "load_encoder", side_effect=lambda name, backend: models[backend]
+    )
+
+    report = parity_report("model-a", "onnx-int8")
+    identical = parity_report("model-a", "torch")
+
+    assert report["pairs"] == len(text_encoder.PARITY_FIXTURES)
+    assert 0 < report["mean_drift"] <= report["max_drift"] < 0.1
+    assert identical["max_drift"] == 0.0
+    assert report["texts_per_sec"] > 0
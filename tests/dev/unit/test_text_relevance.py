@@ -0,0 +1,79 @@
+import pytest
+
+from src.features.llm_core.llm_core import LLMCore
+from src.shared.services.text_relevance import benchmark_lengths
+from src.shared.services.text_relevance import correlation_report
+from src.shared.services.text_relevance import relevance_metric
+from src.shared.services.text_relevance import sequence_relevance
+from src.shared.services.text_relevance import shingle_relevance
+from src.shared.services.text_relevance import synthetic_pairs
+
+ORIGINAL = (
+    "The New York Giants play the Carolina Panthers in Munich, Germany on "
+    "November 10. Kickoff is at 3:30 pm local time at Allianz Arena."
+)
+
+
+@pytest.mark.unit
+def test_shingle_relevance_bounds():
+    assert shingle_relevance(ORIGINAL, ORIGINAL) == 1.0
+    assert shingle_relevance(ORIGINAL, ORIGINAL.upper()) == 1.0
+    assert shingle_relevance("Best coffee shops in Tokyo", ORIGINAL) == 0.0
+    assert shingle_relevance("", "") == sequence_relevance("", "") == 1.0
+    assert shingle_relevance("", ORIGINAL) == 0.0
+
+
+@pytest.mark.unit
+def test_shingle_relevance_ranks_extracts_above_unrelated_text():
+    extract = "The Giants play the Carolina Panthers in Munich on November 10."
+    paraphrase = "New York faces Carolina in Germany this November."
+    unrelated = "Repot the houseplant in spring and water it weekly."
+
+    scores = [shingle_relevance(text, ORIGINAL) for text in (extract, paraphrase, unrelated)]
+
+    assert scores == sorted(scores, reverse=True)
+    assert scores[0] > scores[2]
+
+
+@pytest.mark.unit
+def test_relevance_metric_lookup():
+    assert relevance_metric("shingle") is shingle_relevance
+    assert relevance_metric("sequence") is sequence_relevance
+    with pytest.raises(ValueError, match="Unknown relevance metric"):
+        relevance_metric("levenshtein")
+
+
+@pytest.mark.unit
+def test_correlation_report_on_synthetic_pairs():
+    pairs = synthetic_pairs(count=40, snippets_per_text=(2, 4))
+
+    report = correlation_report(pairs)
+
+    assert report["pairs"] == 40
+    assert report["pearson"] > 0.3
+    assert 0.0 <= report["shingle_mean"] <= 1.0
+    assert pairs == synthetic_pairs(count=40, snippets_per_text=(2, 4))
+
+
+@pytest.mark.unit
+def test_benchmark_lengths_times_both_metrics():
+    timings = benchmark_lengths([500, 1_000])
+
+    assert len(timings) == 2
+    assert all(timing["chars"] >= length for timing, length in zip(timings, [500, 1_000]))
+    assert all(timing["shingle_seconds"] >= 0 for timing in timings)
+
+
+@pytest.mark.unit
+def test_llm_core_scores_relevance_with_the_configured_metric(mocker):
+    mocker.patch("src.features.llm_core.llm_core.get_encoder")
+    mocker.patch("src.features.llm_core.llm_core.KeyBERT")
+    expectations = {"min_word_count": 0, "threshold": 0.0, "key_terms": []}
+    summary = "The Giants play the Carolina Panthers in Munich on November 10."
+
+    for metric in ("shingle", "sequence"):
+        result = LLMCore(relevance=metric).validate_and_score_summary(
+            summary, ORIGINAL, expectations
+        )
+        expected = relevance_metric(metric)(summary, ORIGINAL)
+        assert result["score"] == pytest.approx(0.5 + 0.5 * expected)